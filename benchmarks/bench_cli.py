@@ -0,0 +1,69 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Runs in a fresh interpreter, and prints the wall clock time at which the first packet was written to the device
+_FIRST_PACKET_SCRIPT = """
+import sys, time
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+write = EmulatedWraithPrismDevice.write
+def first_write(self, buff):
+    print(time.time(), file=sys.stderr, flush=True)
+    EmulatedWraithPrismDevice.write = write
+    return write(self, buff)
+EmulatedWraithPrismDevice.write = first_write
+from py_wraith_prism import cli
+sys.exit(cli.main(sys.argv[1:]))
+"""
+
+
+def _environment():
+    environment = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [root, environment.get("PYTHONPATH")]))
+    return environment
+
+
+def _run(arguments, environment) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + arguments, env=environment, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def _first_packet(arguments, environment) -> float:
+    start = time.time()
+    result = subprocess.run([sys.executable, "-c", _FIRST_PACKET_SCRIPT] + arguments, env=environment, check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return float(result.stderr.split()[0]) - start
+
+
+def _report(name: str, samples, baseline: float = 0.0):
+    median = statistics.median(samples) - baseline
+    print(f"{name:<40} {median * 1000:8.2f} ms")
+
+
+def run(iterations: int):
+    environment = _environment()
+    command = ["--emulated", "logo", "static", "#ff0000"]
+    print(f"Median of {iterations} cold starts, less the startup of an empty interpreter")
+
+    baseline = statistics.median(_run(["-c", "pass"], environment) for _ in range(iterations))
+    _report("import py_wraith_prism.cli", [_run(["-c", "import py_wraith_prism.cli"], environment)
+                                           for _ in range(iterations)], baseline)
+    _report("import py_wraith_prism.wraith_prism", [_run(["-c", "import py_wraith_prism.wraith_prism"], environment)
+                                                    for _ in range(iterations)], baseline)
+    _report("wraith-prism --help", [_run(["-m", "py_wraith_prism.cli", "--help"], environment)
+                                    for _ in range(iterations)], baseline)
+    _report("time to first packet (logo static)", [_first_packet(command, environment) for _ in range(iterations)],
+            baseline)
+    _report("wraith-prism logo static (total)", [_run(["-m", "py_wraith_prism.cli"] + command, environment)
+                                                 for _ in range(iterations)], baseline)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the cold start of the wraith-prism command")
+    parser.add_argument("--iterations", type=int, default=10)
+    run(parser.parse_args().iterations)
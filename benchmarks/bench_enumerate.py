@@ -0,0 +1,37 @@
+import argparse
+import os
+import timeit
+
+import hid
+
+from py_wraith_prism.usb.hotplug import HIDRAW_DIRECTORY
+from py_wraith_prism.wraith_device_manager import WraithDeviceManager
+
+
+def run(iterations: int):
+    # Measured against the HID devices of this host, which don't need to include a Wraith Prism
+    print(f"{len(hid.enumerate())} HID devices, {iterations} iterations")
+
+    uncached = WraithDeviceManager(enumeration_ttl=0)
+    cached = WraithDeviceManager()
+    watched = WraithDeviceManager()
+    paths = {
+        "hid.enumerate() (all)": hid.enumerate,
+        "list_devices (uncached)": uncached.list_devices,
+        "list_devices (cached)": cached.list_devices,
+    }
+    if os.path.isdir(HIDRAW_DIRECTORY):
+        paths["hidraw directory"] = lambda: os.listdir(HIDRAW_DIRECTORY)
+
+    with watched.watch() as watcher:
+        paths["list_devices (watched)"] = watched.list_devices
+        print(f"Watching with {'uevents' if watcher.uses_uevents else 'polling'}")
+        for name, operation in paths.items():
+            seconds = timeit.timeit(operation, number=iterations)
+            print(f"{name:<24} {seconds / iterations * 1e6:10.2f} us")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare scanning for devices with the cached and watched lists")
+    parser.add_argument("--iterations", type=int, default=1000)
+    run(parser.parse_args().iterations)
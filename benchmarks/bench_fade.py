@@ -0,0 +1,71 @@
+import argparse
+import time
+import timeit
+
+from py_wraith_prism.prism_components.prism_mode import PrismRingMode, BasicPrismMode
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.transition import COLOR_SPACES, interpolate
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.usb.instrumentation import UsbInstrumentation
+from py_wraith_prism.wraith_prism import WraithPrism
+
+START = RGB(0xFF, 0x40, 0)
+TARGET = RGB(0, 0x40, 0xFF)
+
+
+def _hand_written(prism: WraithPrism, duration: float, steps: int):
+    # Each step interpolates and submits both zones on its own, like a loop in a script would
+    prism.ring.mode = PrismRingMode.Static
+    prism.fan.mode = BasicPrismMode.Static
+    for step in range(steps + 1):
+        weight = step / steps
+        color = tuple(round(a + (b - a) * weight) for a, b in zip(START.bytes, TARGET.bytes))
+        prism.ring.color = prism.fan.color = color
+        prism.submit_component(prism.ring)
+        prism.submit_component(prism.fan)
+        time.sleep(duration / steps)
+
+
+def run(duration: float, latency: float, pipelined: bool):
+    steps = round(duration * 250)
+    print(f"Emulated latency {latency * 1000:.2f} ms, {duration:.2f} s fades of the fan and ring"
+          f"{', pipelined' if pipelined else ''}")
+
+    for space in COLOR_SPACES:
+        weights = [step / steps for step in range(steps + 1)]
+        seconds = timeit.timeit(lambda: interpolate(START, TARGET, weights, space), number=20) / 20
+        print(f"{space + ' table':<20} {seconds * 1000:8.3f} ms for {steps + 1} steps")
+
+    paths = {
+        "hand-written loop": lambda prism: _hand_written(prism, duration, steps),
+        "fade": lambda prism: prism.fade(ring=TARGET, fan=TARGET, duration=duration, wait=True),
+    }
+    print(f"{'':<20} {'seconds':>8} {'frames/s':>9} {'writes':>7}")
+    for name, fade in paths.items():
+        instrumentation = UsbInstrumentation()
+        prism = WraithPrism(EmulatedWraithPrismDevice(latency=latency), pipelined=pipelined,
+                            instrumentation=instrumentation)
+        prism.ring.mode, prism.fan.mode = PrismRingMode.Static, BasicPrismMode.Static
+        prism.ring.color = prism.fan.color = START
+        prism.submit_all_components()
+        instrumentation.reset()
+
+        start = time.perf_counter()
+        result = fade(prism)
+        prism.flush()
+        seconds = time.perf_counter() - start
+
+        frames = result.stats.frames if result is not None else steps + 1
+        writes = sum(stats.count for stats in instrumentation.opcode_totals().values())
+        assert prism.ring._submitted_byte_values[-3:] == bytes(TARGET.bytes)
+        print(f"{name:<20} {seconds:8.3f} {frames / seconds:9.1f} {writes:7}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure fading between colours")
+    parser.add_argument("--duration", type=float, default=0.5, help="Fade duration in seconds")
+    parser.add_argument("--latency", type=float, default=1.0, help="Per-transaction latency in milliseconds")
+    parser.add_argument("--pipelined", action="store_true", help="Don't wait for each write to be acknowledged")
+    args = parser.parse_args()
+
+    run(args.duration, args.latency / 1000, args.pipelined)
@@ -0,0 +1,98 @@
+import argparse
+import itertools
+import random
+import re
+import timeit
+
+from py_wraith_prism import morse
+
+_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 "
+_BASELINE_BITS = {v: i for i, v in enumerate(morse._bits_to_char_map)}
+
+
+def _baseline_encode(text: str) -> bytearray:
+    # How morse_or_text_to_bytes() encoded text before the lookup tables, one symbol at a time
+    if morse.is_morse_code(text):
+        text = text.strip()
+    else:
+        text = " ".join(morse._char_to_morse_map[c] for c in text.strip().upper())
+
+    result = bytearray()
+    iterator = itertools.chain((_BASELINE_BITS[c] for c in text), [0, morse.END])
+    byte = 0
+    try:
+        while True:
+            byte |= next(iterator)
+            byte |= next(iterator) << 2
+            byte |= next(iterator) << 4
+            byte |= next(iterator) << 6
+            result.append(byte)
+            byte = 0
+    except StopIteration:
+        if byte != 0:
+            result.append(byte)
+    return result
+
+
+def _baseline_decode(morse_bytes) -> str:
+    # How bytes_to_morse_or_text() decoded, by concatenating strings
+    morse_values = ""
+    for byte in morse_bytes:
+        for shift in (0, 2, 4, 6):
+            bits = (byte >> shift) & 0b11
+            if bits == morse.END:
+                break
+            morse_values += morse._bits_to_char_map[bits]
+        else:
+            continue
+        break
+
+    result = ""
+    for value in re.split(r'([.-]+)', morse_values):
+        if value == "":
+            continue
+        if value[0] == " ":
+            result += " " * int(len(value) / 3)
+        else:
+            result += morse._morse_to_char_map[value]
+    return result.strip()
+
+
+def _message(rng: random.Random) -> str:
+    # Long enough to fill about the 120 bytes the device holds
+    return "".join(rng.choice(_CHARS) for _ in range(90)).strip() or "SOS"
+
+
+def run(iterations: int, messages: int):
+    rng = random.Random(0)
+    texts = [_message(rng) for _ in range(messages)]
+    encoded = [morse.morse_or_text_to_bytes(text) for text in texts]
+    print(f"{messages} messages, {sum(map(len, encoded)) / messages:.0f} bytes on average, {iterations} iterations")
+
+    # The baseline must produce the same results for the comparison to mean anything
+    assert [bytes(_baseline_encode(text)) for text in texts] == [bytes(values) for values in encoded]
+    assert [_baseline_decode(values) for values in encoded] == [morse.bytes_to_morse_or_text(v) for v in encoded]
+
+    encode_uncached = morse._encode.__wrapped__
+    baseline_encode = lambda: [_baseline_encode(text) for text in texts]
+    paths = {
+        "encode (uncached)": (baseline_encode, lambda: [encode_uncached(text) for text in texts]),
+        "encode (cached)": (baseline_encode, lambda: [morse.morse_or_text_to_bytes(text) for text in texts]),
+        "encode_many": (baseline_encode, lambda: morse.encode_many(texts)),
+        "decode": (lambda: [_baseline_decode(values) for values in encoded],
+                   lambda: [morse.bytes_to_morse_or_text(values) for values in encoded]),
+    }
+    print(f"{'':<20} {'baseline us':>12} {'current us':>12} {'speedup':>8}")
+    for name, (baseline, current) in paths.items():
+        baseline_seconds = timeit.timeit(baseline, number=iterations) / iterations / messages * 1e6
+        current_seconds = timeit.timeit(current, number=iterations) / iterations / messages * 1e6
+        speedup = baseline_seconds / current_seconds
+        print(f"{name:<20} {baseline_seconds:12.2f} {current_seconds:12.2f} {speedup:7.1f}x")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare encoding and decoding ring morse messages with the baseline")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=100)
+    args = parser.parse_args()
+
+    run(args.iterations, args.messages)
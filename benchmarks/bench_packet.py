@@ -0,0 +1,39 @@
+import argparse
+import timeit
+
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.usb.wraith_usb_interface import WraithUsbInterface
+
+_HEADER = bytes([0x51, 0x2C, 1, 0])
+_VALUES = [5, 0x2C, 0x20, 1, 0xFF, 0xFF, 0x12, 0x34, 0x56]
+_TRAILER = bytes([0, 0, 0])
+_PACKET = _HEADER + bytes(_VALUES) + _TRAILER
+
+
+class _DiscardingDevice(EmulatedWraithPrismDevice):
+    # Skips the protocol model, so that only the cost of the library's packet path is measured
+    def write(self, buff) -> int:
+        return len(buff)
+
+    def read(self, max_length: int, timeout_ms: int = 0):
+        return [0] * max_length
+
+
+def run(iterations: int):
+    usb = WraithUsbInterface(_DiscardingDevice())
+
+    paths = {
+        "send_bytes (list)": lambda: usb.send_bytes([0x51, 0x2C, 1, 0] + _VALUES + [0, 0, 0], filler=0xFF),
+        "send_packet (parts)": lambda: usb.send_packet(_HEADER, _VALUES, _TRAILER, filler=0xFF),
+        "write_packet (parts)": lambda: usb.write_packet(_HEADER, _VALUES, _TRAILER, filler=0xFF),
+        "write_packet (one part)": lambda: usb.write_packet(_PACKET, filler=0xFF),
+    }
+    for name, operation in paths.items():
+        seconds = timeit.timeit(operation, number=iterations)
+        print(f"{name:<24} {seconds / iterations * 1e6:8.2f} us/packet")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the list-based and buffer-based packet paths")
+    parser.add_argument("--iterations", type=int, default=100000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,76 @@
+import argparse
+import os
+import tempfile
+import time
+
+from py_wraith_prism.prism_components.prism_mode import PrismRingMode
+from py_wraith_prism.reactive import ReactiveLighting, Binding, Gradient, CpuLoadSampler, SysfsSampler, \
+    find_cpu_temperature_input
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.usb.instrumentation import UsbInstrumentation
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+def _polling_script(prism: WraithPrism, temperature_path: str):
+    # What a script would do on each tick: read the files again, work out the colour and submit it
+    with open("/proc/stat") as f:
+        times = [int(value) for value in f.readline().split()[1:9]]
+    with open(temperature_path) as f:
+        temperature = int(f.read()) / 1000
+    weight = min(max((temperature - 40) / 50, 0.0), 1.0)
+    prism.ring.mode = PrismRingMode.Static
+    prism.ring.color = RGB(round(255 * weight), round(255 * (1 - weight)), 0)
+    prism.fan.color = RGB(min(255, sum(times) % 256), 0, 0)
+    prism.submit_components(prism.ring, prism.fan)
+
+
+def run(ticks: int, interval: float):
+    temperature_path = find_cpu_temperature_input()
+    if temperature_path is None:
+        # A stand-in for the sensor, so the benchmark runs anywhere
+        fd, temperature_path = tempfile.mkstemp()
+        os.write(fd, b"55000\n")
+        os.close(fd)
+    print(f"{ticks} ticks, reading {temperature_path} and /proc/stat")
+
+    temperature = SysfsSampler(temperature_path, scale=0.001)
+    load = CpuLoadSampler()
+    lightings = {}
+
+    def reactive(prism: WraithPrism, _):
+        # Each device gets its own lighting, which is ticked directly rather than on its thread
+        if prism not in lightings:
+            lightings[prism] = ReactiveLighting(prism, {
+                "ring": Binding(temperature, Gradient([(40, "#00ff00"), (65, "#ffff00"), (90, "#ff0000")]), 1.0),
+                "fan": Binding(load, Gradient([(0, "#00ff00"), (100, "#ff0000")]), 5.0),
+            })
+        lightings[prism].tick()
+
+    paths = {"polling script": _polling_script, "ReactiveLighting": reactive}
+    print(f"{'':<18} {'us/tick':>8} {'% of a core':>12} {'writes':>7}")
+    for name, tick in paths.items():
+        instrumentation = UsbInstrumentation()
+        prism = WraithPrism(EmulatedWraithPrismDevice(), instrumentation=instrumentation)
+        instrumentation.reset()
+
+        start = time.thread_time()
+        for _ in range(ticks):
+            tick(prism, temperature_path)
+        seconds = (time.thread_time() - start) / ticks
+
+        writes = sum(stats.count for stats in instrumentation.opcode_totals().values())
+        print(f"{name:<18} {seconds * 1e6:8.1f} {seconds / interval:12.5%} {writes:7}")
+
+    temperature.close()
+    load.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the CPU cost of reactive lighting")
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Seconds between ticks, to work out the share of a core")
+    args = parser.parse_args()
+
+    run(args.ticks, args.interval)
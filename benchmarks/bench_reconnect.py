@@ -0,0 +1,56 @@
+import argparse
+import statistics
+import time
+
+from py_wraith_prism.prism_components.prism_mode import PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+def _configure(prism: WraithPrism):
+    prism.ring.mode = PrismRingMode.Morse
+    prism.ring.morse_text = "sos"
+    prism.logo.color = "red"
+    prism.fan.color = "blue"
+
+
+def run(iterations: int, latency: float):
+    device = EmulatedWraithPrismDevice(latency=latency)
+    prism = WraithPrism(device)
+    _configure(prism)
+    prism.submit_all_components()
+    print(f"Emulated latency {latency * 1000:.2f} ms, {iterations} iterations")
+
+    def rebuild():
+        # What recovering took without reconnect(): a new WraithPrism, and submitting the state again
+        rebuilt = WraithPrism(device)
+        _configure(rebuilt)
+        rebuilt.submit_all_components()
+
+    paths = {
+        "rebuild and submit": rebuild,
+        "reconnect": lambda: prism.reconnect(device),
+    }
+    for name, operation in paths.items():
+        timings = []
+        transactions = 0
+        for _ in range(iterations):
+            device.disconnect()
+            device.connect()
+            device.open_path(b"")
+            start_transactions = device.transaction_count
+            start = time.perf_counter()
+            operation()
+            timings.append(time.perf_counter() - start)
+            transactions += device.transaction_count - start_transactions
+        print(f"{name:<20} {statistics.mean(timings) * 1000:9.3f} ms {transactions / iterations:8.1f} tx")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare restoring the device state after a USB reset by rebuilding "
+                                                 "the WraithPrism and by reconnecting it")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=1.0, help="Per-transaction latency in milliseconds")
+    args = parser.parse_args()
+
+    run(args.iterations, args.latency / 1000)
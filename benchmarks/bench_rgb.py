@@ -0,0 +1,65 @@
+import argparse
+import random
+import timeit
+import tracemalloc
+
+from colour import Color
+
+from py_wraith_prism.channel_values import ChannelValues
+from py_wraith_prism.rgb import RGB
+
+
+def _color_bytes(color: Color):
+    # How components turned their colour into bytes before RGB
+    return [int(color.red * 255), int(color.green * 255), int(color.blue * 255)]
+
+
+def _channel_color(values):
+    # How ChannelValues.rgb was built before RGB
+    return Color(rgb=(values[10] / 255, values[11] / 255, values[12] / 255))
+
+
+def _allocated(operation) -> int:
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(iterations: int, colors: int):
+    rng = random.Random(0)
+    triples = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(colors)]
+    channels = [[0] * 10 + list(triple) for triple in triples]
+    old_colors = [Color(rgb=(r / 255, g / 255, b / 255)) for r, g, b in triples]
+    new_colors = [RGB(*triple) for triple in triples]
+    print(f"{colors} colours, {iterations} iterations")
+
+    paths = {
+        "colour bytes": (lambda: [_color_bytes(color) for color in old_colors],
+                         lambda: [list(color.bytes) for color in new_colors]),
+        "colour compare": (lambda: [a == b for a, b in zip(old_colors, old_colors[1:])],
+                           lambda: [a == b for a, b in zip(new_colors, new_colors[1:])]),
+        "read from channel": (lambda: [_channel_color(values) for values in channels],
+                              lambda: [ChannelValues(values).rgb for values in channels]),
+        "coerce tuple": (lambda: [Color(rgb=(r / 255, g / 255, b / 255)) for r, g, b in triples],
+                         lambda: [RGB.coerce(triple) for triple in triples]),
+    }
+    print(f"{'':<20} {'Color us':>10} {'RGB us':>10} {'Color KiB':>10} {'RGB KiB':>10}")
+    for name, (old, new) in paths.items():
+        old_seconds = timeit.timeit(old, number=iterations) / iterations / colors * 1e6
+        new_seconds = timeit.timeit(new, number=iterations) / iterations / colors * 1e6
+        print(f"{name:<20} {old_seconds:10.3f} {new_seconds:10.3f} "
+              f"{_allocated(old) / 1024:10.1f} {_allocated(new) / 1024:10.1f}")
+
+    lossy = sum(_color_bytes(_channel_color(values)) != list(triple) for values, triple in zip(channels, triples))
+    print(f"{lossy} of {colors} colours read from a channel changed when converted through Color")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare colour handling with colour.Color and RGB")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--colors", type=int, default=1000)
+    args = parser.parse_args()
+
+    run(args.iterations, args.colors)
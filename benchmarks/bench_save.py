@@ -0,0 +1,45 @@
+import argparse
+import time
+
+from py_wraith_prism.save_policy import SavePolicy
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+def run(iterations: int, latency: float, debounce: float):
+    print(f"Emulated latency {latency * 1000:.2f} ms, {iterations} submits, each saved twice")
+
+    policies = {
+        "save every time": SavePolicy(skip_unchanged=False),
+        "skip unchanged": SavePolicy(),
+        f"debounce {debounce * 1000:.0f} ms": SavePolicy(debounce=debounce),
+    }
+    print(f"{'':<20} {'ms in save':>11} {'total ms':>9} {'commits':>8} {'avoided':>8}")
+    for name, policy in policies.items():
+        device = EmulatedWraithPrismDevice(latency=latency, seed=0)
+        with WraithPrism(device, save_policy=policy) as prism:
+            saving = 0.0
+            start = time.perf_counter()
+            for index in range(iterations):
+                prism.logo.color = (index % 256, 0, 0)
+                prism.submit_all_components()
+                # e.g. a settings dialog that saves on every change, and again when it's closed
+                for _ in range(2):
+                    save_start = time.perf_counter()
+                    prism.save()
+                    saving += time.perf_counter() - save_start
+            prism.flush_save()
+            seconds = time.perf_counter() - start
+
+        stats = prism.save_stats
+        print(f"{name:<20} {saving * 1000:11.1f} {seconds * 1000:9.1f} {stats.committed:8} {stats.avoided:8}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure how many saves are avoided by the save policies")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=1.0, help="Per-transaction latency in milliseconds")
+    parser.add_argument("--debounce", type=float, default=50.0, help="Debounce window in milliseconds")
+    args = parser.parse_args()
+
+    run(args.iterations, args.latency / 1000, args.debounce / 1000)
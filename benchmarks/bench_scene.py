@@ -0,0 +1,71 @@
+import argparse
+import time
+
+from py_wraith_prism.component_state import apply_component_state, component_name
+from py_wraith_prism.scene import Scene
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.usb.instrumentation import UsbInstrumentation
+from py_wraith_prism.wraith_prism import WraithPrism
+
+SCENES = [
+    Scene.from_dict("work", {
+        "logo": {"mode": "Static", "color": "#ffffff"},
+        "fan": {"mode": "Static", "color": "#ffffff", "brightness": "Low"},
+        "ring": {"mode": "Morse", "color": "#ff8000", "morse_text": "focus"},
+    }),
+    Scene.from_dict("game", {
+        "logo": {"mode": "Cycle", "speed": "Fast"},
+        "fan": {"mode": "Breathe", "color": "#ff0000", "mirage_state": [330, 330, 330]},
+        "ring": {"mode": "Swirl", "direction": "CounterClockwise", "use_random_color": True},
+    }),
+    Scene.from_dict("night", {
+        "logo": {"mode": "Static", "color": "#200000", "brightness": "Low"},
+        "ring": {"mode": "Morse", "color": "#200000", "brightness": "Low", "morse_text": "sleep"},
+    }),
+]
+
+
+def _set_attributes(prism: WraithPrism, scene: Scene):
+    for component in (prism.logo, prism.fan, prism.ring):
+        apply_component_state(component, scene.components[component_name(component)])
+
+
+def run(switches: int, latency: float):
+    print(f"Emulated latency {latency * 1000:.2f} ms, {switches} switches between {len(SCENES)} scenes")
+
+    def rebuild(prism: WraithPrism, scene: Scene):
+        _set_attributes(prism, scene)
+        prism.submit_all_components(force=True)
+
+    def submit(prism: WraithPrism, scene: Scene):
+        _set_attributes(prism, scene)
+        prism.submit_all_components()
+
+    paths = {
+        "attributes, forced": rebuild,
+        "attributes, submit": submit,
+        "apply_scene": lambda prism, scene: prism.apply_scene(scene),
+    }
+    print(f"{'':<20} {'switches/s':>11} {'writes/switch':>14}")
+    for name, switch in paths.items():
+        instrumentation = UsbInstrumentation()
+        prism = WraithPrism(EmulatedWraithPrismDevice(latency=latency), instrumentation=instrumentation)
+        switch(prism, SCENES[-1])
+        instrumentation.reset()
+
+        start = time.perf_counter()
+        for index in range(switches):
+            switch(prism, SCENES[index % len(SCENES)])
+        seconds = time.perf_counter() - start
+
+        writes = sum(stats.count for stats in instrumentation.opcode_totals().values())
+        print(f"{name:<20} {switches / seconds:11.1f} {writes / switches:14.1f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure switching between scenes")
+    parser.add_argument("--switches", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=1.0, help="Per-transaction latency in milliseconds")
+    args = parser.parse_args()
+
+    run(args.switches, args.latency / 1000)
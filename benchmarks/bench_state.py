@@ -0,0 +1,45 @@
+import argparse
+import timeit
+
+from py_wraith_prism.channel_values import ChannelValues
+from py_wraith_prism.prism_components import prism_components
+from py_wraith_prism.prism_components.enums import Brightness, Speed
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+def run(iterations: int):
+    prism = WraithPrism(EmulatedWraithPrismDevice())
+    prism.fan.mode = BasicPrismMode.Breathe
+    prism.fan.speed = Speed.Fast
+    prism.fan.color = "#123456"
+    prism.ring.mode = PrismRingMode.Swirl
+    prism.ring.brightness = Brightness.Low
+    fan_values = ChannelValues(bytes(4) + prism.fan._byte_values)
+    ring_values = ChannelValues(bytes(4) + prism.ring._byte_values)
+
+    basic_values = prism_components._basic_values.__wrapped__
+    ring_values_uncached = prism_components._ring_values.__wrapped__
+    fan, ring = prism.fan, prism.ring
+    paths = {
+        "fan values (cached)": lambda: fan._byte_values,
+        "fan values (uncached)": lambda: basic_values(fan.channel, fan.mode.name, fan.speed, fan.brightness,
+                                                      fan.rgb.value, fan.use_random_color),
+        "ring values (cached)": lambda: ring._byte_values,
+        "ring values (uncached)": lambda: ring_values_uncached(ring.mode.name, ring.speed, ring.brightness,
+                                                               ring.rgb.value, ring.use_random_color, ring.direction),
+        "decode fan values": lambda: fan._reload_channel_values(fan_values),
+        "decode ring values": lambda: ring._reload_channel_values(ring_values),
+        "ring mode from channel": lambda: PrismRingMode.from_channel(0xB),
+        "speed from value": lambda: BasicPrismMode.Breathe.find_speed(0x26),
+    }
+    for name, operation in paths.items():
+        seconds = timeit.timeit(operation, number=iterations)
+        print(f"{name:<24} {seconds / iterations * 1e6:8.2f} us")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure encoding and decoding component channel values")
+    parser.add_argument("--iterations", type=int, default=100000)
+    run(parser.parse_args().iterations)
@@ -0,0 +1,92 @@
+import argparse
+import statistics
+import time
+from typing import Callable
+
+from colour import Color
+
+from py_wraith_prism.prism_components.enums import Brightness
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+def _measure(name: str, iterations: int, setup: Callable[[], None] | None, operation: Callable[[], object],
+             device: EmulatedWraithPrismDevice):
+    timings = []
+    transactions = 0
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        start_transactions = device.transaction_count
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+        transactions += device.transaction_count - start_transactions
+
+    mean = statistics.mean(timings)
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+    print(f"{name:<32} {mean * 1000:9.3f} ms {p95 * 1000:9.3f} ms {1 / mean:10.1f}/s "
+          f"{transactions / iterations:8.1f} tx")
+
+
+def run(iterations: int, latency: float, jitter: float, pipelined: bool):
+    device = EmulatedWraithPrismDevice(latency=latency, jitter=jitter, seed=0)
+    print(f"Emulated latency {latency * 1000:.2f} ms, jitter {jitter * 1000:.2f} ms, {iterations} iterations"
+          + (", pipelined" if pipelined else ""))
+    print(f"{'operation':<32} {'mean':>12} {'p95':>12} {'rate':>12} {'HID':>11}")
+
+    _measure("open (constructor handshake)", iterations, None, lambda: WraithPrism(device, pipelined=pipelined), device)
+    _measure("open (lazy) and load", iterations, None, lambda: WraithPrism(device, lazy=True, pipelined=pipelined).load(),
+             device)
+
+    prism = WraithPrism(device, pipelined=pipelined)
+    prism.ring.mode = PrismRingMode.Morse
+    prism.ring.morse_text = "abc"
+    prism.fan.mode = prism.logo.mode = BasicPrismMode.Static
+    prism.fan.brightness = prism.logo.brightness = Brightness.High
+
+    colors = [Color("red"), Color("green"), Color("blue")]
+    counter = iter(range(1 << 62))
+
+    def change_color():
+        color = colors[next(counter) % len(colors)]
+        prism.logo.color = prism.fan.color = prism.ring.color = color
+
+    # Pipelined writes are flushed as part of each operation, so that their acknowledgements are included in the timing
+    _measure("submit_all_components (forced)", iterations, None,
+             lambda: (prism.submit_all_components(force=True), prism.flush()), device)
+    _measure("submit_all_components (colors)", iterations, change_color,
+             lambda: (prism.submit_all_components(), prism.flush()), device)
+    _measure("submit_all_components (no-op)", iterations, None,
+             lambda: (prism.submit_all_components(), prism.flush()), device)
+    _measure("submit_component (logo)", iterations, change_color,
+             lambda: (prism.submit_component(prism.logo), prism.flush()), device)
+
+    def submit_each_and_save():
+        for component in (prism.logo, prism.fan, prism.ring):
+            prism.submit_component(component)
+        prism.save()
+
+    def submit_each_and_save_batched():
+        with prism.batch():
+            submit_each_and_save()
+
+    _measure("submit each, save", iterations, change_color, lambda: (submit_each_and_save(), prism.flush()), device)
+    _measure("submit each, save (batched)", iterations, change_color,
+             lambda: (submit_each_and_save_batched(), prism.flush()), device)
+    _measure("save", iterations, None, lambda: (prism.save(), prism.flush()), device)
+    _measure("enso (read)", iterations, None, lambda: prism.enso, device)
+    _measure("request_firmware_version", iterations, None, prism.request_firmware_version, device)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the latency and throughput of the library against an "
+                                                 "emulated Wraith Prism")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=1.0, help="Per-transaction latency in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra per-transaction delay in milliseconds")
+    parser.add_argument("--pipelined", action="store_true", help="Don't wait for the response of every write")
+    args = parser.parse_args()
+
+    run(args.iterations, args.latency / 1000, args.jitter / 1000, args.pipelined)
@@ -0,0 +1,43 @@
+import argparse
+import time
+
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.verification import SubmitVerifier
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+def run(iterations: int, latency: float, write_loss: float):
+    device = EmulatedWraithPrismDevice(latency=latency, seed=0)
+    prism = WraithPrism(device)
+    print(f"Emulated latency {latency * 1000:.2f} ms, {write_loss:.0%} of writes lost, {iterations} submits")
+
+    verifiers = {
+        "no verification": None,
+        "every submit": SubmitVerifier(sample_every=1, resend=True),
+        "1 in 10 submits": SubmitVerifier(sample_every=10, resend=True),
+        "every submit, 10 ms/s": SubmitVerifier(sample_every=1, budget=0.01, resend=True),
+    }
+    print(f"{'':<24} {'submits/s':>10} {'verified':>9} {'mismatches':>11}")
+    for name, verifier in verifiers.items():
+        prism.verifier = verifier
+        device.write_loss = write_loss
+        start = time.perf_counter()
+        for index in range(iterations):
+            prism.logo.color = prism.fan.color = (index % 256, 0, 0)
+            prism.submit_all_components()
+        seconds = time.perf_counter() - start
+        device.write_loss = 0.0
+
+        stats = verifier.stats if verifier is not None else None
+        print(f"{name:<24} {iterations / seconds:10.1f} {stats.verified if stats else 0:9} "
+              f"{stats.mismatches if stats else 0:11}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the cost of verifying submits by reading them back")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=1.0, help="Per-transaction latency in milliseconds")
+    parser.add_argument("--write-loss", type=float, default=0.01, help="Fraction of writes that don't take effect")
+    args = parser.parse_args()
+
+    run(args.iterations, args.latency / 1000, args.write_loss)
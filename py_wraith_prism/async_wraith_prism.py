@@ -0,0 +1,166 @@
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from types import TracebackType
+from typing import AsyncIterator, Callable, Type, TypeVar
+
+from py_wraith_prism.prism_components.prism_components import PrismLogoComponent, PrismFanComponent, \
+    PrismRingComponent, PrismComponent
+from py_wraith_prism.scene import Scene
+from py_wraith_prism.wraith_prism import WraithPrism, Batch
+
+T = TypeVar("T")
+
+DEFAULT_MAX_PENDING = 16
+
+
+def _close_created(future: Future):
+    if future.cancelled() or future.exception() is not None:
+        return
+    future.result().close()
+
+
+class AsyncWraithPrism(AbstractAsyncContextManager):
+    '''
+    asyncio wrapper around WraithPrism. Every operation that talks to the device runs on a dedicated I/O worker thread,
+    one operation at a time and in the order they were requested, so the event loop is never blocked by HID reads and
+    writes.
+
+    Backpressure: at most max_pending operations can be queued on the worker. Further calls wait (without blocking the
+    event loop) until an earlier operation has finished.
+
+    Cancellation: cancelling a call that is still queued removes it from the queue, and it never touches the device.
+    A call that has already started on the worker can't be interrupted mid-transaction, so it runs to completion and
+    its result is discarded; later operations still run after it.
+
+    Component attributes (logo, fan and ring) can be modified directly from the event loop. They are read on the worker
+    when a submit runs, so changes made while a submit is queued are included in it. For a lazily attached device,
+    await load() before reading component attributes, otherwise the first read happens on the event loop.
+    '''
+
+    def __init__(self, prism: WraithPrism, executor: ThreadPoolExecutor, max_pending: int = DEFAULT_MAX_PENDING):
+        self._prism = prism
+        self._executor = executor
+        self._pending = asyncio.Semaphore(max_pending)
+
+    @classmethod
+    async def create(cls, factory: Callable[[], WraithPrism], max_pending: int = DEFAULT_MAX_PENDING) -> \
+            'AsyncWraithPrism':
+        # The WraithPrism constructor talks to the device, so it runs on the worker as well
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wraith-prism-io")
+        future = executor.submit(factory)
+        try:
+            prism = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A factory that has already started can't be interrupted, so the device it opens is closed on the worker
+            # once it has finished
+            executor.submit(_close_created, future)
+            executor.shutdown(wait=False)
+            raise
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        return cls(prism, executor, max_pending)
+
+    async def _run(self, function: Callable[..., T], *args, **kwargs) -> T:
+        await self._pending.acquire()
+        try:
+            future: Future = self._executor.submit(function, *args, **kwargs)
+        except BaseException:
+            self._pending.release()
+            raise
+
+        # Only free the slot once the worker is done with the operation, even if the caller was cancelled first
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._pending.release))
+        return await asyncio.wrap_future(future)
+
+    @property
+    def prism(self) -> WraithPrism:
+        return self._prism
+
+    @property
+    def logo(self) -> PrismLogoComponent:
+        return self._prism.logo
+
+    @property
+    def fan(self) -> PrismFanComponent:
+        return self._prism.fan
+
+    @property
+    def ring(self) -> PrismRingComponent:
+        return self._prism.ring
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return self._prism.has_unsaved_changes
+
+    async def load(self):
+        await self._run(self._prism.load)
+
+    async def submit_component(self, component: PrismComponent, force: bool = False) -> int:
+        return await self._run(self._prism.submit_component, component, force)
+
+    async def submit_components(self, *argv, force: bool = False) -> int:
+        return await self._run(self._prism.submit_components, *argv, force=force)
+
+    async def submit_all_components(self, force: bool = False) -> int:
+        return await self._run(self._prism.submit_all_components, force)
+
+    async def apply_scene(self, scene: Scene, force: bool = False) -> int:
+        return await self._run(self._prism.apply_scene, scene, force)
+
+    async def save(self, force: bool = False):
+        await self._run(self._prism.save, force)
+
+    async def flush_save(self):
+        await self._run(self._prism.flush_save)
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[Batch]:
+        # See WraithPrism.batch(). The batch is entered and sent on the worker, in order with the operations inside it.
+        context = self._prism.batch()
+        batch = await self._run(context.__enter__)
+        try:
+            yield batch
+        except BaseException:
+            if not await self._run(context.__exit__, *sys.exc_info()):
+                raise
+        else:
+            await self._run(context.__exit__, None, None, None)
+
+    async def apply(self):
+        await self._run(self._prism.apply)
+
+    async def flush(self):
+        await self._run(self._prism.flush)
+
+    async def get_enso(self) -> bool:
+        return await self._run(lambda: self._prism.enso)
+
+    async def set_enso(self, value: bool):
+        await self._run(setattr, self._prism, "enso", value)
+
+    async def request_firmware_version(self) -> str:
+        return await self._run(self._prism.request_firmware_version)
+
+    async def reset_to_default(self):
+        await self._run(self._prism.reset_to_default)
+
+    async def power_on(self):
+        await self._run(self._prism.power_on)
+
+    async def power_off(self):
+        await self._run(self._prism.power_off)
+
+    async def close(self):
+        try:
+            await self._run(self._prism.close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aexit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                        __traceback: TracebackType or None) -> bool or None:
+        await self.close()
+        return None
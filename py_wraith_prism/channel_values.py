@@ -1,10 +1,10 @@
-from typing import List
+from typing import Sequence
 
-from colour import Color
+from py_wraith_prism.rgb import RGB
 
 
 class ChannelValues:
-    def __init__(self, values: List[int]):
+    def __init__(self, values: Sequence[int]):
         self._values = values
     
     @property
@@ -23,4 +23,12 @@ class ChannelValues:
     def brightness(self): return self._values[9]
     
     @property
-    def color(self): return Color(rgb=(self._values[10]/255, self._values[11]/255, self._values[12]/255))
+    def color(self): return self.rgb.to_color()
+
+    @property
+    def rgb(self): return RGB(self._values[10], self._values[11], self._values[12])
+
+    @property
+    def byte_values(self) -> bytes:
+        # The values exactly as the device holds them, laid out like the ones that are written to it
+        return bytes(self._values[4:13])
@@ -0,0 +1,231 @@
+import argparse
+import sys
+
+# Only argparse is imported up front, so that --help and usage errors are fast. The modules that talk to the device
+# (and import colour and hid) are imported by the commands that need them.
+
+_MODES = {
+    "logo": ("off", "static", "cycle", "breathe"),
+    "fan": ("off", "static", "cycle", "breathe"),
+    "ring": ("off", "static", "breathe", "cycle", "rainbow", "bounce", "chase", "swirl", "morse"),
+}
+_SPEEDS = ("slowest", "slow", "medium", "fast", "fastest")
+_BRIGHTNESSES = ("low", "medium", "high")
+_DIRECTIONS = ("clockwise", "counterclockwise")
+_METRICS = ("temperature", "load", "off")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="wraith-prism", description="Control the Wraith Prism CPU cooler LEDs")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Send the commands to a running py_wraith_prism.daemon instead of opening the device")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="Like --daemon, for a daemon listening on PATH instead of its default socket")
+    parser.add_argument("--emulated", action="store_true", help="Use an emulated device instead of the cooler")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    for name, modes in _MODES.items():
+        command = commands.add_parser(name, help=f"Set the {name} mode and colour")
+        command.add_argument("mode", type=str.lower, choices=modes)
+        command.add_argument("color", nargs="?", default=None, help="A colour name or hex value (default: white)")
+        command.add_argument("--speed", type=str.lower, choices=_SPEEDS)
+        command.add_argument("--brightness", type=str.lower, choices=_BRIGHTNESSES)
+        command.add_argument("--random-color", action="store_true", help="Use random colours, in modes that can")
+        if name == "ring":
+            command.add_argument("--direction", type=str.lower, choices=_DIRECTIONS)
+            command.add_argument("--text", help="The text or morse code to show in morse mode")
+        command.add_argument("--keep", action="store_true",
+                             help="Keep the current values of the settings that aren't given, instead of their "
+                                  "defaults. This reads the current values from the device.")
+        command.add_argument("--save", action="store_true", help="Save the settings to the device afterwards")
+
+    commands.add_parser("save", help="Save the current settings to the device")
+    scene = commands.add_parser("scene", help="Apply a scene from a JSON or TOML file")
+    scene.add_argument("file", help="A file that maps the name of each scene to its settings")
+    scene.add_argument("name", help="The name of the scene")
+    scene.add_argument("--save", action="store_true", help="Save the settings to the device afterwards")
+    scene.add_argument("--packets", action="store_true",
+                       help="Print the packets that set the scene instead of applying it, without opening the device")
+    status = commands.add_parser("status", help="Show the current settings")
+    status.add_argument("--json", action="store_true", help="Print the settings as JSON")
+    enso = commands.add_parser("enso", help="Turn enso mode on or off")
+    enso.add_argument("state", type=str.lower, choices=("on", "off"))
+    commands.add_parser("firmware", help="Show the firmware version")
+    commands.add_parser("reset", help="Reset every component to its default settings")
+    react = commands.add_parser("react", help="Show the CPU temperature and load on the LEDs until interrupted")
+    for name, default in (("logo", "off"), ("fan", "load"), ("ring", "temperature")):
+        react.add_argument(f"--{name}", type=str.lower, choices=_METRICS, default=default,
+                           help=f"What the {name} shows (default: {default})")
+    react.add_argument("--interval", type=float, default=1.0, help="Seconds between samples (default: 1)")
+    power = commands.add_parser("power", help="Turn the LEDs on or off")
+    power.add_argument("state", type=str.lower, choices=("on", "off"))
+    return parser
+
+
+def _open(args: argparse.Namespace):
+    if args.daemon or args.socket is not None:
+        from py_wraith_prism.daemon import WraithPrismClient
+        return WraithPrismClient(args.socket)
+
+    # Attaching lazily skips the power on/restore handshake and every state read that the command doesn't need
+    from py_wraith_prism.wraith_prism import WraithPrism
+    if args.emulated:
+        from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+        return WraithPrism(EmulatedWraithPrismDevice(), lazy=True)
+
+    from py_wraith_prism.wraith_device_manager import WraithDeviceManager
+    return WraithDeviceManager().create_device(lazy=True)
+
+
+def _set_component(prism, args: argparse.Namespace):
+    from py_wraith_prism.prism_components.enums import Speed, Brightness, RotationDirection
+    from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+    from py_wraith_prism.rgb import RGB
+
+    def member(enum, value: str):
+        return next(m for m in enum if m.name.lower() == value)
+
+    component = getattr(prism, args.command)
+    is_ring = args.command == "ring"
+
+    def setting(value, default):
+        # Without --keep, the settings that aren't given are set to their defaults, so that nothing has to be read
+        # from the device
+        if value is not None or args.keep:
+            return value
+        return default
+
+    values = {
+        "mode": member(PrismRingMode if is_ring else BasicPrismMode, args.mode),
+        "color": setting(args.color and RGB.coerce(args.color), RGB(0xFF, 0xFF, 0xFF)),
+        "speed": setting(args.speed and member(Speed, args.speed), Speed.Medium),
+        "brightness": setting(args.brightness and member(Brightness, args.brightness), Brightness.High),
+        "use_random_color": setting(args.random_color or None, False),
+    }
+    if is_ring:
+        values["direction"] = setting(args.direction and member(RotationDirection, args.direction),
+                                      RotationDirection.Clockwise)
+        values["morse_text"] = args.text
+
+    for name, value in values.items():
+        if value is not None:
+            setattr(component, name, value)
+
+    prism.submit_component(component)
+    if args.save:
+        prism.save()
+
+
+def _load_scene(args: argparse.Namespace):
+    from py_wraith_prism.scene import load_scenes
+
+    try:
+        scenes = load_scenes(args.file)
+    except OSError as e:
+        raise ValueError(f"Failed to read {args.file}: {e.strerror}") from None
+    if args.name not in scenes:
+        raise ValueError(f"{args.file} doesn't have a scene named {args.name!r}")
+    return scenes[args.name]
+
+
+def _apply_scene(prism, args: argparse.Namespace):
+    prism.apply_scene(_load_scene(args))
+    if args.save:
+        prism.save()
+
+
+def _react(prism, args: argparse.Namespace):
+    from py_wraith_prism.reactive import ReactiveLighting, Binding, Gradient, CpuTemperatureSampler, CpuLoadSampler
+
+    # Green through yellow to red, over degrees Celsius or percent. A sampler that's shown twice is only read once.
+    samplers = {}
+    bindings = {}
+    for name in ("logo", "fan", "ring"):
+        metric = getattr(args, name)
+        if metric == "off":
+            continue
+        if metric not in samplers:
+            samplers[metric] = CpuTemperatureSampler() if metric == "temperature" else CpuLoadSampler()
+        if metric == "temperature":
+            bindings[name] = Binding(samplers[metric], Gradient([(40, "#00ff00"), (65, "#ffff00"), (90, "#ff0000")]),
+                                     hysteresis=1.0)
+        else:
+            bindings[name] = Binding(samplers[metric], Gradient([(0, "#00ff00"), (50, "#ffff00"), (100, "#ff0000")]),
+                                     hysteresis=5.0)
+
+    lighting = ReactiveLighting(prism, bindings, interval=args.interval)
+    try:
+        lighting.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for sampler in samplers.values():
+            sampler.close()
+    stats = lighting.stats
+    print(f"{stats.updates} updates in {stats.ticks} samples, using {stats.cpu_fraction:.4%} of a core")
+
+
+def _status(prism, args: argparse.Namespace):
+    from py_wraith_prism.device_snapshot import COMPONENT_NAMES
+
+    if hasattr(prism, "get_state"):
+        state = prism.get_state()
+    else:
+        from py_wraith_prism.component_state import component_state
+        prism.load()
+        state = {name: component_state(getattr(prism, name)) for name in COMPONENT_NAMES}
+        state["enso"] = prism.enso
+        state["firmware_version"] = prism.request_firmware_version()
+
+    if args.json:
+        import json
+        print(json.dumps(state, indent=2))
+        return
+
+    print(f"Firmware: {state['firmware_version']}")
+    print(f"Enso: {'on' if state['enso'] else 'off'}")
+    for name in COMPONENT_NAMES:
+        settings = ", ".join(f"{field}={value}" for field, value in state[name].items())
+        print(f"{name}: {settings}")
+
+
+def main(argv=None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    try:
+        if args.command == "scene" and args.packets:
+            for packet in _load_scene(args).compile().packets():
+                print(packet.hex(" "))
+            return 0
+
+        with _open(args) as prism:
+            if args.command in _MODES:
+                _set_component(prism, args)
+            elif args.command == "save":
+                # Only commits what the device shows, without reading anything
+                prism.save(force=True)
+            elif args.command == "scene":
+                _apply_scene(prism, args)
+            elif args.command == "status":
+                _status(prism, args)
+            elif args.command == "enso":
+                prism.enso = args.state == "on"
+            elif args.command == "firmware":
+                print(prism.request_firmware_version())
+            elif args.command == "reset":
+                prism.reset_to_default()
+            elif args.command == "react":
+                _react(prism, args)
+            elif args.command == "power":
+                if args.state == "on":
+                    prism.power_on()
+                else:
+                    prism.power_off()
+    except (IOError, ValueError) as e:
+        print(f"wraith-prism: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+from typing import Any, Dict, Mapping
+
+from py_wraith_prism.morse import validate_morse_text
+from py_wraith_prism.prism_components.enums import Speed, Brightness, RotationDirection
+from py_wraith_prism.prism_components.mirage_state import MirageState, MirageStateOn
+from py_wraith_prism.prism_components.prism_components import PrismComponent, PrismFanComponent, \
+    PrismRingComponent
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.rgb import RGB
+
+# The settings of a component as plain JSON values, e.g. {"mode": "Static", "color": "#ff0000", "speed": "Fast"}.
+# Modes and enums are stored by name, colours as hex strings, and the fan's mirage state as a list of the red, green
+# and blue frequencies, or None when it's off.
+ComponentState = Dict[str, Any]
+
+_COMMON_FIELDS = ("mode", "color", "speed", "brightness", "use_random_color")
+COMPONENT_FIELDS = {
+    "logo": _COMMON_FIELDS,
+    "fan": _COMMON_FIELDS + ("mirage_state",),
+    "ring": _COMMON_FIELDS + ("direction", "morse_text"),
+}
+
+
+def component_name(component: PrismComponent) -> str:
+    if isinstance(component, PrismRingComponent):
+        return "ring"
+    if isinstance(component, PrismFanComponent):
+        return "fan"
+    return "logo"
+
+
+def _enum_member(enum, value):
+    try:
+        return enum[value]
+    except KeyError:
+        raise ValueError(f"Invalid {enum.__name__} {value!r}") from None
+
+
+def encode_value(field: str, value) -> Any:
+    if field in ("mode", "speed", "brightness", "direction"):
+        return value.name
+    if field == "color":
+        return RGB.coerce(value).hex_l
+    if field == "mirage_state":
+        if isinstance(value, MirageStateOn):
+            return [value.red_freq, value.green_freq, value.blue_freq]
+        return None
+    return value
+
+
+def decode_value(name: str, field: str, value: Any):
+    if field not in COMPONENT_FIELDS[name]:
+        raise ValueError(f"The {name} doesn't have a {field!r} setting")
+
+    if field == "mode":
+        return _enum_member(PrismRingMode if name == "ring" else BasicPrismMode, value)
+    if field == "speed":
+        return _enum_member(Speed, value)
+    if field == "brightness":
+        return _enum_member(Brightness, value)
+    if field == "direction":
+        return _enum_member(RotationDirection, value)
+    if field == "color":
+        return RGB.coerce(value)
+    if field == "mirage_state":
+        # TOML has no null, so false turns it off too
+        if value is None or value is False:
+            return MirageState.Off
+        try:
+            red, green, blue = (int(frequency) for frequency in value)
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid mirage state {value!r}") from None
+        return MirageStateOn(red, green, blue)
+    if field == "use_random_color":
+        return bool(value)
+    return validate_morse_text(str(value))
+
+
+def normalize_state(name: str, state: Mapping[str, Any]) -> ComponentState:
+    # Validates the values, and converts them to the form that component_state() returns
+    return {field: encode_value(field, decode_value(name, field, value)) for field, value in state.items()}
+
+
+def component_state(component: PrismComponent) -> ComponentState:
+    # Lazy components are loaded from the device if they haven't been yet
+    fields = COMPONENT_FIELDS[component_name(component)]
+    return {field: encode_value(field, getattr(component, "rgb" if field == "color" else field)) for field in fields}
+
+
+def apply_component_state(component: PrismComponent, state: Mapping[str, Any]):
+    # Only the settings that are in state are changed
+    name = component_name(component)
+    for field, value in state.items():
+        setattr(component, field, decode_value(name, field, value))
@@ -0,0 +1,442 @@
+import argparse
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import Any, Callable, Dict, Set, Type
+
+from py_wraith_prism.component_state import ComponentState, component_state, apply_component_state, \
+    normalize_state, encode_value, decode_value, COMPONENT_FIELDS
+from py_wraith_prism.device_snapshot import COMPONENT_NAMES
+from py_wraith_prism.scene import Scene
+from py_wraith_prism.wraith_prism import WraithPrism
+
+_logger = logging.getLogger(__name__)
+
+_SOCKET_NAME = "py-wraith-prism.sock"
+
+
+def default_socket_path() -> str:
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_directory:
+        return os.path.join(runtime_directory, _SOCKET_NAME)
+    return f"/tmp/py-wraith-prism-{os.getuid()}.sock"
+
+
+class DaemonError(IOError):
+    '''
+    An error that the daemon reported for a request. error_type is the name of the exception class it raised.
+    '''
+
+    def __init__(self, error_type: str, message: str):
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # Every line is a JSON request, {"id": ..., "method": ..., "params": {...}}, and is answered with a line holding
+    # either {"id": ..., "result": ...} or {"id": ..., "error": {"type": ..., "message": ...}}
+    def handle(self):
+        daemon: WraithPrismDaemon = self.server.daemon
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                    result = daemon.handle(request["method"], request.get("params", {}), self)
+                    response = {"id": request_id, "result": result}
+                except Exception as e:
+                    response = {"id": request_id, "error": {"type": type(e).__name__, "message": str(e)}}
+                self.wfile.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+        finally:
+            daemon.forget_client(self)
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: 'WraithPrismDaemon'):
+        self.daemon = daemon
+        super().__init__(path, _RequestHandler)
+
+
+class WraithPrismDaemon(AbstractContextManager):
+    '''
+    Owns a WraithPrism and serves it to local clients over a Unix domain socket, so that tools share a single HID handle
+    and don't each pay for opening the device.
+
+    Component updates are queued and written by a background thread. Updates to a component that arrive before it was
+    written are merged, so only its latest state is written. The daemon keeps the state that was last written to the
+    device, and serves it with the queued updates on top to clients without touching the device. Operations such as
+    save() write any queued updates first.
+
+    Updates that fail to be written stay queued, and are retried by the next update or operation. The error is raised
+    by the next operation of the clients whose updates failed, and not to anyone else.
+    '''
+
+    def __init__(self, prism: WraithPrism, socket_path: str | None = None):
+        self._prism = prism
+        self.socket_path = socket_path or default_socket_path()
+
+        # Guards the queued updates and the cached state
+        self._lock = threading.Condition()
+        # Device operations run one at a time
+        self._device_lock = threading.RLock()
+        self._pending: Dict[str, ComponentState] = {}
+        self._pending_force = False
+        # The clients whose updates are queued, and the updates that are being written
+        self._pending_clients: Set[object] = set()
+        self._writing: Dict[str, ComponentState] = {}
+        # Set when writing the queued updates failed, so that they aren't retried until something else happens
+        self._stalled = False
+        self._write_errors: Dict[object, Exception] = {}
+        self._closing = False
+
+        self._state: Dict[str, Any] = {name: component_state(getattr(prism, name)) for name in COMPONENT_NAMES}
+        self._state["enso"] = prism.enso
+        self._state["firmware_version"] = prism.request_firmware_version()
+
+        # Every method is called with the client that sent the request, followed by its parameters
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "get_state": lambda client: self._get_state(),
+            "set_components": self._set_components,
+            "flush": lambda client: self._run(client, lambda: None),
+            "save": lambda client, force=False: self._run(client, lambda: prism.save(force=force)),
+            "apply": lambda client: self._run(client, prism.apply),
+            "set_enso": self._set_enso,
+            "request_firmware_version": lambda client: self._state["firmware_version"],
+            "reset_to_default": self._reset_to_default,
+            "power_on": lambda client: self._run(client, prism.power_on),
+            "power_off": lambda client: self._run(client, prism.power_off),
+        }
+
+        self._server: _UnixServer | None = None
+        self._writer = threading.Thread(target=self._write_loop, name="wraith-prism-daemon-writer", daemon=True)
+
+    def handle(self, method: str, params: Dict[str, Any], client: object = None) -> Any:
+        handler = self._methods.get(method)
+        if handler is None:
+            raise ValueError(f"Unknown method {method!r}")
+        return handler(client, **params)
+
+    def forget_client(self, client: object):
+        # Called when a client disconnects. Its updates are still written.
+        with self._lock:
+            self._write_errors.pop(client, None)
+
+    def _get_state(self) -> Dict[str, Any]:
+        with self._lock:
+            state = json.loads(json.dumps(self._state))
+            for updates in (self._writing, self._pending):
+                for name, component_updates in updates.items():
+                    state[name].update(component_updates)
+            return state
+
+    def _set_components(self, client: object, components: Dict[str, ComponentState], force: bool = False):
+        # Validate everything before queueing anything, so that a bad request doesn't change any component
+        normalized = {}
+        for name, state in components.items():
+            if name not in COMPONENT_NAMES:
+                raise ValueError(f"Unknown component {name!r}")
+            normalized[name] = normalize_state(name, state)
+
+        with self._lock:
+            for name, state in normalized.items():
+                self._pending.setdefault(name, {}).update(state)
+            self._pending_force |= force
+            self._pending_clients.add(client)
+            self._stalled = False
+            self._lock.notify_all()
+
+    def _set_enso(self, client: object, value: bool):
+        def set_enso():
+            self._prism.enso = value
+
+        self._run(client, set_enso)
+        with self._lock:
+            self._state["enso"] = value
+
+    def _reset_to_default(self, client: object):
+        with self._device_lock:
+            self._run(client, self._prism.reset_to_default)
+            with self._lock:
+                for name in COMPONENT_NAMES:
+                    self._state[name] = component_state(getattr(self._prism, name))
+                self._state["enso"] = False
+
+    def _run(self, client: object, operation: Callable[[], Any]) -> Any:
+        with self._device_lock:
+            self._write_pending()
+            # A failed write is reported to the clients whose updates it was writing
+            with self._lock:
+                error = self._write_errors.pop(client, None)
+            if error is not None:
+                raise error
+            return operation()
+
+    def _write_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            force, self._pending_force = self._pending_force, False
+            clients, self._pending_clients = self._pending_clients, set()
+            self._writing = pending
+        if not pending:
+            return
+
+        try:
+            components = []
+            for name, state in pending.items():
+                component = getattr(self._prism, name)
+                apply_component_state(component, state)
+                components.append(component)
+            self._prism.submit_components(*components, force=force)
+        except Exception as e:
+            _logger.exception("Failed to write component updates")
+            with self._lock:
+                # Queue the updates again, under any that arrived in the meantime
+                for name, state in pending.items():
+                    self._pending[name] = {**state, **self._pending.get(name, {})}
+                self._pending_force |= force
+                self._pending_clients |= clients
+                self._writing = {}
+                self._stalled = True
+                for client in clients:
+                    self._write_errors[client] = e
+            return
+
+        with self._lock:
+            for name, state in pending.items():
+                self._state[name].update(state)
+            self._writing = {}
+            for client in clients:
+                self._write_errors.pop(client, None)
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while (not self._pending or self._stalled) and not self._closing:
+                    self._lock.wait()
+                if self._closing:
+                    return
+            with self._device_lock:
+                self._write_pending()
+
+    def start(self):
+        if os.path.exists(self.socket_path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(self.socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Left behind by a daemon that didn't shut down cleanly
+                os.unlink(self.socket_path)
+            else:
+                raise IOError(f"A daemon is already listening on {self.socket_path}")
+
+        self._server = _UnixServer(self.socket_path, self)
+        self._writer.start()
+        threading.Thread(target=self._server.serve_forever, name="wraith-prism-daemon", daemon=True).start()
+
+    def serve_forever(self):
+        self.start()
+        try:
+            self._writer.join()
+        finally:
+            self.close()
+
+    def close(self):
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            self._lock.notify_all()
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+        with self._device_lock:
+            try:
+                self._write_pending()
+            finally:
+                self._prism.close()
+
+    def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                 __traceback: TracebackType or None) -> bool or None:
+        self.close()
+        return None
+
+
+class ClientComponent:
+    '''
+    A component of a WraithPrismClient. Its settings are read from the state kept by the daemon, and changes are kept
+    locally until the component is submitted.
+    '''
+
+    def __init__(self, client: 'WraithPrismClient', name: str):
+        object.__setattr__(self, "_client", client)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_changes", {})
+
+    def __getattr__(self, field: str):
+        # Like a PrismComponent, color is a colour.Color and rgb is the same colour as an RGB
+        setting = "color" if field == "rgb" else field
+        if setting not in COMPONENT_FIELDS[self._name]:
+            raise AttributeError(field)
+        if setting in self._changes:
+            value = self._changes[setting]
+        else:
+            value = self._client.get_state()[self._name][setting]
+        value = decode_value(self._name, setting, value)
+        return value.to_color() if field == "color" else value
+
+    def __setattr__(self, field: str, value):
+        setting = "color" if field == "rgb" else field
+        if setting not in COMPONENT_FIELDS[self._name]:
+            raise AttributeError(field)
+        self._changes[setting] = encode_value(setting, value)
+
+
+class WraithPrismClient(AbstractContextManager):
+    '''
+    Talks to a WraithPrismDaemon, with the same API as WraithPrism. Submits are queued by the daemon and return before
+    the device was written; call flush() to wait until it has been, and to get any error writing them raised. Settings
+    are read from the daemon every time, so they include the changes of other clients.
+    '''
+
+    def __init__(self, socket_path: str | None = None):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(socket_path or default_socket_path())
+        self._file = self._socket.makefile("rwb")
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+        self._components = {name: ClientComponent(self, name) for name in COMPONENT_NAMES}
+
+    def _call(self, method: str, **params) -> Any:
+        with self._lock:
+            self._next_id += 1
+            request = {"id": self._next_id, "method": method, "params": params}
+            self._file.write(json.dumps(request, separators=(",", ":")).encode() + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        if not line:
+            raise IOError("The daemon closed the connection")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise DaemonError(response["error"]["type"], response["error"]["message"])
+        return response["result"]
+
+    def get_state(self) -> Dict[str, Any]:
+        return self._call("get_state")
+
+    @property
+    def logo(self) -> ClientComponent:
+        return self._components["logo"]
+
+    @property
+    def fan(self) -> ClientComponent:
+        return self._components["fan"]
+
+    @property
+    def ring(self) -> ClientComponent:
+        return self._components["ring"]
+
+    def submit_component(self, component: ClientComponent, force: bool = False):
+        self.submit_components(component, force=force)
+
+    def submit_components(self, *argv: ClientComponent, force: bool = False):
+        changes = {component._name: dict(component._changes) for component in argv}
+        self._call("set_components", components=changes, force=force)
+        for component in argv:
+            component._changes.clear()
+
+    def submit_all_components(self, force: bool = False):
+        self.submit_components(*self._components.values(), force=force)
+
+    def apply_scene(self, scene: Scene, force: bool = False):
+        # The daemon diffs the scene against the device state like any other update
+        if scene.enso is not None:
+            self.enso = scene.enso
+        self._call("set_components", components=scene.components, force=force)
+
+    def flush(self):
+        self._call("flush")
+
+    def save(self, force: bool = False):
+        self._call("save", force=force)
+
+    def apply(self):
+        self._call("apply")
+
+    @property
+    def enso(self) -> bool:
+        return self.get_state()["enso"]
+
+    @enso.setter
+    def enso(self, value: bool):
+        self._call("set_enso", value=value)
+
+    def request_firmware_version(self) -> str:
+        return self.get_state()["firmware_version"]
+
+    def reset_to_default(self):
+        self._call("reset_to_default")
+
+    def power_on(self):
+        self._call("power_on")
+
+    def power_off(self):
+        self._call("power_off")
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                 __traceback: TracebackType or None) -> bool or None:
+        self.close()
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a Wraith Prism to local clients over a Unix domain socket")
+    parser.add_argument("--socket", default=None, help=f"Socket path (default: {default_socket_path()})")
+    parser.add_argument("--snapshot-directory", default=None,
+                        help="Persist the device state here, so that restarting the daemon doesn't read the device")
+    parser.add_argument("--emulated", action="store_true", help="Serve an emulated device instead of the cooler")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.emulated:
+        from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+        prism = WraithPrism(EmulatedWraithPrismDevice())
+    else:
+        from py_wraith_prism.wraith_device_manager import WraithDeviceManager
+        prism = WraithDeviceManager(args.snapshot_directory).create_device()
+
+    daemon = WraithPrismDaemon(prism, args.socket)
+    # Shut down cleanly when stopped by a service manager, which writes any queued updates
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    _logger.info(f"Listening on {daemon.socket_path}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+from py_wraith_prism.channel_values import ChannelValues
+
+_FORMAT_VERSION = 1
+
+COMPONENT_NAMES = ("logo", "fan", "ring")
+
+
+@dataclass
+class DeviceSnapshot:
+    '''
+    The state of a device after it was last saved: the channel assigned to each component, the channel values of each
+    component (channel, speed, color source, mode, 0xFF, brightness, red, green, blue), the 120 bytes of morse data,
+    the firmware version and the enso flag.
+    '''
+    channel_map: Sequence[int]
+    channel_values: Dict[str, Sequence[int]]
+    morse_bytes: Sequence[int]
+    firmware_version: str | None = None
+    enso: bool | None = None
+
+    def matches_channel_map(self, data: Sequence[int]) -> bool:
+        # Every LED of the ring shares the ring's channel
+        logo, fan, ring = self.channel_map
+        return list(data[8:25]) == [logo, fan] + [ring] * 15
+
+    def get_channel_values(self, name: str) -> ChannelValues:
+        # Shaped like the response of a channel read
+        return ChannelValues([0x52, 0x2C, 1, 0] + list(self.channel_values[name]))
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "version": _FORMAT_VERSION,
+            "channel_map": list(self.channel_map),
+            "channel_values": {name: bytes(values).hex() for name, values in self.channel_values.items()},
+            "morse_bytes": bytes(self.morse_bytes).hex(),
+            "firmware_version": self.firmware_version,
+            "enso": self.enso,
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'DeviceSnapshot':
+        data = json.loads(text)
+        if data.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {data.get('version')}")
+
+        return cls(
+            channel_map=data["channel_map"],
+            channel_values={name: list(bytes.fromhex(values)) for name, values in data["channel_values"].items()},
+            morse_bytes=list(bytes.fromhex(data["morse_bytes"])),
+            firmware_version=data["firmware_version"],
+            enso=data["enso"],
+        )
+
+
+def snapshot_key(descriptor) -> str:
+    path = descriptor["path"]
+    if isinstance(path, bytes):
+        path = path.decode(errors="replace")
+    return f"{path}|{descriptor.get('serial_number') or ''}"
+
+
+class SnapshotStore:
+    '''
+    Stores one snapshot file per device in a directory, keyed by the device path and serial number.
+    '''
+    # hashlib and tempfile are imported where they're used, since they're slow to import and only needed when
+    # snapshots are enabled
+
+    def __init__(self, directory: str):
+        self._directory = directory
+
+    def _path(self, key: str) -> str:
+        import hashlib
+
+        name = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return os.path.join(self._directory, f"{name}.json")
+
+    def load(self, key: str) -> DeviceSnapshot | None:
+        try:
+            with open(self._path(key), "r") as f:
+                return DeviceSnapshot.from_json(f.read())
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            # A corrupt or outdated snapshot is the same as not having one
+            self.invalidate(key)
+            return None
+
+    def store(self, key: str, snapshot: DeviceSnapshot):
+        import tempfile
+
+        os.makedirs(self._directory, exist_ok=True)
+        path = self._path(key)
+        # Write to a temporary file first so that a concurrent reader never sees a partial snapshot
+        fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(snapshot.to_json())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def invalidate(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def invalidate_all(self):
+        try:
+            names = os.listdir(self._directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith(".json"):
+                os.unlink(os.path.join(self._directory, name))
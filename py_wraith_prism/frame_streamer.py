@@ -0,0 +1,180 @@
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Callable, Iterable, Iterator, NamedTuple, Tuple, Type
+
+from py_wraith_prism.prism_components.prism_components import PrismComponent
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.wraith_prism import WraithPrism
+
+# Anything RGB.coerce() accepts: an RGB, a colour.Color, an (r, g, b) tuple of 0-255 values, a hex string or an int
+FrameColor = RGB | Tuple[int, int, int] | str | int | None
+
+
+class Frame(NamedTuple):
+    '''
+    The colour of each zone for a single frame. Zones that are None keep their current colour.
+    '''
+    logo: FrameColor = None
+    fan: FrameColor = None
+    ring: FrameColor = None
+
+
+# A frame source is either an iterable of frames, or a callable that is passed the frame index and the number of
+# seconds since streaming started. Returning None (or exhausting the iterable) stops the stream.
+FrameSource = Iterable[Frame] | Callable[[int, float], Frame | None]
+
+
+@dataclass
+class FrameStats:
+    frames: int = 0
+    dropped: int = 0
+    elapsed: float = 0.0
+    last_latency: float = 0.0
+    max_latency: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def achieved_fps(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.frames if self.frames > 0 else 0.0
+
+
+class FrameStreamer:
+    '''
+    Streams frames from a frame source to the device at a fixed rate. Every zone in a frame is switched to its static
+    mode, and only the packets that changed since the previous frame are sent.
+
+    When the device can't keep up with the target rate, frames that are already stale are dropped instead of being
+    queued, and streaming continues with the frame that is currently due. The last frame of the source is never
+    dropped. A target fps of None streams frames as fast as the device accepts them.
+
+    The streamer owns the device while it's running, so the WraithPrism shouldn't be used from other threads until it
+    has stopped.
+    '''
+
+    def __init__(self, prism: WraithPrism, source: FrameSource, fps: float | None = 30):
+        self._prism = prism
+        self._source = source
+        self._period = 1 / fps if fps else 0.0
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stats = FrameStats()
+
+    def run(self, duration: float | None = None):
+        self._stop_event.clear()
+        self._run(duration)
+
+    def _run(self, duration: float | None):
+        self.stats = FrameStats()
+
+        if callable(self._source):
+            source = self._source
+            frames: Iterator[Frame | None] | None = None
+        else:
+            source = None
+            frames = iter(self._source)
+
+        start = time.perf_counter()
+        index = 0
+        try:
+            while not self._stop_event.is_set():
+                now = time.perf_counter() - start
+                if duration is not None and now >= duration:
+                    break
+
+                # Skip straight to the frame that is due now rather than sending frames that are already late
+                late = max(int(now / self._period) - index, 0) if self._period > 0 else 0
+                frame, skipped = self._next_frame(source, frames, index, late, now)
+                if frame is None:
+                    break
+                self.stats.dropped += skipped
+                index += skipped
+
+                frame_start = time.perf_counter()
+                self._render(frame)
+                latency = time.perf_counter() - frame_start
+
+                self.stats.frames += 1
+                self.stats.last_latency = latency
+                self.stats.total_latency += latency
+                self.stats.max_latency = max(self.stats.max_latency, latency)
+
+                index += 1
+                if self._period > 0:
+                    delay = start + index * self._period - time.perf_counter()
+                    if delay > 0:
+                        self._stop_event.wait(delay)
+        finally:
+            self.stats.elapsed = time.perf_counter() - start
+
+    @staticmethod
+    def _next_frame(source: Callable[[int, float], Frame | None] | None, frames: Iterator[Frame | None] | None,
+                    index: int, late: int, now: float) -> Tuple[Frame | None, int]:
+        # Returns the frame to send and the number of frames skipped before it. Late frames are skipped, but the last
+        # one never is, so a stream that ends while the device is behind still ends on its final frame.
+        if frames is not None:
+            frame = None
+            taken = 0
+            for frame in itertools.islice(frames, late + 1):
+                taken += 1
+            return frame, max(taken - 1, 0)
+
+        for skipped in range(late, -1, -1):
+            frame = source(index + skipped, now)
+            if frame is not None:
+                return frame, skipped
+        return None, 0
+
+    def _render(self, frame: Frame):
+        prism = self._prism
+        changed = []
+        for component, value, static_mode in ((prism.logo, frame.logo, BasicPrismMode.Static),
+                                              (prism.fan, frame.fan, BasicPrismMode.Static),
+                                              (prism.ring, frame.ring, PrismRingMode.Static)):
+            if value is not None:
+                self._set_static_color(component, static_mode, RGB.coerce(value))
+                changed.append(component)
+
+        if changed:
+            prism.submit_components(*changed)
+
+    @staticmethod
+    def _set_static_color(component: PrismComponent, static_mode: BasicPrismMode | PrismRingMode, color: RGB):
+        component.mode = static_mode
+        component.color = color
+
+    def start(self, duration: float | None = None):
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("The frame streamer is already running.")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="wraith-prism-frames", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def join(self, timeout: float | None = None):
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self) -> 'FrameStreamer':
+        self.start()
+        return self
+
+    def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                 __traceback: TracebackType or None) -> bool or None:
+        self.stop()
+        return None
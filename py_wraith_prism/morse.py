@@ -1,101 +1,75 @@
-import itertools
 import re
-from typing import Sequence, Iterable
+from functools import lru_cache
+from typing import Sequence, Iterable, List
 
 END = 3
 
+# The number of distinct messages whose encoding is kept by morse_or_text_to_bytes()
+ENCODE_CACHE_SIZE = 256
+
 
 def morse_or_text_to_bytes(text: str) -> Sequence[int]:
+    return _encode(text)
+
+
+def encode_many(texts: Iterable[str]) -> List[bytes]:
+    # Repeated messages are only encoded once
+    return [_encode(text) for text in texts]
+
+
+@lru_cache(maxsize=ENCODE_CACHE_SIZE)
+def _encode(text: str) -> bytes:
     if is_morse_code(text):
-        text = text.strip()
+        symbols = text.strip()
     else:
-        text = _from_text_to_morse(text)
-
-    result = bytearray()
-
-    bits_values = itertools.chain((_char_to_bits_map[c] for c in text), [0, END])
-    iterator = iter(bits_values)
-    byte = 0
-    try:
-        while True:
-            a = next(iterator)
-            byte |= a
-            b = next(iterator)
-            byte |= b << 2
-            c = next(iterator)
-            byte |= c << 4
-            d = next(iterator)
-            byte |= d << 6
-            result.append(byte)
-            byte = 0
-    except StopIteration:
-        if byte != 0:
-            result.append(byte)
-
-    return result
+        symbols = _from_text_to_morse(text)
+
+    # A trailing space and the end marker terminate the message, and the last byte is padded with zero bits
+    symbols += _END_SYMBOLS
+    symbols += " " * (-len(symbols) % 4)
+    symbols_to_byte = _symbols_to_byte_map
+    return bytes([symbols_to_byte[symbols[i:i + 4]] for i in range(0, len(symbols), 4)])
 
 
 def bytes_to_morse_or_text(morse_bytes: Iterable[int], morse: bool = False) -> str:
-    morse_values = ""
-    for byte in morse_bytes:
-        a = byte & 0b00000011
-        if a == END:
-            break
-        morse_values += _bits_to_char_map[a]
-        b = (byte & 0b00001100) >> 2
-        if b == END:
-            break
-        morse_values += _bits_to_char_map[b]
-        c = (byte & 0b00110000) >> 4
-        if c == END:
-            break
-        morse_values += _bits_to_char_map[c]
-        d = (byte & 0b11000000) >> 6
-        if d == END:
-            break
-        morse_values += _bits_to_char_map[d]
+    morse_values = "".join(map(_byte_to_symbols_map.__getitem__, morse_bytes)).partition(_END_SYMBOL)[0]
 
     if morse:
         return morse_values
 
-    result = ""
-    # Because spaces can either be a split between morse values, it's easier to use a regex
-    split_values = re.split(r'([.-]+)', morse_values)
-    for value in split_values:
-        if value == "":
-            continue
-        if value[0] == " ":
-            assert value.isspace()
-            result += " " * int(len(value) / 3)
-        else:
-            result += _morse_to_char_map[value]
-
-    return result.strip()
+    # Because spaces can either be a split between morse values or a space between words, it's easier to use a regex.
+    # Every third space of a run is a space in the text.
+    return "".join(map(_morse_to_text_map.__getitem__, _morse_value_pattern.findall(morse_values))).strip()
 
 
 def is_morse_code(text: str) -> bool:
-    for char in text.strip():
-        if char not in _char_to_morse_map.values():
-            return False
-    return True
+    return _morse_symbols.issuperset(text.strip())
 
 
 def is_valid_morse_text(text: str) -> bool:
-    distinct = set((c for c in text.strip().upper()))
-    return any((c for c in distinct if c not in _char_to_morse_map.keys()))
+    distinct = set(text.strip().upper())
+    return not _morse_chars.issuperset(distinct)
 
 
 def invalid_morse_chars(text: str) -> str:
-    distinct = set((c for c in text.strip().upper()))
-    return "".join((c for c in distinct if c not in _char_to_morse_map.keys()))
+    distinct = set(text.strip().upper())
+    return "".join((c for c in distinct if c not in _morse_chars))
+
+
+def validate_morse_text(text: str) -> str:
+    # Raises a ValueError for text that can't be shown in morse mode, and otherwise returns it
+    if not is_morse_code(text):
+        invalid = invalid_morse_chars(text)
+        if invalid:
+            raise ValueError(f"Morse text can't contain {invalid!r}")
+    return text
 
 
 def _from_text_to_morse(text: str) -> str:
-    return " ".join(_char_to_morse_map[c] for c in text.strip().upper())
+    return " ".join([_char_to_morse_map[c] for c in text.strip().upper()])
 
 
 _bits_to_char_map = [' ', '.', '-']
-_char_to_bits_map = {v: i for i, v in enumerate(_bits_to_char_map)}
 _char_to_morse_map = {
     'A': ".-", 'B': "-...", 'C': "-.-.", 'D': "-..", 'E': ".", 'F': "..-.", 'G': "--.", 'H': "....",
     'I': "..", 'J': ".---", 'K': "-.-", 'L': ".-..", 'M': "--", 'N': "-.", 'O': "---", 'P': ".--.",
@@ -112,3 +86,30 @@ _char_to_morse_map = {
     '\"': ".-..-.", '?': "..--..", '/': "-..-.", ' ': ' '
 }
 _morse_to_char_map = {v: k for k, v in _char_to_morse_map.items()}
+
+_morse_chars = frozenset(_char_to_morse_map.keys())
+# The characters that make up morse code: a single dot, dash or space
+_morse_symbols = frozenset(v for v in _char_to_morse_map.values() if len(v) == 1)
+_morse_value_pattern = re.compile(r'[.-]+| +')
+
+
+class _MorseToTextMap(dict):
+    def __missing__(self, key: str) -> str:
+        if key[0] != " ":
+            raise KeyError(key)
+        spaces = " " * (len(key) // 3)
+        self[key] = spaces
+        return spaces
+
+
+_morse_to_text_map = _MorseToTextMap({k: v for k, v in _morse_to_char_map.items() if k != " "})
+
+# Each byte holds four 2-bit symbols, lowest bits first. The end marker is represented by a symbol of its own, so that
+# every byte value maps to exactly one string of four symbols.
+_END_SYMBOL = "|"
+_END_SYMBOLS = _bits_to_char_map[0] + _END_SYMBOL
+_symbol_chars = _bits_to_char_map + [_END_SYMBOL]
+_byte_to_symbols_map = [
+    "".join(_symbol_chars[(byte >> shift) & 0b11] for shift in (0, 2, 4, 6)) for byte in range(256)
+]
+_symbols_to_byte_map = {symbols: byte for byte, symbols in enumerate(_byte_to_symbols_map)}
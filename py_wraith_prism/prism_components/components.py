@@ -1,18 +1,77 @@
-from typing import Sequence, List
+from typing import Sequence, Callable, Dict, List, TYPE_CHECKING
 
 from py_wraith_prism.prism_components.prism_components import PrismLogoComponent, \
-    PrismComponent, PrismFanComponent, PrismRingComponent
+    PrismComponent, PrismFanComponent, PrismRingComponent, BasicPrismComponent, _UNLOADED
 from py_wraith_prism.usb.wraith_usb_interface import WraithUsbInterface
 
+if TYPE_CHECKING:
+    from py_wraith_prism.device_snapshot import DeviceSnapshot
+
+READ_CHANNEL_MAP = bytes([0x52, 0xA0, 1, 0, 0, 3])
+
+# Channels that are assigned to the logo and fan when they're written before the channel map has been read
+DEFAULT_LOGO_CHANNEL = 0x05
+DEFAULT_FAN_CHANNEL = 0x06
+
+
+def channel_assignment(logo_channel: int, fan_channel: int, ring_channel: int) -> List[int]:
+    # The packet that assigns a channel to each component, which the ring's fifteen LEDs all share
+    return [0x51, 0xA0, 1, 0, 0, 3, 0, 0, logo_channel, fan_channel] + [ring_channel] * 15
+
 
 class Components(Sequence[PrismComponent]):
-    def __init__(self, usb: WraithUsbInterface, data: List[int]):
-        self._logo = PrismLogoComponent(usb, data[8])
-        self._fan = PrismFanComponent(usb, data[9])
-        self._ring = PrismRingComponent(usb, data[10])
+    def __init__(self, usb: WraithUsbInterface, data: Sequence[int] | None, lazy: bool = False):
+        self._usb = usb
+        self._channel_map: Sequence[int] | None = data
+        # The indexes in the channel map of the components whose channel was assumed to be the default, because they
+        # were only written to before the channel map was read
+        self._assumed_channels: Dict[int, BasicPrismComponent] = {}
+
+        if lazy:
+            self._logo = PrismLogoComponent(usb, self._lazy_channel(8, DEFAULT_LOGO_CHANNEL), lazy=True)
+            self._fan = PrismFanComponent(usb, self._lazy_channel(9, DEFAULT_FAN_CHANNEL), lazy=True)
+            self._ring = PrismRingComponent(usb, lambda: self._fetch_channel_map()[10], lazy=True)
+        else:
+            self._logo = PrismLogoComponent(usb, data[8])
+            self._fan = PrismFanComponent(usb, data[9])
+            self._ring = PrismRingComponent(usb, data[10])
 
         self._values = [self.logo, self.fan, self.ring]
 
+    def _fetch_channel_map(self) -> Sequence[int]:
+        if self._channel_map is None:
+            self._channel_map = data = self._usb.send_packet(READ_CHANNEL_MAP)
+            # The device's channel map is never replaced with the defaults, so a component that was assumed to be on
+            # its default channel moves to the one it's really on, and is written there by the next submit
+            for index, component in self._assumed_channels.items():
+                if component.channel != data[index]:
+                    component._move_to_channel(data[index])
+            self._assumed_channels.clear()
+        return self._channel_map
+
+    def _lazy_channel(self, index: int, default: int) -> Callable[[bool], int]:
+        def resolve(for_read: bool) -> int:
+            # A write-only caller doesn't read the channel map, and assumes the component is on its default channel,
+            # where the device and this library put it
+            if for_read or self._channel_map is not None:
+                return self._fetch_channel_map()[index]
+            self._assumed_channels[index] = self._logo if index == 8 else self._fan
+            return default
+
+        return resolve
+
+    @property
+    def channel_map_known(self) -> bool:
+        # Whether the device's channel map was read, which writing the channel assignment requires, so that the logo
+        # and fan are kept on the channels they're on rather than moved to the defaults
+        return self._channel_map is not None
+
+    def fetch_channel_map_for_assignment(self, ring_set: bool = False):
+        # The ring's channel follows from its mode, so once that's set, the next submit writes the channel assignment.
+        # The channel map is read before anything is written, so the logo and fan are written to their real channels.
+        if self._channel_map is None and (ring_set or self._ring._mode is not _UNLOADED):
+            self._fetch_channel_map()
+
     def __getitem__(self, index):
         return self._values[index]
 
@@ -31,6 +90,35 @@ class Components(Sequence[PrismComponent]):
     def ring(self) -> PrismRingComponent:
         return self._ring
 
+    def load(self):
+        for component in self._values:
+            component.load()
+
+    def load_snapshot(self, snapshot: 'DeviceSnapshot'):
+        # Takes the place of reading every component from the device
+        self._logo._reload_values(snapshot.get_channel_values("logo"))
+        self._fan._reload_values(snapshot.get_channel_values("fan"))
+        self._ring._reload_values(snapshot.get_channel_values("ring"), snapshot.morse_bytes)
+
+    def submitted_values(self) -> Dict[str, Sequence[int]] | None:
+        values = {"logo": self._logo._submitted_byte_values,
+                  "fan": self._fan._submitted_byte_values,
+                  "ring": self._ring._submitted_byte_values}
+        if any(value is None for value in values.values()):
+            return None
+        return values
+
+    def submitted_morse_bytes(self) -> bytes | None:
+        return self._ring._submitted_morse_bytes
+
+    def invalidate_submitted_values(self):
+        for component in self._values:
+            component.invalidate_submitted_values()
+
+    def resend_submitted_values(self):
+        for component in self._values:
+            component.resend_submitted_values()
+
     def save(self):
         for component in self._values:
             component.save()
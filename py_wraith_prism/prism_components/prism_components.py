@@ -1,30 +1,212 @@
-import itertools
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from math import floor
-from typing import List, Sequence, Iterable, Tuple
-
-from colour import Color
+from typing import List, Sequence, Iterable, Tuple, Callable, Any, TYPE_CHECKING
 
 from py_wraith_prism.channel_values import ChannelValues
-from py_wraith_prism.morse import morse_or_text_to_bytes, bytes_to_morse_or_text
+from py_wraith_prism.morse import morse_or_text_to_bytes, bytes_to_morse_or_text, validate_morse_text
 from py_wraith_prism.prism_components.enums import Speed, Brightness, ColorSupport, \
     RotationDirection
 from py_wraith_prism.prism_components.mirage_state import MirageState, MirageStateOn
 from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.prism_components.submit_result import SubmitResult, SENT, SKIPPED
+from py_wraith_prism.rgb import RGB, BLACK
 from py_wraith_prism.usb.wraith_usb_interface import WraithUsbInterface
 
+# colour is only imported when a colour.Color is asked for
+if TYPE_CHECKING:
+    from colour import Color
+
+# Placeholder for values that haven't been read from the device yet
+_UNLOADED: Any = object()
+
+_WRITE_VALUES_HEADER = bytes([0x51, 0x2C, 1, 0])
+_WRITE_VALUES_TRAILER = bytes([0, 0, 0])
+_READ_VALUES_HEADER = bytes([0x52, 0x2C, 1, 0])
+_READ_MORSE_CHUNKS = (bytes([0x52, 0x73, 2]), bytes([0x52, 0x73, 3]))
+_WRITE_MORSE_HEADERS = tuple(bytes([0x51, 0x73, chunk, 0]) for chunk in range(4))
+_MORSE_CHUNK_SIZE = 60
+_MIRAGE_OFF_BYTES = bytes([0x51, 0x71, 0, 0, 1, 0, 0xFF, 0x4A, 2, 0, 0xFF, 0x4A, 3, 0, 0xFF, 0x4A, 4, 0, 0xFF, 0x4A])
+
+# The number of distinct states of each kind of component whose channel values are kept
+VALUES_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=VALUES_CACHE_SIZE)
+def _basic_values(channel: int, mode_name: str, speed: Speed, brightness: Brightness, color: int,
+                  use_random_color: bool) -> bytes:
+    # Modes can't be hashed, so they're passed by name
+    mode = BasicPrismMode[mode_name]
+    color_source = 0x80 if use_random_color else 0x20
+    return bytes((channel, mode.speeds.get(speed, 0x2C), color_source, mode.mode, 0xFF,
+                  mode.brightnesses.get(brightness, 0), color >> 16, (color >> 8) & 0xFF, color & 0xFF))
+
+
+@lru_cache(maxsize=VALUES_CACHE_SIZE)
+def _ring_values(mode_name: str, speed: Speed, brightness: Brightness, color: int, use_random_color: bool,
+                 direction: RotationDirection) -> bytes:
+    mode = PrismRingMode[mode_name]
+    speed_value = mode.speeds.get(speed, 0x2C) if mode != PrismRingMode.Morse else 0x6B
+
+    if mode.color_support == ColorSupport.All and use_random_color:
+        if mode.supports_direction:
+            color_source = 0x80 + direction
+        else:
+            color_source = 0
+    elif mode.supports_direction:
+        color_source = int(direction)
+    else:
+        color_source = mode.color_source
+
+    return bytes((mode.channel, speed_value, color_source, mode.mode, 0xFF, mode.brightnesses.get(brightness, 0x99),
+                  color >> 16, (color >> 8) & 0xFF, color & 0xFF))
+
+
+def mirage_freq_bytes(value: int) -> Tuple[int, int, int]:
+    initial = 187498 / value
+
+    multiplicand = floor(initial / 256)
+    rem = initial / (multiplicand + 1)
+
+    return multiplicand, floor(rem % 1 * 256), floor(rem)
+
+
+def mirage_bytes(state: MirageState) -> bytes:
+    if isinstance(state, MirageStateOn):
+        (rm, ri, rd) = mirage_freq_bytes(state.red_freq)
+        (gm, gi, gd) = mirage_freq_bytes(state.green_freq)
+        (bm, bi, bd) = mirage_freq_bytes(state.blue_freq)
+
+        return bytes([0x51, 0x71, 0, 0, 1, 0, 0xFF, 0x4A, 2, rm, ri, rd, 3, gm, gi, gd, 4, bm, bi, bd])
+    else:
+        return _MIRAGE_OFF_BYTES
+
+
+def padded_morse_bytes(morse_bytes: Sequence[int]) -> bytes:
+    # The device always holds 120 bytes of morse data, and anything past the encoded text is zero-filled
+    return bytes(morse_bytes[0:120]).ljust(120, b"\0")
+
+
+def morse_chunks(padded_morse_bytes: bytes) -> Tuple[bytes, ...]:
+    # What each of the four morse chunks on the device holds
+    return tuple(_morse_chunk(padded_morse_bytes, chunk) for chunk in range(len(_WRITE_MORSE_HEADERS)))
+
+
+def _morse_chunk(padded_morse_bytes: bytes, chunk: int) -> bytes:
+    # Chunks 0 and 2 hold the first 60 bytes, and chunks 1 and 3 hold the rest
+    start = (chunk % 2) * _MORSE_CHUNK_SIZE
+    return padded_morse_bytes[start:start + _MORSE_CHUNK_SIZE]
+
 
 class PrismComponent(ABC):
-    def __init__(self, usb: WraithUsbInterface, mode: BasicPrismMode | PrismRingMode):
+    # The values that are read from the device in a single channel read
+    _FIELDS = ("_mode", "_color", "_speed", "_brightness", "_use_random_color")
+
+    def __init__(self, usb: WraithUsbInterface, mode: BasicPrismMode | PrismRingMode, lazy: bool = False):
         self._usb: WraithUsbInterface = usb
 
-        self.mode: BasicPrismMode | PrismRingMode = mode
-        self.color: Color = Color("black")
-        self.speed: Speed = Speed.Medium
-        self.brightness: Brightness = Brightness.Medium
+        self._mode: BasicPrismMode | PrismRingMode = mode
+        self._color: RGB = BLACK
+        self._speed: Speed = Speed.Medium
+        self._brightness: Brightness = Brightness.Medium
+
+        self._use_random_color: bool = False
+        self._saved_byte_values: bytes = b""
+        # The last colour.Color returned by the color property, its channels then, and the RGB it was made from
+        self._returned_color: Tuple['Color', Tuple[float, float, float], RGB] | None = None
+
+        # The values that were last written to (or read from) the device. None means the device state is unknown.
+        self._submitted_byte_values: bytes | None = None
+
+        if lazy:
+            # Values are read from the device the first time one of them is needed, unless they were all set first
+            for name in self._FIELDS:
+                setattr(self, name, _UNLOADED)
+
+    @property
+    def mode(self) -> BasicPrismMode | PrismRingMode:
+        if self._mode is _UNLOADED:
+            self._load_values()
+        return self._mode
+
+    @mode.setter
+    def mode(self, value: BasicPrismMode | PrismRingMode):
+        self._mode = value
+
+    @property
+    def color(self) -> 'Color':
+        rgb = self.rgb
+        color = rgb.to_color()
+        self._returned_color = (color, color.rgb, rgb)
+        return color
+
+    @color.setter
+    def color(self, value: 'Color | Any'):
+        # Converting a colour.Color back to bytes doesn't always give the bytes it was made from, so a colour that was
+        # returned by the getter and hasn't been changed since is set as the RGB it came from
+        returned = self._returned_color
+        if returned is not None and value is returned[0] and value.rgb == returned[1]:
+            self._color = returned[2]
+            return
+        # Accepts anything RGB.coerce() does, such as an RGB, a hex string or an (r, g, b) tuple
+        self._color = RGB.coerce(value)
+
+    @property
+    def rgb(self) -> RGB:
+        # The colour as it's held and sent to the device, which is much cheaper to use than a colour.Color
+        if self._color is _UNLOADED:
+            self._load_values()
+        return self._color
+
+    @rgb.setter
+    def rgb(self, value: RGB | Any):
+        self._color = RGB.coerce(value)
+
+    @property
+    def speed(self) -> Speed:
+        if self._speed is _UNLOADED:
+            self._load_values()
+        return self._speed
+
+    @speed.setter
+    def speed(self, value: Speed):
+        self._speed = value
+
+    @property
+    def brightness(self) -> Brightness:
+        if self._brightness is _UNLOADED:
+            self._load_values()
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value: Brightness):
+        self._brightness = value
+
+    @property
+    def use_random_color(self) -> bool:
+        if self._use_random_color is _UNLOADED:
+            self._load_values()
+        return self._use_random_color
+
+    @use_random_color.setter
+    def use_random_color(self, value: bool):
+        self._use_random_color = value
+
+    @property
+    def is_loaded(self) -> bool:
+        return all(getattr(self, name) is not _UNLOADED for name in self._FIELDS)
+
+    def load(self):
+        if not self.is_loaded:
+            self._load_values()
 
-        self.use_random_color: bool = False
-        self._saved_byte_values: Sequence[int] = []
+    def _load_values(self):
+        # Values that were set before loading take precedence over the ones on the device
+        assigned = {name: getattr(self, name) for name in self._FIELDS if getattr(self, name) is not _UNLOADED}
+        self._reload_channel_values()
+        self._saved_byte_values = self._byte_values
+        for name, value in assigned.items():
+            setattr(self, name, value)
 
     @property
     @abstractmethod
@@ -32,44 +214,69 @@ class PrismComponent(ABC):
         pass
 
     def save(self):
-        self._saved_byte_values = self._byte_values
-
-    @property
-    def _color_bytes(self) -> List[int]:
-        return [int(self.color.red * 255),
-                int(self.color.green * 255),
-                int(self.color.blue * 255)]
+        # A component that hasn't been read isn't read for this. The device holds the saved values once it has been
+        # saved, so they're the ones that are read when it's loaded.
+        if self.is_loaded:
+            self._saved_byte_values = self._byte_values
 
     @property
     def has_unsaved_changes(self) -> bool:
-        values = self._byte_values
-        saved_values = self._saved_byte_values
-        if len(values) != len(saved_values):
-            return True
-
-        for value, savedValue in zip(values, saved_values):
-            if value != savedValue:
-                return True
-        return False
+        return self._byte_values != self._saved_byte_values
 
     @property
     @abstractmethod
-    def _byte_values(self) -> Sequence[int]:
+    def _byte_values(self) -> bytes:
+        # The channel values that are sent for the current state, which are cached by state
         pass
 
     @abstractmethod
-    def _reload_values(self):
+    def _reload_channel_values(self, channel_values: ChannelValues | None = None):
         pass
 
-    def submit_values(self):
-        data = itertools.chain([0x51, 0x2C, 1, 0], self._byte_values, [0, 0, 0])
-        self._usb.send_bytes(data, filler=0xFF)
+    def _reload_values(self, channel_values: ChannelValues | None = None):
+        self._reload_channel_values(channel_values)
+        self.save()
+
+    def invalidate_submitted_values(self):
+        self._submitted_byte_values = None
+
+    def read_written_values(self, byte_values: bytes) -> bytes:
+        # Reads the values of the channel that byte_values were written to back from the device, to compare them with
+        # byte_values. The mode may have changed the channel, so it's the one in the written values.
+        response = self._usb.send_packet(_READ_VALUES_HEADER, byte_values[:1])
+        return response[len(_READ_VALUES_HEADER):len(_READ_VALUES_HEADER) + len(byte_values)]
+
+    def resend_submitted_values(self):
+        # Writes the values that were last submitted again, after the device lost them. Unknown values aren't sent.
+        if self._submitted_byte_values is not None:
+            self._usb.write_packet(_WRITE_VALUES_HEADER, self._submitted_byte_values, _WRITE_VALUES_TRAILER,
+                                   filler=0xFF)
+
+    def submit_values(self, force: bool = False) -> SubmitResult:
+        return self._submit_extra_values(force) + self._write_values(self._byte_values, force)
+
+    def _submit_extra_values(self, force: bool) -> SubmitResult:
+        # The packets that a submit sends before the channel values, such as the fan's mirage state
+        return SubmitResult()
+
+    def _write_values(self, byte_values: bytes, force: bool) -> SubmitResult:
+        # Also used to send values that were compiled ahead of time, e.g. by a scene
+        if not force and byte_values == self._submitted_byte_values:
+            return SKIPPED
+
+        self._usb.write_packet(_WRITE_VALUES_HEADER, byte_values, _WRITE_VALUES_TRAILER, filler=0xFF)
+        self._submitted_byte_values = byte_values
+        return SENT
+
+    @property
+    def _read_channel(self) -> int:
+        return self.channel
 
     def _fetch_channel_values(self) -> ChannelValues:
-        return ChannelValues(self._usb.send_bytes([0x52, 0x2C, 1, 0, self.channel]))
+        return ChannelValues(self._usb.send_packet(_READ_VALUES_HEADER, (self._read_channel,)))
 
     def _assign_common_values_from_channel(self, channel_values: ChannelValues):
-        self.color = channel_values.color if self.mode.color_support != ColorSupport.None_ else Color("black")
+        self.rgb = channel_values.rgb if self.mode.color_support != ColorSupport.None_ else BLACK
         self.use_random_color = (
                 (self.mode.color_support == ColorSupport.All) and
                 (channel_values.color_source & 0x80 != 0))
@@ -79,96 +286,143 @@ class PrismComponent(ABC):
 
 
 class BasicPrismComponent(PrismComponent, ABC):
-    def __init__(self, usb: WraithUsbInterface, channel: int):
-        super().__init__(usb, BasicPrismMode.Off)
-        self._channel: int = channel
-        self._reload_values()
+    def __init__(self, usb: WraithUsbInterface, channel: int | Callable[[bool], int], lazy: bool = False):
+        super().__init__(usb, BasicPrismMode.Off, lazy)
+        # When lazy, the channel is resolved when it's first needed. The callable is passed whether the channel is
+        # needed to read values from the device, or only to write them, and is kept until the channel was resolved for
+        # a read, since a channel that was only needed for writing may have been assumed.
+        self._resolve_channel: Callable[[bool], int] | None = channel if callable(channel) else None
+        self._channel: int | None = None if callable(channel) else channel
+        if not lazy:
+            self._reload_values()
 
     @property
     def channel(self):
+        if self._channel is None:
+            self._channel = self._resolve_channel(False)
         return self._channel
 
-    @property
-    def _byte_values(self) -> Sequence[int]:
-        try:
-            brightness: int = self.mode.brightnesses[self.brightness]
-        except KeyError:
-            brightness: int = 0
-
-        try:
-            speed: int = self.mode.speeds[self.speed]
-        except KeyError:
-            speed: int = 0x2C
+    def _load_values(self):
+        if self._resolve_channel is not None:
+            self._channel = self._resolve_channel(True)
+            self._resolve_channel = None
+        super()._load_values()
 
-        color_source: int = 0x80 if self.use_random_color else 0x20
+    def _move_to_channel(self, channel: int):
+        # The values that were written to the old channel don't count for the new one
+        self._channel = channel
+        self._submitted_byte_values = None
 
-        return [self._channel, speed, color_source, self.mode.mode, 0xFF, brightness] + self._color_bytes
+    @property
+    def _byte_values(self) -> bytes:
+        return _basic_values(self.channel, self.mode.name, self.speed, self.brightness, self.rgb.value,
+                             self.use_random_color)
 
-    def _reload_values(self):
-        channel_values = self._fetch_channel_values()
+    def _reload_channel_values(self, channel_values: ChannelValues | None = None):
+        if channel_values is None:
+            channel_values = self._fetch_channel_values()
         self.mode = BasicPrismMode.from_mode(channel_values.mode)
         self._assign_common_values_from_channel(channel_values)
-        self.save()
+        # What the device holds, which isn't necessarily how the values that were read would be written back
+        self._submitted_byte_values = channel_values.byte_values
 
 
 class PrismLogoComponent(BasicPrismComponent):
-    def __init__(self, usb: WraithUsbInterface, channel: int):
-        super().__init__(usb, channel)
+    def __init__(self, usb: WraithUsbInterface, channel: int | Callable[[bool], int], lazy: bool = False):
+        super().__init__(usb, channel, lazy)
 
 
 class PrismFanComponent(BasicPrismComponent):
-    def __init__(self, usb: WraithUsbInterface, channel: int):
-        super().__init__(usb, channel)
+    def __init__(self, usb: WraithUsbInterface, channel: int | Callable[[bool], int], lazy: bool = False):
+        super().__init__(usb, channel, lazy)
 
         # No hardware getter, so mirageState starts as off due to being unknown
         self.mirage_state: MirageState = MirageState.Off
+        self._submitted_mirage_bytes: bytes | None = None
 
-    @staticmethod
-    def _mirage_freq_bytes(value: int) -> Tuple[int, int, int]:
-        initial = 187498 / value
+    def invalidate_submitted_values(self):
+        super().invalidate_submitted_values()
+        self._submitted_mirage_bytes = None
 
-        multiplicand = floor(initial / 256)
-        rem = initial / (multiplicand + 1)
+    def resend_submitted_values(self):
+        if self._submitted_mirage_bytes is not None:
+            self._usb.write_packet(self._submitted_mirage_bytes)
+        super().resend_submitted_values()
 
-        return multiplicand, floor(rem % 1 * 256), floor(rem)
+    def _submit_extra_values(self, force: bool) -> SubmitResult:
+        return self.submit_mirage_state(force)
 
-    def submit_values(self):
-        self.submit_mirage_state()
-        super().submit_values()
+    @property
+    def _mirage_bytes(self) -> bytes:
+        return mirage_bytes(self.mirage_state)
 
-    def submit_mirage_state(self):
-        state = self.mirage_state
-        if isinstance(state, MirageStateOn):
-            (rm, ri, rd) = self._mirage_freq_bytes(state.red_freq)
-            (gm, gi, gd) = self._mirage_freq_bytes(state.green_freq)
-            (bm, bi, bd) = self._mirage_freq_bytes(state.blue_freq)
+    def submit_mirage_state(self, force: bool = False) -> SubmitResult:
+        return self._write_mirage_bytes(self._mirage_bytes, force)
 
-            self._usb.send_bytes(
-                [0x51, 0x71, 0, 0, 1, 0, 0xFF, 0x4A, 2, rm, ri, rd, 3, gm, gi, gd, 4, bm, bi, bd])
-        else:
-            self._usb.send_bytes(
-                [0x51, 0x71, 0, 0, 1, 0, 0xFF, 0x4A, 2, 0, 0xFF, 0x4A, 3, 0, 0xFF, 0x4A, 4, 0, 0xFF, 0x4A])
+    def _write_mirage_bytes(self, mirage_bytes: bytes, force: bool) -> SubmitResult:
+        if not force and mirage_bytes == self._submitted_mirage_bytes:
+            return SKIPPED
+
+        self._usb.write_packet(mirage_bytes)
+        self._submitted_mirage_bytes = mirage_bytes
+        return SENT
 
 
 class PrismRingComponent(PrismComponent):
-    def __init__(self, usb: WraithUsbInterface, channel: int):
-        try:
-            mode = next((mode for mode in PrismRingMode if mode.channel == channel))
-        except StopIteration:
-            print(f"Received invalid ring channel byte {channel}. Falling back to rainbow mode")
-            mode = PrismRingMode.Rainbow
+    _FIELDS = PrismComponent._FIELDS + ("_direction",)
 
-        super().__init__(usb, mode)
+    def __init__(self, usb: WraithUsbInterface, channel: int | Callable[[], int], lazy: bool = False):
+        # The mode is derived from the channel, so reading it requires the channel that's assigned on the device
+        self._device_channel: Callable[[], int] | None = channel if lazy else None
+        if lazy:
+            mode = _UNLOADED
+        else:
+            try:
+                mode = PrismRingMode.from_channel(channel)
+            except ValueError:
+                print(f"Received invalid ring channel byte {channel}. Falling back to rainbow mode")
+                mode = PrismRingMode.Rainbow
+
+        self._direction: RotationDirection = RotationDirection.Clockwise
+        super().__init__(usb, mode, lazy)
 
-        self._morse_text: str = ""
-        self._saved_morse_text: str = ""
+        self._morse_text: str = _UNLOADED if lazy else ""
+        self._saved_morse_text: str = _UNLOADED if lazy else ""
         self._cached_morse_bytes: Sequence[int] | None = None
+        # What each of the four morse chunks on the device is known to hold, or None if it's unknown
+        self._submitted_morse_chunks: List[bytes | None] = [None] * len(_WRITE_MORSE_HEADERS)
 
-        self._reload_values()
+        if not lazy:
+            self._reload_values()
 
     @property
     def channel(self):
-        return self.mode.channel
+        mode = self._mode
+        if mode is _UNLOADED:
+            return self._device_channel()
+        return mode.channel
+
+    @property
+    def _read_channel(self) -> int:
+        # The mode may have been set before it was loaded, so it doesn't necessarily match the channel on the device
+        if self._device_channel is not None:
+            return self._device_channel()
+        return self.channel
+
+    @property
+    def direction(self) -> RotationDirection:
+        if self._direction is _UNLOADED:
+            self._load_values()
+        return self._direction
+
+    @direction.setter
+    def direction(self, value: RotationDirection):
+        self._direction = value
+
+    def load(self):
+        super().load()
+        if self._morse_text is _UNLOADED:
+            self._reload_morse_values()
 
     def save(self):
         super().save()
@@ -177,85 +431,112 @@ class PrismRingComponent(PrismComponent):
     @property
     def has_unsaved_changes(self) -> bool:
         if not super().has_unsaved_changes:
-            if self.mode == PrismRingMode.Morse:
+            if self.mode == PrismRingMode.Morse and self._morse_text is not _UNLOADED:
+                if self._saved_morse_text is _UNLOADED:
+                    return True
                 return self._morse_text.strip().upper() != self._saved_morse_text.strip().upper()
             else:
                 return False
         return True
 
-    def _reload_values(self):
-        channel_values = self._fetch_channel_values()
-        self.mode: PrismRingMode = next((mode for mode in PrismRingMode if mode.channel == channel_values.channel))
+    def _reload_values(self, channel_values: ChannelValues | None = None, morse_bytes: Iterable[int] | None = None):
+        self._reload_channel_values(channel_values)
+        self._reload_morse_values(morse_bytes)
+        self.save()
+
+    def _reload_channel_values(self, channel_values: ChannelValues | None = None):
+        if channel_values is None:
+            channel_values = self._fetch_channel_values()
+        self.mode: PrismRingMode = PrismRingMode.from_channel(channel_values.channel)
         self.direction = RotationDirection(
             channel_values.color_source & 1) if self.mode.supports_direction else RotationDirection.Clockwise
         self._assign_common_values_from_channel(channel_values)
-        self._cached_morse_bytes = list(self._fetch_morse_bytes())
+        self._submitted_byte_values = channel_values.byte_values
+
+    def _reload_morse_values(self, morse_bytes: Iterable[int] | None = None):
+        if morse_bytes is None:
+            morse_bytes = self._fetch_morse_bytes()
+        self._cached_morse_bytes = list(morse_bytes)
         self._morse_text = bytes_to_morse_or_text(self._cached_morse_bytes)
-        self.save()
+        self._saved_morse_text = self._morse_text
+        # The bytes that were read are what every chunk on the device holds
+        self._submitted_morse_chunks = list(morse_chunks(self._padded_morse_bytes))
 
     def _fetch_morse_bytes(self) -> Iterable[int]:
-        first_chunk = self._usb.send_bytes([0x52, 0x73, 2])
-        second_chunk = self._usb.send_bytes([0x52, 0x73, 3])
+        first_chunk = self._usb.send_packet(_READ_MORSE_CHUNKS[0])
+        second_chunk = self._usb.send_packet(_READ_MORSE_CHUNKS[1])
 
-        return itertools.chain(first_chunk[4:], second_chunk[4:])
+        return first_chunk[4:] + second_chunk[4:]
 
     @property
-    def _byte_values(self) -> Sequence[int]:
-        try:
-            brightness: int = self.mode.brightnesses[self.brightness]
-        except KeyError:
-            brightness: int = 0x99
-
-        try:
-            speed: int = self.mode.speeds[self.speed] if self.mode != PrismRingMode.Morse else 0x6B
-        except KeyError:
-            speed: int = 0x2C
-
-        if self.mode.color_support == ColorSupport.All and self.use_random_color:
-            if self.mode.supports_direction:
-                color_source = 0x80 + self.direction.value()
-            else:
-                color_source = 0
-        elif self.mode.supports_direction:
-            color_source = self.direction.value()
-        else:
-            color_source = self.mode.color_source
-
-        return [self.mode.channel, speed, color_source, self.mode.mode, 0xFF, brightness] + self._color_bytes
+    def _byte_values(self) -> bytes:
+        return _ring_values(self.mode.name, self.speed, self.brightness, self.rgb.value, self.use_random_color,
+                            self.direction)
 
     @property
     def _morse_bytes(self):
         if self._cached_morse_bytes is None:
-            self._cached_morse_bytes = morse_or_text_to_bytes(self._morse_text)
+            self._cached_morse_bytes = morse_or_text_to_bytes(self.morse_text)
         return self._cached_morse_bytes
 
-    def submit_values(self):
-        self.submit_morse_values()
-        super().submit_values()
-
-    def submit_morse_values(self):
-        morse_bytes = self._morse_bytes
-        first_chunk = itertools.chain([0x51, 0x73, 0, 0], morse_bytes[0:60])
-        third_chunk = itertools.chain([0x51, 0x73, 2, 0], morse_bytes[0:60])
-        if len(morse_bytes) >= 60:
-            second_chunk = itertools.chain([0x51, 0x73, 1, 0], morse_bytes[60:120])
-            fourth_chunk = itertools.chain([0x51, 0x73, 3, 0], morse_bytes[60:120])
-        else:
-            second_chunk = [0x51, 0x73, 1, 0]
-            fourth_chunk = [0x51, 0x73, 3, 0]
+    @property
+    def _padded_morse_bytes(self) -> bytes:
+        return padded_morse_bytes(self._morse_bytes)
 
-        self._usb.send_bytes(first_chunk)
-        self._usb.send_bytes(second_chunk)
-        self._usb.send_bytes(third_chunk)
-        self._usb.send_bytes(fourth_chunk)
+    @property
+    def _submitted_morse_bytes(self) -> bytes | None:
+        # The morse data on the device, if every chunk is known and both copies of it match
+        chunks = self._submitted_morse_chunks
+        if None in chunks or chunks[0] != chunks[2] or chunks[1] != chunks[3]:
+            return None
+        return chunks[0] + chunks[1]
+
+    def invalidate_submitted_values(self):
+        super().invalidate_submitted_values()
+        self._submitted_morse_chunks = [None] * len(_WRITE_MORSE_HEADERS)
+
+    def resend_submitted_values(self):
+        for header, chunk_bytes in zip(_WRITE_MORSE_HEADERS, self._submitted_morse_chunks):
+            if chunk_bytes is not None:
+                self._usb.write_packet(header, chunk_bytes)
+        super().resend_submitted_values()
+
+    def _submit_extra_values(self, force: bool) -> SubmitResult:
+        # The morse text is only used in morse mode, so it isn't uploaded for other modes, even when forced
+        if self.mode == PrismRingMode.Morse:
+            return self.submit_morse_values(force)
+        return SubmitResult(skipped=len(_WRITE_MORSE_HEADERS))
+
+    def submit_morse_values(self, force: bool = False) -> SubmitResult:
+        if not force and self._morse_text is _UNLOADED:
+            # The text was never read or set, so the device still holds whatever it had
+            return SubmitResult(skipped=len(_WRITE_MORSE_HEADERS))
+
+        return self._write_morse_chunks(morse_chunks(self._padded_morse_bytes), force)
+
+    def _write_morse_chunks(self, chunks: Sequence[bytes], force: bool) -> SubmitResult:
+        # Only the chunks that don't already hold the same bytes are written
+        submitted_chunks = self._submitted_morse_chunks
+        result = SubmitResult()
+        for chunk, (header, chunk_bytes) in enumerate(zip(_WRITE_MORSE_HEADERS, chunks)):
+            if not force and chunk_bytes == submitted_chunks[chunk]:
+                result += SKIPPED
+                continue
+
+            self._usb.write_packet(header, chunk_bytes)
+            submitted_chunks[chunk] = chunk_bytes
+            result += SENT
+        return result
 
     @property
     def morse_text(self):
+        if self._morse_text is _UNLOADED:
+            self._reload_morse_values()
         return self._morse_text
 
     @morse_text.setter
     def morse_text(self, value: str):
-        self._morse_text = value
+        self._morse_text = validate_morse_text(value)
         self._cached_morse_bytes = None
 
     @property
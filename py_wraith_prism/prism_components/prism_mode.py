@@ -1,6 +1,5 @@
-import logging
 from enum import Enum
-from typing import NamedTuple, Mapping, Self
+from typing import Dict, Iterable, NamedTuple, Mapping, Self
 
 from py_wraith_prism.prism_components.enums import ColorSupport, Brightness, Speed
 
@@ -12,21 +11,30 @@ class _PrismMode:
 
     brightnesses: Mapping[Brightness, int]
     colorSupport: ColorSupport
+
+    The reverse lookups of the speeds and brightnesses are added by _index_values() once the enum is created.
     '''
 
     def find_brightness(self, value, default=None):
         # noinspection PyUnresolvedReferences
-        for (b, bv) in self.brightnesses.items():
-            if bv == value:
-                return b
-        return default
+        return self._brightnesses_by_value.get(value, default)
 
     def find_speed(self, value, default=None):
         # noinspection PyUnresolvedReferences
-        for (s, sv) in self.speeds.items():
-            if sv == value:
-                return s
-        return default
+        return self._speeds_by_value.get(value, default)
+
+
+def _reverse(mapping: Mapping) -> Dict:
+    # The first key wins when several have the same value, as it did when the mappings were scanned
+    return {value: key for key, value in reversed(mapping.items())}
+
+
+def _index_values(modes: Iterable[_PrismMode]):
+    for mode in modes:
+        # noinspection PyUnresolvedReferences
+        mode._speeds_by_value = _reverse(mode.speeds)
+        # noinspection PyUnresolvedReferences
+        mode._brightnesses_by_value = _reverse(mode.brightnesses)
 
 
 def map_brightness(low, medium, high):
@@ -63,12 +71,20 @@ class BasicPrismMode(_BasicPrismMode, _PrismMode, Enum):
     @classmethod
     def from_mode(cls, mode: int) -> Self:
         try:
-            return next((m for m in cls if m.mode == mode))
-        except StopIteration:
+            return _BASIC_MODES_BY_MODE[mode]
+        except KeyError:
+            # Only imported on this error path, so that it isn't part of every cold start
+            import logging
             logging.getLogger(cls.__name__).error(f"Failed to find basic prism mode {mode}")
             return BasicPrismMode.Off
 
 
+# The members contain dicts, so they can't be dict keys themselves, but they can be looked up by their values. The
+# first member wins when several have the same value.
+_index_values(BasicPrismMode)
+_BASIC_MODES_BY_MODE: Dict[int, BasicPrismMode] = {mode.mode: mode for mode in reversed(BasicPrismMode)}
+
+
 class _PrismRingMode(NamedTuple):
     channel: int
     mode: int
@@ -102,4 +118,19 @@ class PrismRingMode(_PrismRingMode, _PrismMode, Enum):
 
     @classmethod
     def from_mode(cls, mode: int):
-        return next((m for m in cls if m.mode == mode))
+        try:
+            return _RING_MODES_BY_MODE[mode]
+        except KeyError:
+            raise ValueError(f"Invalid ring mode {mode}") from None
+
+    @classmethod
+    def from_channel(cls, channel: int):
+        try:
+            return _RING_MODES_BY_CHANNEL[channel]
+        except KeyError:
+            raise ValueError(f"Invalid ring channel {channel}") from None
+
+
+_index_values(PrismRingMode)
+_RING_MODES_BY_MODE: Dict[int, PrismRingMode] = {mode.mode: mode for mode in reversed(PrismRingMode)}
+_RING_MODES_BY_CHANNEL: Dict[int, PrismRingMode] = {mode.channel: mode for mode in reversed(PrismRingMode)}
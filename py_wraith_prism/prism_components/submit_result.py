@@ -0,0 +1,17 @@
+from typing import NamedTuple
+
+
+class SubmitResult(NamedTuple):
+    '''
+    Number of HID transactions that were sent to the device, and the number that were skipped because the device
+    already held the same bytes.
+    '''
+    sent: int = 0
+    skipped: int = 0
+
+    def __add__(self, other: 'SubmitResult') -> 'SubmitResult':
+        return SubmitResult(self.sent + other.sent, self.skipped + other.skipped)
+
+
+SENT = SubmitResult(sent=1)
+SKIPPED = SubmitResult(skipped=1)
@@ -0,0 +1,312 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Callable, Dict, List, Sequence, Tuple, Type
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.transition import interpolate
+from py_wraith_prism.wraith_prism import WraithPrism
+
+HWMON_DIRECTORY = "/sys/class/hwmon"
+PROC_STAT = "/proc/stat"
+
+# The hwmon drivers of CPU temperature sensors, in the order they're preferred, and the input that holds the package
+# (or control) temperature
+CPU_TEMPERATURE_SENSORS = (("k10temp", "temp1_input"), ("zenpower", "temp1_input"), ("coretemp", "temp1_input"),
+                           ("cpu_thermal", "temp1_input"), ("acpitz", "temp1_input"))
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_LEVELS = 32
+
+# A sampler returns the current value of a metric, or None if it couldn't be read
+Sampler = Callable[[], float | None]
+
+
+class SysfsSampler:
+    '''
+    Reads a number from a sysfs (or procfs) attribute, times scale. The file is kept open and read with a single
+    pread(), rather than being opened on every sample.
+    '''
+
+    def __init__(self, path: str, scale: float = 1.0):
+        self.path = path
+        self._scale = scale
+        self._fd = os.open(path, os.O_RDONLY)
+
+    def __call__(self) -> float | None:
+        try:
+            return int(os.pread(self._fd, 32, 0)) * self._scale
+        except (OSError, ValueError):
+            return None
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def find_cpu_temperature_input(directory: str = HWMON_DIRECTORY) -> str | None:
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return None
+
+    drivers = {}
+    for name in names:
+        try:
+            with open(os.path.join(directory, name, "name")) as f:
+                drivers.setdefault(f.read().strip(), os.path.join(directory, name))
+        except OSError:
+            continue
+
+    for driver, sensor_input in CPU_TEMPERATURE_SENSORS:
+        if driver in drivers:
+            path = os.path.join(drivers[driver], sensor_input)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+class CpuTemperatureSampler(SysfsSampler):
+    # The CPU temperature in degrees Celsius, from the first hwmon sensor in CPU_TEMPERATURE_SENSORS that's present
+    def __init__(self, directory: str = HWMON_DIRECTORY):
+        path = find_cpu_temperature_input(directory)
+        if path is None:
+            raise IOError(f"Failed to find a CPU temperature sensor in {directory}")
+        super().__init__(path, scale=0.001)
+
+
+class CpuLoadSampler:
+    '''
+    The share of time the CPUs were busy since the previous sample, in percent, from the first line of /proc/stat. The
+    first sample is since boot.
+    '''
+
+    def __init__(self, path: str = PROC_STAT):
+        self._fd = os.open(path, os.O_RDONLY)
+        self._busy = 0
+        self._total = 0
+
+    def __call__(self) -> float | None:
+        try:
+            line = os.pread(self._fd, 256, 0).split(b"\n", 1)[0]
+            # user, nice, system, idle, iowait, irq, softirq, steal (guest time is already included in user)
+            times = [int(value) for value in line.split()[1:9]]
+        except (OSError, ValueError):
+            return None
+
+        total = sum(times)
+        busy = total - times[3] - times[4]
+        busy_delta, total_delta = busy - self._busy, total - self._total
+        self._busy, self._total = busy, total
+        if total_delta <= 0:
+            return None
+        return busy_delta / total_delta * 100
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class Gradient:
+    '''
+    Maps values onto colours, through colour stops of (value, colour), e.g. [(40, "#00ff00"), (90, "#ff0000")] for a
+    temperature. Values outside the stops get the colour of the nearest one.
+
+    The range between the first and last stop is quantised into levels colours, which are interpolated up front in the
+    given colour space, so small changes in the value don't change the colour.
+    '''
+
+    def __init__(self, stops: Sequence[Tuple[float, RGB | str | Tuple[int, int, int] | int]],
+                 levels: int = DEFAULT_LEVELS, space: str = "oklab"):
+        if len(stops) < 2:
+            raise ValueError("A gradient needs at least two stops")
+        if levels < 2:
+            raise ValueError("A gradient needs at least two levels")
+        # Colours can't be ordered, so stops with the same value keep the order they were given in
+        stops = sorted(((float(value), RGB.coerce(color)) for value, color in stops), key=lambda stop: stop[0])
+        self.low, self.high = stops[0][0], stops[-1][0]
+        if self.high <= self.low:
+            raise ValueError("The stops of a gradient need different values")
+        self.levels = levels
+
+        self.colors: List[RGB] = []
+        for level in range(levels):
+            value = self.low + (self.high - self.low) * level / (levels - 1)
+            # The stops that the value falls between
+            for (start, start_color), (end, end_color) in zip(stops, stops[1:]):
+                if value <= end:
+                    break
+            weight = (value - start) / (end - start) if end > start else 1.0
+            self.colors.append(interpolate(start_color, end_color, [weight], space)[0])
+
+    def position(self, value: float) -> float:
+        # Where the value falls, from 0 (the first level) to levels - 1 (the last)
+        position = (value - self.low) / (self.high - self.low) * (self.levels - 1)
+        return min(max(position, 0.0), self.levels - 1.0)
+
+    def level(self, value: float) -> int:
+        return round(self.position(value))
+
+    def color(self, value: float) -> RGB:
+        return self.colors[self.level(value)]
+
+
+@dataclass
+class Binding:
+    '''
+    Shows the value of a sampler on a component through a gradient. The colour only changes once the value has moved
+    more than hysteresis (in the value's units) past the edge of the current level, so a value that hovers around an
+    edge doesn't make it flicker.
+    '''
+    sampler: Sampler
+    gradient: Gradient
+    hysteresis: float = 0.0
+
+    def next_level(self, value: float, level: int | None) -> int:
+        position = self.gradient.position(value)
+        if level is None:
+            return round(position)
+        margin = self.hysteresis / (self.gradient.high - self.gradient.low) * (self.gradient.levels - 1)
+        if abs(position - level) > 0.5 + margin:
+            return round(position)
+        return level
+
+
+@dataclass
+class ReactiveStats:
+    # The CPU time is that of the sampling thread, so cpu_fraction is the share of a core that it used
+    ticks: int = 0
+    samples: int = 0
+    failed_samples: int = 0
+    updates: int = 0
+    cpu_seconds: float = 0.0
+    elapsed: float = 0.0
+
+    @property
+    def cpu_fraction(self) -> float:
+        return self.cpu_seconds / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {"ticks": self.ticks, "samples": self.samples, "failed_samples": self.failed_samples,
+                "updates": self.updates, "cpu_seconds": self.cpu_seconds, "elapsed": self.elapsed,
+                "cpu_fraction": self.cpu_fraction}
+
+
+class ReactiveLighting:
+    '''
+    Samples metrics every interval seconds on a background thread, and shows them on the components they're bound to,
+    in their static modes, e.g.
+
+        ReactiveLighting(prism, {"ring": Binding(CpuTemperatureSampler(), Gradient([(40, "green"), (90, "red")]),
+                                                 hysteresis=2.0)})
+
+    Components are only submitted when their colour changes, and nothing is written otherwise. A sampler that's bound
+    to more than one component is sampled once per tick. stats reports how much CPU time the sampling took.
+
+    It owns the device while it's running, like a FrameStreamer.
+    '''
+
+    def __init__(self, prism: WraithPrism, bindings: Dict[str, Binding], interval: float = DEFAULT_INTERVAL):
+        for name in bindings:
+            if name not in ("logo", "fan", "ring"):
+                raise ValueError(f"Unknown component {name!r}")
+        self._prism = prism
+        self._bindings = bindings
+        self._interval = interval
+        self._levels: Dict[str, int | None] = {name: None for name in bindings}
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.stats = ReactiveStats()
+
+    def tick(self) -> bool:
+        # Samples every binding once, and returns whether any component was submitted
+        stats = self.stats
+        stats.ticks += 1
+        values = {}
+        changed = []
+        levels = {}
+        for name, binding in self._bindings.items():
+            sampler = binding.sampler
+            if id(sampler) not in values:
+                values[id(sampler)] = sampler()
+                stats.samples += 1
+                stats.failed_samples += values[id(sampler)] is None
+            value = values[id(sampler)]
+            if value is None:
+                continue
+
+            level = binding.next_level(value, self._levels[name])
+            if level == self._levels[name]:
+                continue
+            levels[name] = level
+
+            component = getattr(self._prism, name)
+            component.mode = PrismRingMode.Static if name == "ring" else BasicPrismMode.Static
+            component.rgb = binding.gradient.colors[level]
+            changed.append(component)
+
+        if not changed:
+            return False
+        self._prism.submit_components(*changed)
+        # Only levels that were written count as shown, so a failed submit is retried by the next tick
+        self._levels.update(levels)
+        stats.updates += 1
+        return True
+
+    def run(self, duration: float | None = None):
+        self._stop_event.clear()
+        self._run(duration)
+
+    def _run(self, duration: float | None):
+        start = time.perf_counter()
+        next_tick = start
+        try:
+            while not self._stop_event.is_set():
+                cpu_start = time.thread_time()
+                try:
+                    self.tick()
+                except Exception:
+                    logging.getLogger(__name__).exception("Failed to update the reactive lighting")
+                self.stats.cpu_seconds += time.thread_time() - cpu_start
+
+                # Ticks stay on a fixed schedule, and any that were missed are skipped
+                now = time.perf_counter()
+                next_tick += self._interval * max(1, int((now - next_tick) / self._interval) + 1)
+                if duration is not None and next_tick - start >= duration:
+                    break
+                self._stop_event.wait(next_tick - now)
+        finally:
+            self.stats.elapsed += time.perf_counter() - start
+
+    def start(self, duration: float | None = None):
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("The reactive lighting is already running.")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="wraith-prism-reactive",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def __enter__(self) -> 'ReactiveLighting':
+        self.start()
+        return self
+
+    def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                 __traceback: TracebackType or None) -> bool or None:
+        self.stop()
+        return None
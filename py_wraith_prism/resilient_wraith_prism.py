@@ -0,0 +1,226 @@
+import time
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Callable, Iterator, Type, TypeVar
+
+from hid import device as hid_device
+
+from py_wraith_prism.prism_components.prism_components import PrismLogoComponent, PrismFanComponent, \
+    PrismRingComponent, PrismComponent
+from py_wraith_prism.scene import Scene
+from py_wraith_prism.usb.wraith_usb_interface import WraithProtocolError
+from py_wraith_prism.wraith_prism import WraithPrism, Batch
+
+T = TypeVar("T")
+
+
+def is_transport_error(error: BaseException) -> bool:
+    # A protocol error means the device answered, just not as expected, so reconnecting wouldn't help
+    return isinstance(error, OSError) and not isinstance(error, WraithProtocolError)
+
+
+class ReconnectError(IOError):
+    pass
+
+
+@dataclass(frozen=True)
+class ReconnectPolicy:
+    '''
+    Reopening the device is attempted up to max_attempts times, waiting initial_backoff seconds before the first
+    attempt, and twice as long before each one after that, up to max_backoff seconds.
+    '''
+    max_attempts: int = 8
+    initial_backoff: float = 0.1
+    max_backoff: float = 5.0
+
+    def backoffs(self) -> Iterator[float]:
+        backoff = self.initial_backoff
+        for _ in range(self.max_attempts):
+            yield backoff
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+@dataclass
+class ReconnectStats:
+    # Recovery time runs from the failed operation until the device was reconnected, including the backoff
+    transport_errors: int = 0
+    reconnects: int = 0
+    failed_reconnects: int = 0
+    failed_attempts: int = 0
+    last_recovery_seconds: float = 0.0
+    max_recovery_seconds: float = 0.0
+    total_recovery_seconds: float = 0.0
+    last_error: str | None = None
+
+    @property
+    def mean_recovery_seconds(self) -> float:
+        return self.total_recovery_seconds / self.reconnects if self.reconnects else 0.0
+
+    def to_dict(self) -> dict:
+        return {"transport_errors": self.transport_errors, "reconnects": self.reconnects,
+                "failed_reconnects": self.failed_reconnects, "failed_attempts": self.failed_attempts,
+                "last_recovery_seconds": self.last_recovery_seconds, "max_recovery_seconds": self.max_recovery_seconds,
+                "mean_recovery_seconds": self.mean_recovery_seconds, "last_error": self.last_error}
+
+
+class ResilientWraithPrism(AbstractContextManager):
+    '''
+    Wraps a WraithPrism, and survives the device dropping off the bus (a USB reset, suspend and resume, a KVM switch).
+    When an operation fails with a transport error, the device is reopened with reopen, retrying with exponential
+    backoff as set by the policy, the state that was last submitted is written back to it in a single burst (see
+    WraithPrism.reconnect()), and the operation is retried once. If the device can't be reopened, ReconnectError is
+    raised, and the next operation tries again.
+
+    stats counts the transport errors and reconnects, and how long recovering took. on_reconnect is called with it
+    after every successful reconnect, e.g. to export it.
+
+    Use WraithDeviceManager.create_resilient_device() to create one.
+    '''
+
+    def __init__(self, prism: WraithPrism, reopen: Callable[[], hid_device],
+                 policy: ReconnectPolicy = ReconnectPolicy(),
+                 on_reconnect: Callable[[ReconnectStats], None] | None = None):
+        self._prism = prism
+        self._reopen = reopen
+        self._policy = policy
+        self._on_reconnect = on_reconnect
+        self.stats = ReconnectStats()
+
+    def _run(self, operation: Callable[[], T]) -> T:
+        try:
+            return operation()
+        except OSError as e:
+            if not is_transport_error(e):
+                raise
+            self._recover(e)
+        return operation()
+
+    def _recover(self, error: BaseException):
+        stats = self.stats
+        stats.transport_errors += 1
+        stats.last_error = repr(error)
+        start = time.perf_counter()
+
+        for backoff in self._policy.backoffs():
+            time.sleep(backoff)
+            try:
+                device = self._reopen()
+            except OSError as e:
+                stats.failed_attempts += 1
+                stats.last_error = repr(e)
+                continue
+
+            try:
+                self._prism.reconnect(device)
+            except OSError as e:
+                if not is_transport_error(e):
+                    raise
+                # The device dropped off again while the state was being written back
+                stats.failed_attempts += 1
+                stats.last_error = repr(e)
+                continue
+
+            seconds = time.perf_counter() - start
+            stats.reconnects += 1
+            stats.last_recovery_seconds = seconds
+            stats.max_recovery_seconds = max(stats.max_recovery_seconds, seconds)
+            stats.total_recovery_seconds += seconds
+            if self._on_reconnect is not None:
+                self._on_reconnect(stats)
+            return
+
+        stats.failed_reconnects += 1
+        raise ReconnectError(f"Failed to reconnect to the device after {self._policy.max_attempts} attempts "
+                             f"({stats.last_error})") from error
+
+    @property
+    def prism(self) -> WraithPrism:
+        return self._prism
+
+    @property
+    def logo(self) -> PrismLogoComponent:
+        return self._prism.logo
+
+    @property
+    def fan(self) -> PrismFanComponent:
+        return self._prism.fan
+
+    @property
+    def ring(self) -> PrismRingComponent:
+        return self._prism.ring
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return self._prism.has_unsaved_changes
+
+    def load(self):
+        self._run(self._prism.load)
+
+    def submit_component(self, component: PrismComponent, force: bool = False) -> int:
+        return self._run(lambda: self._prism.submit_component(component, force))
+
+    def submit_components(self, *argv, force: bool = False) -> int:
+        return self._run(lambda: self._prism.submit_components(*argv, force=force))
+
+    def submit_all_components(self, force: bool = False) -> int:
+        return self._run(lambda: self._prism.submit_all_components(force))
+
+    def apply_scene(self, scene: Scene, force: bool = False) -> int:
+        return self._run(lambda: self._prism.apply_scene(scene, force))
+
+    @contextmanager
+    def batch(self) -> Iterator[Batch]:
+        # Only sending the batch is retried, not the block, whose errors propagate as usual
+        completed = False
+        batch = None
+        try:
+            with self._prism.batch() as batch:
+                yield batch
+                completed = True
+        except OSError as e:
+            if not completed or not is_transport_error(e):
+                raise
+            self._recover(e)
+            # Whatever was sent before the error is skipped, since it was written back by the reconnect
+            self._run(lambda: self._prism.send_batch(batch))
+
+    def save(self, force: bool = False):
+        self._run(lambda: self._prism.save(force))
+
+    def flush_save(self):
+        self._run(self._prism.flush_save)
+
+    def apply(self):
+        self._run(self._prism.apply)
+
+    def flush(self):
+        self._run(self._prism.flush)
+
+    @property
+    def enso(self) -> bool:
+        return self._run(lambda: self._prism.enso)
+
+    @enso.setter
+    def enso(self, value: bool):
+        self._run(lambda: setattr(self._prism, "enso", value))
+
+    def request_firmware_version(self) -> str:
+        return self._run(self._prism.request_firmware_version)
+
+    def reset_to_default(self):
+        self._run(self._prism.reset_to_default)
+
+    def power_on(self):
+        self._run(self._prism.power_on)
+
+    def power_off(self):
+        self._run(self._prism.power_off)
+
+    def close(self):
+        self._prism.close()
+
+    def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                 __traceback: TracebackType or None) -> bool or None:
+        self.close()
+        return None
@@ -0,0 +1,117 @@
+from typing import Any, Tuple
+
+
+class RGB:
+    '''
+    An immutable 24-bit colour, packed into a single int (0xRRGGBB). This is how components hold their colour, since
+    it's exactly what's sent to the device and is much cheaper to compare and convert to bytes than a colour.Color.
+
+    coerce() accepts an RGB, a colour.Color, a hex string ("#ff0000" or "#f00"), a colour name, an (r, g, b) tuple of
+    0-255 values or a 0xRRGGBB int. A Color is converted the same way it always has been, by truncating each 0-1
+    channel times 255.
+    '''
+    __slots__ = ("value",)
+
+    def __init__(self, red: int, green: int, blue: int):
+        if not (0 <= red <= 0xFF and 0 <= green <= 0xFF and 0 <= blue <= 0xFF):
+            raise ValueError(f"Invalid RGB value ({red}, {green}, {blue})")
+        object.__setattr__(self, "value", (red << 16) | (green << 8) | blue)
+
+    @classmethod
+    def from_int(cls, value: int) -> 'RGB':
+        if not 0 <= value <= 0xFFFFFF:
+            raise ValueError(f"Invalid RGB value {value:#x}")
+        rgb = cls.__new__(cls)
+        object.__setattr__(rgb, "value", value)
+        return rgb
+
+    @classmethod
+    def from_hex(cls, text: str) -> 'RGB':
+        digits = text[1:] if text.startswith("#") else text
+        if len(digits) == 3:
+            digits = "".join(digit * 2 for digit in digits)
+        if len(digits) != 6:
+            raise ValueError(f"Invalid hex colour {text!r}")
+        try:
+            return cls.from_int(int(digits, 16))
+        except ValueError:
+            raise ValueError(f"Invalid hex colour {text!r}") from None
+
+    @classmethod
+    def coerce(cls, value: Any) -> 'RGB':
+        if isinstance(value, RGB):
+            return value
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid colour {value!r}")
+        if isinstance(value, int):
+            return cls.from_int(value)
+        if isinstance(value, str):
+            if value.startswith("#"):
+                return cls.from_hex(value)
+            return cls._from_name(value)
+        if isinstance(value, (tuple, list)):
+            if len(value) != 3:
+                raise ValueError(f"Invalid colour {value!r}")
+            return cls(*(int(channel) for channel in value))
+        if hasattr(value, "red") and hasattr(value, "green") and hasattr(value, "blue"):
+            # A colour.Color
+            return cls(int(value.red * 255), int(value.green * 255), int(value.blue * 255))
+        raise ValueError(f"Invalid colour {value!r}")
+
+    @classmethod
+    def _from_name(cls, name: str) -> 'RGB':
+        # colour is only needed for its colour names
+        from colour import Color
+        try:
+            color = Color(name)
+        except (ValueError, AttributeError):
+            raise ValueError(f"Invalid colour {name!r}") from None
+        return cls.coerce(color)
+
+    @property
+    def red(self) -> int:
+        return self.value >> 16
+
+    @property
+    def green(self) -> int:
+        return (self.value >> 8) & 0xFF
+
+    @property
+    def blue(self) -> int:
+        return self.value & 0xFF
+
+    @property
+    def bytes(self) -> Tuple[int, int, int]:
+        value = self.value
+        return value >> 16, (value >> 8) & 0xFF, value & 0xFF
+
+    @property
+    def hex_l(self) -> str:
+        return f"#{self.value:06x}"
+
+    def to_color(self):
+        from colour import Color
+        return Color(rgb=(self.red / 255, self.green / 255, self.blue / 255))
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError("RGB is immutable")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, RGB):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __repr__(self) -> str:
+        return f"RGB({self.red}, {self.green}, {self.blue})"
+
+    def __str__(self) -> str:
+        return self.hex_l
+
+    def __reduce__(self):
+        return RGB.from_int, (self.value,)
+
+
+BLACK = RGB(0, 0, 0)
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SavePolicy:
+    '''
+    How WraithPrism.save() commits to the device's flash, which is slower than other writes and wears it.
+
+    With skip_unchanged, a save is skipped when nothing was written to the device since the last one. With a debounce
+    window (in seconds), the first save starts a timer, every save until it fires is part of the same commit, and the
+    commit is made on a background thread once it does. Pending commits are made by flush_save() and on close.
+    '''
+    skip_unchanged: bool = True
+    debounce: float = 0.0
+
+
+@dataclass
+class SaveStats:
+    requested: int = 0
+    committed: int = 0
+    skipped_unchanged: int = 0
+    coalesced: int = 0
+
+    @property
+    def avoided(self) -> int:
+        # The commits that were saved by the policy
+        return self.skipped_unchanged + self.coalesced
+
+    def to_dict(self) -> dict:
+        return {"requested": self.requested, "committed": self.committed, "skipped_unchanged": self.skipped_unchanged,
+                "coalesced": self.coalesced, "avoided": self.avoided}
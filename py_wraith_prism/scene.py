@@ -0,0 +1,172 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Tuple
+
+from py_wraith_prism.component_state import ComponentState, COMPONENT_FIELDS, decode_value, normalize_state
+from py_wraith_prism.device_snapshot import COMPONENT_NAMES
+from py_wraith_prism.morse import morse_or_text_to_bytes
+from py_wraith_prism.prism_components.components import DEFAULT_LOGO_CHANNEL, DEFAULT_FAN_CHANNEL, \
+    channel_assignment
+from py_wraith_prism.prism_components.prism_components import _basic_values, _ring_values, _WRITE_VALUES_HEADER, \
+    _WRITE_VALUES_TRAILER, _WRITE_MORSE_HEADERS, mirage_bytes, padded_morse_bytes, morse_chunks
+from py_wraith_prism.prism_components.prism_mode import PrismRingMode
+
+# The settings that a scene doesn't give. Like the command line, colours are white, and a component that isn't in the
+# scene at all is turned off.
+_DEFAULTS: Dict[str, ComponentState] = {
+    "logo": {"mode": "Off", "color": "#ffffff", "speed": "Medium", "brightness": "High", "use_random_color": False},
+    "fan": {"mode": "Off", "color": "#ffffff", "speed": "Medium", "brightness": "High", "use_random_color": False,
+            "mirage_state": None},
+    "ring": {"mode": "Off", "color": "#ffffff", "speed": "Medium", "brightness": "High", "use_random_color": False,
+             "direction": "Clockwise", "morse_text": ""},
+}
+
+
+@dataclass(frozen=True)
+class CompiledScene:
+    '''
+    The packets that set a scene, for the given logo and fan channels: the channel values of each component, the fan's
+    mirage packet, the ring's morse chunks, and the channel assignment. attributes holds the settings of each component
+    as the values of its attributes, e.g. PrismRingMode.Morse rather than "Morse".
+    '''
+    name: str
+    logo_channel: int
+    fan_channel: int
+    attributes: Dict[str, Tuple[Tuple[str, Any], ...]]
+    logo_values: bytes
+    fan_values: bytes
+    mirage_bytes: bytes
+    ring_values: bytes
+    morse_bytes: bytes
+    morse_chunks: Tuple[bytes, ...]
+    channel_assignment: Tuple[int, ...]
+    enso: bool | None
+
+    @property
+    def sends_morse(self) -> bool:
+        # The morse text is only uploaded in morse mode, like a submit does
+        return dict(self.attributes["ring"])["mode"] == PrismRingMode.Morse
+
+    def packets(self) -> List[bytes]:
+        '''
+        Every packet that sets the scene on a device whose state is unknown, in order, as they're passed to
+        WraithUsbInterface.write_packet() (before they're padded to the report size). Applying the scene to a device
+        whose state is known only sends the ones that differ.
+        '''
+        # Imported here, since wraith_prism imports this module
+        from py_wraith_prism.wraith_prism import _ENSO_ON, _ENSO_OFF, _APPLY
+
+        packets = []
+        if self.enso is not None:
+            packets.append(_ENSO_ON if self.enso else _ENSO_OFF)
+        packets.append(_WRITE_VALUES_HEADER + self.logo_values + _WRITE_VALUES_TRAILER)
+        packets.append(self.mirage_bytes)
+        packets.append(_WRITE_VALUES_HEADER + self.fan_values + _WRITE_VALUES_TRAILER)
+        if self.sends_morse:
+            packets.extend(header + chunk for header, chunk in zip(_WRITE_MORSE_HEADERS, self.morse_chunks))
+        packets.append(_WRITE_VALUES_HEADER + self.ring_values + _WRITE_VALUES_TRAILER)
+        packets.append(bytes(self.channel_assignment))
+        packets.append(_APPLY)
+        return packets
+
+
+@dataclass
+class Scene:
+    '''
+    A named lighting configuration: the settings of the logo, fan and ring, in the form that component_state() returns,
+    and optionally whether enso is on. Settings that aren't given are set to their defaults, so a scene always
+    describes the full state of the device.
+
+    Scenes are compiled into their packets without a device, and the compiled scene is cached, so applying one with
+    WraithPrism.apply_scene() doesn't encode anything.
+    '''
+    name: str
+    components: Dict[str, ComponentState]
+    enso: bool | None = None
+    _compiled: Dict[Tuple[int, int], CompiledScene] = field(default_factory=dict, init=False, repr=False,
+                                                            compare=False)
+
+    @classmethod
+    def from_dict(cls, name: str, data: Mapping[str, Any]) -> 'Scene':
+        # e.g. {"logo": {"mode": "Static", "color": "#ff0000"}, "ring": {"mode": "Rainbow"}, "enso": False}
+        unknown = set(data) - set(COMPONENT_NAMES) - {"enso"}
+        if unknown:
+            raise ValueError(f"Unknown settings in scene {name!r}: {', '.join(sorted(unknown))}")
+
+        components = {}
+        for component in COMPONENT_NAMES:
+            state = dict(_DEFAULTS[component])
+            state.update(data.get(component) or {})
+            components[component] = normalize_state(component, state)
+        enso = data.get("enso")
+        return cls(name, components, None if enso is None else bool(enso))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {name: dict(state) for name, state in self.components.items()}
+        if self.enso is not None:
+            data["enso"] = self.enso
+        return data
+
+    def compile(self, logo_channel: int = DEFAULT_LOGO_CHANNEL,
+                fan_channel: int = DEFAULT_FAN_CHANNEL) -> CompiledScene:
+        # The channels of the logo and fan are part of their values, so a scene is compiled once for each pair
+        key = (logo_channel, fan_channel)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._compiled[key] = _compile(self, logo_channel, fan_channel)
+        return compiled
+
+
+def _compile(scene: Scene, logo_channel: int, fan_channel: int) -> CompiledScene:
+    attributes = {name: {field_name: decode_value(name, field_name, state[field_name])
+                         for field_name in COMPONENT_FIELDS[name]}
+                  for name, state in scene.components.items()}
+    logo, fan, ring = (attributes[name] for name in COMPONENT_NAMES)
+
+    morse_bytes = bytes(morse_or_text_to_bytes(ring["morse_text"]))
+    return CompiledScene(
+        name=scene.name,
+        logo_channel=logo_channel,
+        fan_channel=fan_channel,
+        attributes={name: tuple(values.items()) for name, values in attributes.items()},
+        logo_values=_basic_values(logo_channel, logo["mode"].name, logo["speed"], logo["brightness"],
+                                  logo["color"].value, logo["use_random_color"]),
+        fan_values=_basic_values(fan_channel, fan["mode"].name, fan["speed"], fan["brightness"], fan["color"].value,
+                                 fan["use_random_color"]),
+        mirage_bytes=mirage_bytes(fan["mirage_state"]),
+        ring_values=_ring_values(ring["mode"].name, ring["speed"], ring["brightness"], ring["color"].value,
+                                 ring["use_random_color"], ring["direction"]),
+        morse_bytes=morse_bytes,
+        morse_chunks=morse_chunks(padded_morse_bytes(morse_bytes)),
+        channel_assignment=tuple(channel_assignment(logo_channel, fan_channel, ring["mode"].channel)),
+        enso=scene.enso,
+    )
+
+
+def load_scenes(path: str) -> Dict[str, Scene]:
+    '''
+    Loads the scenes in a JSON or TOML file (by its extension), which maps each scene's name to its settings, e.g.
+
+        [work.logo]
+        mode = "Static"
+        color = "#ffffff"
+
+        [work.ring]
+        mode = "Morse"
+        morse_text = "focus"
+    '''
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if path.lower().endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("Reading TOML scenes requires Python 3.11 or later") from None
+        scenes = tomllib.loads(data.decode())
+    else:
+        scenes = json.loads(data)
+
+    if not isinstance(scenes, dict):
+        raise ValueError(f"{path} doesn't hold a table of scenes")
+    return {name: Scene.from_dict(name, scene) for name, scene in scenes.items()}
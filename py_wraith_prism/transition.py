@@ -0,0 +1,175 @@
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from py_wraith_prism.frame_streamer import Frame, FrameColor, FrameStats, FrameStreamer
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.wraith_prism import WraithPrism
+
+Easing = Callable[[float], float]
+
+EASINGS: Dict[str, Easing] = {
+    "linear": lambda t: t,
+    "ease-in": lambda t: t * t * t,
+    "ease-out": lambda t: 1 - (1 - t) ** 3,
+    "ease-in-out": lambda t: 4 * t * t * t if t < 0.5 else 1 - (2 - 2 * t) ** 3 / 2,
+}
+
+# srgb interpolates the values that are sent to the device, linear interpolates the light they stand for, and oklab
+# interpolates the perceived colour, so that a fade doesn't dip in brightness or pass through muddy hues
+COLOR_SPACES = ("srgb", "linear", "oklab")
+
+# The resolution of the interpolation table. Steps that round to the same colour cost nothing, since only the packets
+# that changed are sent.
+DEFAULT_STEPS_PER_SECOND = 250
+
+Triple = Tuple[float, float, float]
+
+_SRGB_TO_LINEAR = tuple(value / 255 / 12.92 if value / 255 <= 0.04045 else ((value / 255 + 0.055) / 1.055) ** 2.4
+                        for value in range(256))
+
+
+def _linear_to_srgb(value: float) -> int:
+    value = min(max(value, 0.0), 1.0)
+    encoded = value * 12.92 if value <= 0.0031308 else 1.055 * value ** (1 / 2.4) - 0.055
+    return round(encoded * 255)
+
+
+def _to_linear(color: RGB) -> Triple:
+    return _SRGB_TO_LINEAR[color.red], _SRGB_TO_LINEAR[color.green], _SRGB_TO_LINEAR[color.blue]
+
+
+def _from_linear(red: float, green: float, blue: float) -> RGB:
+    return RGB(_linear_to_srgb(red), _linear_to_srgb(green), _linear_to_srgb(blue))
+
+
+def _to_oklab(color: RGB) -> Triple:
+    red, green, blue = _to_linear(color)
+    long = (0.4122214708 * red + 0.5363325363 * green + 0.0514459929 * blue) ** (1 / 3)
+    medium = (0.2119034982 * red + 0.6806995451 * green + 0.1073969566 * blue) ** (1 / 3)
+    short = (0.0883024619 * red + 0.2817188376 * green + 0.6299787005 * blue) ** (1 / 3)
+    return (0.2104542553 * long + 0.7936177850 * medium - 0.0040720468 * short,
+            1.9779984951 * long - 2.4285922050 * medium + 0.4505937099 * short,
+            0.0259040371 * long + 0.7827717662 * medium - 0.8086757660 * short)
+
+
+def _from_oklab(lightness: float, a: float, b: float) -> RGB:
+    long = (lightness + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    medium = (lightness - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    short = (lightness - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return _from_linear(4.0767416621 * long - 3.3077115913 * medium + 0.2309699292 * short,
+                        -1.2684380046 * long + 2.6097574011 * medium - 0.3413193965 * short,
+                        -0.0041960863 * long - 0.7034186147 * medium + 1.7076147010 * short)
+
+
+def _to_srgb(color: RGB) -> Triple:
+    return color.red, color.green, color.blue
+
+
+def _from_srgb(red: float, green: float, blue: float) -> RGB:
+    return RGB(round(red), round(green), round(blue))
+
+
+_CONVERSIONS: Dict[str, Tuple[Callable[[RGB], Triple], Callable[[float, float, float], RGB]]] = {
+    "srgb": (_to_srgb, _from_srgb),
+    "linear": (_to_linear, _from_linear),
+    "oklab": (_to_oklab, _from_oklab),
+}
+
+
+def interpolate(start: RGB, end: RGB, weights: Sequence[float], space: str = "oklab") -> List[RGB]:
+    # The colour at each weight, from 0 (start) to 1 (end). The ends are exact, rather than converted back and forth.
+    try:
+        to_space, from_space = _CONVERSIONS[space]
+    except KeyError:
+        raise ValueError(f"Invalid colour space {space!r}, expected one of {', '.join(COLOR_SPACES)}") from None
+
+    (x0, y0, z0), (x1, y1, z1) = to_space(start), to_space(end)
+    dx, dy, dz = x1 - x0, y1 - y0, z1 - z0
+    return [start if weight <= 0 else end if weight >= 1 else
+            from_space(x0 + dx * weight, y0 + dy * weight, z0 + dz * weight) for weight in weights]
+
+
+class Transition:
+    '''
+    A fade of the logo, fan and ring from their current colours to new ones, in their static modes. The whole
+    interpolation table is computed up front, and then streamed with a FrameStreamer at up to steps_per_second frames
+    per second, as fast as the device accepts them, with each frame picked by the time that has passed. The last frame
+    is always the target colours.
+
+    Use WraithPrism.fade(), which cancels the transition that's running first, rather than creating one directly. A
+    cancelled transition stops where it got to.
+    '''
+
+    def __init__(self, prism: WraithPrism, duration: float, easing: str | Easing = "ease-in-out",
+                 space: str = "oklab", steps_per_second: float = DEFAULT_STEPS_PER_SECOND, logo: FrameColor = None,
+                 fan: FrameColor = None, ring: FrameColor = None):
+        if duration < 0:
+            raise ValueError("The duration can't be negative")
+        if not callable(easing):
+            try:
+                easing = EASINGS[easing]
+            except KeyError:
+                raise ValueError(f"Invalid easing {easing!r}, expected one of {', '.join(EASINGS)}") from None
+
+        self.duration = duration
+        steps = max(1, round(duration * steps_per_second))
+        weights = [easing(step / steps) for step in range(steps + 1)]
+
+        # The colour each zone ends on
+        self.targets: Dict[str, RGB] = {}
+
+        # Each zone is interpolated in a single pass over the eased weights
+        tables = {}
+        for name, target in (("logo", logo), ("fan", fan), ("ring", ring)):
+            if target is not None:
+                target = self.targets[name] = RGB.coerce(target)
+                tables[name] = interpolate(getattr(prism, name).rgb, target, weights, space)
+                # The easing may not end on exactly 1
+                tables[name][-1] = target
+        self.frames: List[Frame] = [Frame(**{name: table[step] for name, table in tables.items()})
+                                    for step in range(steps + 1)]
+
+        # A frame is due for every step, and the ones the device can't keep up with are dropped
+        self._streamer = FrameStreamer(prism, self._frame, fps=steps / duration if duration > 0 else None)
+        self._finished = threading.Event()
+        self._cancelled = False
+
+    def _frame(self, index: int, seconds: float) -> Frame | None:
+        if self._finished.is_set():
+            return None
+        if seconds >= self.duration:
+            self._finished.set()
+            return self.frames[-1]
+        return self.frames[int(seconds / self.duration * (len(self.frames) - 1))]
+
+    @property
+    def stats(self) -> FrameStats:
+        return self._streamer.stats
+
+    @property
+    def running(self) -> bool:
+        return self._streamer.running
+
+    @property
+    def finished(self) -> bool:
+        # Whether the target colours were sent
+        return self._finished.is_set() and not self._streamer.running
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def start(self):
+        self._streamer.start()
+
+    def run(self):
+        # Streams the transition on the calling thread
+        self._streamer.run()
+
+    def wait(self, timeout: float | None = None):
+        self._streamer.join(timeout)
+
+    def cancel(self):
+        self._streamer.stop()
+        # The last frame may have been sent in the meantime
+        self._cancelled = not self._finished.is_set()
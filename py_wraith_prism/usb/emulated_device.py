@@ -0,0 +1,204 @@
+import copy
+import random
+import time
+from collections import deque
+from typing import Dict, List, Iterable, Deque, Tuple
+
+_REPORT_SIZE = 64
+_HEADER_SIZE = 4
+_PAYLOAD_SIZE = _REPORT_SIZE - _HEADER_SIZE
+
+_DEFAULT_LOGO_CHANNEL = 0x05
+_DEFAULT_FAN_CHANNEL = 0x06
+_DEFAULT_RING_CHANNEL = 0x07
+
+
+def _payload(values: Iterable[int]) -> bytearray:
+    payload = bytearray(values)
+    return payload + bytearray(_PAYLOAD_SIZE - len(payload))
+
+
+class _EmulatedState:
+    def __init__(self):
+        self.channel_map = _payload(
+            [0, 3, 0, 0, _DEFAULT_LOGO_CHANNEL, _DEFAULT_FAN_CHANNEL] + [_DEFAULT_RING_CHANNEL] * 15)
+        # Values are laid out the same way the 0x51 0x2C packet writes them: channel, speed, color source, mode, 0xFF,
+        # brightness, red, green, blue
+        self.channels: Dict[int, bytearray] = {
+            _DEFAULT_LOGO_CHANNEL: _payload([_DEFAULT_LOGO_CHANNEL, 0x80, 0x20, 2, 0xFF, 0x7F, 0xFF, 0, 0]),
+            _DEFAULT_FAN_CHANNEL: _payload([_DEFAULT_FAN_CHANNEL, 0x80, 0x20, 2, 0xFF, 0x7F, 0xFF, 0, 0]),
+            _DEFAULT_RING_CHANNEL: _payload([_DEFAULT_RING_CHANNEL, 0x64, 0, 5, 0xFF, 0xFF, 0, 0, 0]),
+        }
+        self.morse_chunks: Dict[int, bytearray] = {chunk: _payload([]) for chunk in range(4)}
+        self.mirage = _payload([1, 0, 0xFF, 0x4A, 2, 0, 0xFF, 0x4A, 3, 0, 0xFF, 0x4A, 4, 0, 0xFF, 0x4A])
+        self.enso = _payload([])
+
+
+class EmulatedWraithPrismDevice:
+    '''
+    A software stand-in for the hid.device of a Wraith Prism. It implements the subset of the hidapi device API that
+    WraithUsbInterface uses, and models the device protocol with separate working and saved (flash) state.
+
+    The response to every packet becomes available latency seconds after it was written, plus a uniformly distributed
+    extra delay of up to jitter seconds. Responses are always returned in the order the packets were written, and at
+    least processing_time seconds apart.
+
+    A write_loss fraction of register writes are acknowledged as usual, but don't take effect.
+    '''
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, firmware_version: str = "V1.0.0",
+                 seed: int | None = None, processing_time: float = 0.0, write_loss: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.processing_time = processing_time
+        self.write_loss = write_loss
+        self.firmware_version = firmware_version
+        self._random = random.Random(seed)
+
+        self.powered_on = False
+        self.apply_count = 0
+        self.save_count = 0
+        self.transaction_count = 0
+
+        self._state = _EmulatedState()
+        self._saved_state = copy.deepcopy(self._state)
+
+        self._responses: Deque[Tuple[float, List[int]]] = deque()
+        self._ready_at = 0.0
+        self._open = True
+        # After disconnect(), the handle stays dead until the device is connected and opened again
+        self.connected = True
+        self._stale = False
+
+    @property
+    def state(self) -> _EmulatedState:
+        return self._state
+
+    @property
+    def saved_state(self) -> _EmulatedState:
+        return self._saved_state
+
+    def open(self, vendor_id: int = 0, product_id: int = 0, serial_number: str | None = None):
+        self.open_path(b"")
+
+    def open_path(self, path: bytes):
+        if not self.connected:
+            raise OSError("open failed")
+        self._open = True
+        self._stale = False
+
+    def disconnect(self):
+        # Drops off the bus like a USB reset: reads fail, and writes return -1 as they do with hidapi
+        self.connected = False
+        self._stale = True
+        self._responses.clear()
+
+    def connect(self):
+        # Comes back with the state that was saved to flash, and has to be opened again
+        self.connected = True
+        self.powered_on = False
+        self._state = copy.deepcopy(self._saved_state)
+
+    def close(self):
+        self._open = False
+        self._responses.clear()
+
+    def set_nonblocking(self, value: int):
+        pass
+
+    def get_manufacturer_string(self) -> str:
+        return "Emulated"
+
+    def get_product_string(self) -> str:
+        return "Wraith Prism"
+
+    def get_serial_number_string(self) -> str:
+        return ""
+
+    def write(self, buff: Iterable[int]) -> int:
+        if not self._open:
+            raise ValueError("not open")
+        if self._stale:
+            return -1
+
+        # The first byte is the report ID
+        report = bytes(buff)
+        request = report[1:].ljust(_REPORT_SIZE, b"\0")
+        response = self._handle(request)
+        self.transaction_count += 1
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter > 0 else 0)
+        # Packets that are written back-to-back are in flight at the same time, but are still answered in order
+        self._ready_at = max(self._ready_at + self.processing_time, time.perf_counter() + delay)
+        self._responses.append((self._ready_at, response))
+        return len(report)
+
+    def read(self, max_length: int, timeout_ms: int = 0) -> List[int]:
+        if not self._open:
+            raise ValueError("not open")
+        if self._stale:
+            raise OSError("read error")
+
+        if not self._responses:
+            # A real device would block forever here, so behave as if the read timed out instead
+            return []
+
+        ready_at, response = self._responses.popleft()
+        remaining = ready_at - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+        return response[:max_length]
+
+    def _handle(self, request: bytes) -> List[int]:
+        command = request[0]
+        state = self._state
+
+        if command == 0x41:
+            self.powered_on = request[1] == 0x80
+        elif command == 0x50:
+            if request[1] == 0x55:
+                self._saved_state = copy.deepcopy(state)
+                self.save_count += 1
+            else:
+                self._state = copy.deepcopy(self._saved_state)
+        elif command == 0x12 and request[1] == 0x20:
+            version = self.firmware_version.encode()[:26]
+            return list(request[0:8] + version.ljust(_REPORT_SIZE - 8, b"\0"))
+        elif command == 0x51:
+            if not self.write_loss or self._random.random() >= self.write_loss:
+                self._write_register(request[1], request[2], request[_HEADER_SIZE:])
+        elif command == 0x52:
+            payload = self._read_register(request[1], request[2], request[_HEADER_SIZE])
+            return list(request[0:_HEADER_SIZE] + payload)
+
+        # Writes are acknowledged by echoing the request
+        return list(request)
+
+    def _write_register(self, register: int, index: int, payload: bytes):
+        state = self._state
+        if register == 0x2C:
+            state.channels[payload[0]] = bytearray(payload)
+        elif register == 0xA0:
+            state.channel_map = bytearray(payload)
+        elif register == 0x73:
+            state.morse_chunks[index] = bytearray(payload)
+        elif register == 0x71:
+            state.mirage = bytearray(payload)
+        elif register == 0x96:
+            state.enso = bytearray(payload)
+        elif register == 0x28:
+            self.apply_count += 1
+
+    def _read_register(self, register: int, index: int, channel: int) -> bytes:
+        state = self._state
+        if register == 0x2C:
+            return bytes(state.channels.get(channel, _payload([channel])))
+        elif register == 0xA0:
+            return bytes(state.channel_map)
+        elif register == 0x73:
+            return bytes(state.morse_chunks.get(index, _payload([])))
+        elif register == 0x71:
+            return bytes(state.mirage)
+        elif register == 0x96:
+            return bytes(state.enso)
+        return bytes(_PAYLOAD_SIZE)
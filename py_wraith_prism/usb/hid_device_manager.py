@@ -1,12 +1,21 @@
-from typing import Any, Generator, Iterable
+import threading
+import time
+from typing import Callable, Iterable, List, TYPE_CHECKING
 
 import hid
 from hid import device as hid_device
 
+# Only imported once devices are watched
+if TYPE_CHECKING:
+    from py_wraith_prism.usb.hotplug import HotplugWatcher
+
+# How long the results of hid.enumerate() are reused, in seconds
+DEFAULT_ENUMERATION_TTL = 2.0
+
 
 class HidDeviceManager:
     def __init__(self, vendor_id: int | Iterable[int], product_id: int | Iterable[int],
-                 interface_number: int | Iterable[int]):
+                 interface_number: int | Iterable[int], enumeration_ttl: float = DEFAULT_ENUMERATION_TTL):
         if not hasattr(vendor_id, '__iter__'):
             vendor_id = (vendor_id,)
         self._vendor_ids = vendor_id
@@ -19,31 +28,104 @@ class HidDeviceManager:
             interface_number = (interface_number,)
         self.interface_numbers = interface_number
 
-        self._device = hid_device()
+        # hid.enumerate() walks every HID device on the host, so its results are cached for enumeration_ttl seconds,
+        # or for as long as a hotplug watcher keeps them current
+        self._enumeration_ttl = enumeration_ttl
+        self._enumeration_lock = threading.Lock()
+        self._descriptors: List[dict] | None = None
+        self._enumerated_at = 0.0
+        self._watcher: 'HotplugWatcher | None' = None
 
     def list_devices(self):
         return list(self._enumerate_devices())
 
-    def _enumerate_devices(self) -> Generator[Any, Any, None]:
+    def _enumerate_devices(self) -> List[dict]:
+        with self._enumeration_lock:
+            descriptors = self._descriptors
+            # A device that wasn't found may have been plugged in since, so that's only trusted from a watcher
+            if descriptors is not None and (self.watching or (
+                    descriptors and time.monotonic() - self._enumerated_at < self._enumeration_ttl)):
+                return descriptors
+
+        descriptors = self._scan_devices()
+        self._set_descriptors(descriptors)
+        return descriptors
+
+    def _scan_devices(self) -> List[dict]:
+        descriptors = []
         for vendor_id in self._vendor_ids:
             for product_id in self._product_ids:
                 for descriptor in hid.enumerate(vendor_id=vendor_id, product_id=product_id):
                     if descriptor['interface_number'] in self.interface_numbers:
-                        yield descriptor
+                        descriptors.append(descriptor)
+        return descriptors
+
+    def _set_descriptors(self, descriptors: List[dict]):
+        with self._enumeration_lock:
+            self._descriptors = descriptors
+            self._enumerated_at = time.monotonic()
+
+    def invalidate_enumeration(self):
+        # The next lookup scans the bus again
+        with self._enumeration_lock:
+            self._descriptors = None
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.running
+
+    def watch(self, on_connect: Callable[[dict], None] | None = None,
+              on_disconnect: Callable[[dict], None] | None = None,
+              poll_interval: float | None = None) -> 'HotplugWatcher':
+        '''
+        Starts a HotplugWatcher that keeps the device list current, so looking up devices never scans the bus while
+        it's running. The callbacks are called on the watcher's thread with the descriptor of each matching device
+        that's connected or disconnected. Stop it with stop(), or use it as a context manager. poll_interval defaults to
+        DEFAULT_POLL_INTERVAL.
+        '''
+        from py_wraith_prism.usb.hotplug import HotplugWatcher, DEFAULT_POLL_INTERVAL
+
+        if poll_interval is None:
+            poll_interval = DEFAULT_POLL_INTERVAL
+        if self.watching:
+            raise ValueError("The devices are already being watched")
+        self._watcher = HotplugWatcher(self._scan_devices, self._set_descriptors, on_connect, on_disconnect,
+                                       poll_interval)
+        self._watcher.start()
+        return self._watcher
 
     def _open_device(self, descriptor) -> hid_device:
+        # Every device gets its own handle, so several devices can be open at the same time
+        device = hid_device()
         try:
-            self._device.open_path(descriptor["path"])
-            return self._device
+            device.open_path(descriptor["path"])
+            return device
         except OSError as e:
+            # The descriptor may be a cached one for a device that has been unplugged since
+            if not self.watching:
+                self.invalidate_enumeration()
             raise IOError("Failed to open the device.") from e
 
-    def _open_first_device(self) -> hid_device:
-        descriptors = self._enumerate_devices()
+    def reopen_device(self, descriptor) -> hid_device:
+        # Opens the device again after it was reset. If its path changed, it's found again by its serial number.
         try:
-            descriptor = next(descriptors)
-        except StopIteration:
+            return self._open_device(descriptor)
+        except IOError:
+            serial_number = descriptor.get("serial_number")
+            if not serial_number:
+                raise
+
+        for candidate in self._enumerate_devices():
+            if candidate.get("serial_number") == serial_number and candidate["path"] != descriptor["path"]:
+                return self._open_device(candidate)
+        raise IOError("Failed to find the device again.")
+
+    def _find_first_descriptor(self):
+        descriptors = self._enumerate_devices()
+        if not descriptors:
             # No descriptors were found
             raise IOError("Failed to find a matching device.")
+        return descriptors[0]
 
-        return self._open_device(descriptor)
+    def _open_first_device(self) -> hid_device:
+        return self._open_device(self._find_first_descriptor())
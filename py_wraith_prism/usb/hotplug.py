@@ -0,0 +1,185 @@
+import logging
+import os
+import select
+import socket
+import threading
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import Callable, Dict, FrozenSet, List, Type
+
+# The seconds between checks for added or removed devices, when they're polled
+DEFAULT_POLL_INTERVAL = 1.0
+
+HIDRAW_DIRECTORY = "/sys/class/hidraw"
+
+_NETLINK_KOBJECT_UEVENT = 15
+_KERNEL_UEVENT_GROUP = 1
+
+
+def _open_uevent_socket() -> socket.socket | None:
+    # Kernel uevents are broadcast on a netlink socket that any user can listen to, but only on Linux
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_KOBJECT_UEVENT)
+    except (AttributeError, OSError):
+        return None
+    try:
+        sock.bind((0, _KERNEL_UEVENT_GROUP))
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _hidraw_nodes() -> FrozenSet[str] | None:
+    try:
+        return frozenset(os.listdir(HIDRAW_DIRECTORY))
+    except OSError:
+        return None
+
+
+class HotplugWatcher(AbstractContextManager):
+    '''
+    Scans for devices on a background thread whenever one may have been added or removed, publishes the descriptors
+    it finds, and calls on_connect and on_disconnect with the descriptor of each device that appeared or disappeared.
+    The devices that are present when it starts are the baseline, and don't trigger on_connect.
+
+    On Linux, it waits for hidraw uevents from the kernel and also checks the entries of /sys/class/hidraw every
+    poll_interval seconds, which is much cheaper than enumerating devices. Where neither is available, it scans every
+    poll_interval seconds. Use HidDeviceManager.watch() rather than creating one directly.
+    '''
+
+    def __init__(self, scan: Callable[[], List[dict]], publish: Callable[[List[dict]], None],
+                 on_connect: Callable[[dict], None] | None = None,
+                 on_disconnect: Callable[[dict], None] | None = None, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self._scan = scan
+        self._publish = publish
+        self._on_connect = on_connect
+        self._on_disconnect = on_disconnect
+        self._poll_interval = poll_interval
+
+        self._devices: Dict[bytes, dict] = {}
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._uevents: socket.socket | None = None
+        # Written to by stop(), so that a thread waiting for uevents wakes up
+        self._wakeup: socket.socket | None = None
+        self._wakeup_reader: socket.socket | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def uses_uevents(self) -> bool:
+        return self._uevents is not None
+
+    def devices(self) -> List[dict]:
+        return list(self._devices.values())
+
+    def start(self):
+        if self._thread is not None:
+            raise ValueError("The watcher has already been started")
+
+        # Scanning once before returning means the device list is current as soon as the watcher is running
+        self._uevents = _open_uevent_socket()
+        if self._uevents is not None:
+            self._wakeup_reader, self._wakeup = socket.socketpair()
+        try:
+            self._rescan(notify=False)
+        except BaseException:
+            self._close_sockets()
+            raise
+
+        self._thread = threading.Thread(target=self._run, name="wraith-prism-hotplug", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        try:
+            if self._wakeup is not None:
+                self._wakeup.send(b"\0")
+        except OSError:
+            # The thread has already stopped and closed it
+            pass
+        if self._thread is None:
+            self._close_sockets()
+        elif self._thread is not threading.current_thread():
+            # When called from a callback, the thread stops once the callback returns
+            self._thread.join()
+
+    def _close_sockets(self):
+        for sock in (self._uevents, self._wakeup, self._wakeup_reader):
+            if sock is not None:
+                sock.close()
+        self._uevents = self._wakeup = self._wakeup_reader = None
+
+    def _run(self):
+        try:
+            self._watch()
+        finally:
+            self._close_sockets()
+
+    def _watch(self):
+        nodes = _hidraw_nodes()
+        while not self._stop_event.is_set():
+            changed = self._wait_for_uevent() if self._uevents is not None else self._wait()
+            if self._stop_event.is_set():
+                return
+
+            # Without uevents, or between them, a change in the hidraw nodes is what gives a device away
+            current_nodes = _hidraw_nodes()
+            if changed or current_nodes != nodes or current_nodes is None:
+                nodes = current_nodes
+                try:
+                    self._rescan(notify=True)
+                except Exception:
+                    logging.getLogger(__name__).exception("Failed to scan for devices")
+
+    def _wait(self) -> bool:
+        self._stop_event.wait(self._poll_interval)
+        return False
+
+    def _wait_for_uevent(self) -> bool:
+        readable, _, _ = select.select([self._uevents, self._wakeup_reader], [], [], self._poll_interval)
+        changed = False
+        if self._uevents in readable:
+            # Several uevents are usually sent for each device, so every queued one is handled by a single scan
+            while True:
+                try:
+                    message = self._uevents.recv(8192)
+                except BlockingIOError:
+                    break
+                if b"SUBSYSTEM=hidraw" in message:
+                    changed = True
+        return changed
+
+    def _rescan(self, notify: bool):
+        descriptors = self._scan()
+        self._publish(descriptors)
+
+        devices = {descriptor["path"]: descriptor for descriptor in descriptors}
+        previous, self._devices = self._devices, devices
+        if not notify:
+            return
+
+        for path, descriptor in previous.items():
+            if path not in devices:
+                self._notify(self._on_disconnect, descriptor)
+        for path, descriptor in devices.items():
+            if path not in previous:
+                self._notify(self._on_connect, descriptor)
+
+    @staticmethod
+    def _notify(callback: Callable[[dict], None] | None, descriptor: dict):
+        if callback is None:
+            return
+        try:
+            callback(descriptor)
+        except Exception:
+            logging.getLogger(__name__).exception("Hotplug callback failed")
+
+    def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                 __traceback: TracebackType or None) -> bool or None:
+        self.stop()
+        return None
@@ -0,0 +1,278 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple, Deque
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# The span of transactions that weren't issued by an instrumented method, such as the constructor handshake
+NO_SPAN = "none"
+
+
+def opcode_name(packet: Sequence[int]) -> str:
+    # Register reads and writes are told apart by their register, e.g. 51/2C for channel values and 51/73 for morse
+    if packet[0] in (0x51, 0x52):
+        return f"{packet[0]:02X}/{packet[1]:02X}"
+    return f"{packet[0]:02X}"
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # The last count is for observations above the largest bucket
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        # Shaped like Prometheus histogram buckets, each one counting the observations less than or equal to it
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return result
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "sum": self.sum, "buckets": dict(self.cumulative_counts())}
+
+
+@dataclass
+class TransactionStats:
+    count: int = 0
+    errors: int = 0
+    bytes_written: int = 0
+    bytes_read: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "errors": self.errors, "bytes_written": self.bytes_written,
+                "bytes_read": self.bytes_read, "latency": self.latency.to_dict()}
+
+
+@dataclass
+class SpanStats:
+    calls: int = 0
+    errors: int = 0
+    duration: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> dict:
+        return {"calls": self.calls, "errors": self.errors, "duration": self.duration.to_dict()}
+
+
+class UsbInstrumentation:
+    '''
+    Collects statistics about the HID transactions of one or more devices: the number of transactions, their errors,
+    bytes transferred and latency (from writing a packet until its response is read), by opcode and by span. A span is
+    the public WraithPrism method that issued the transactions, and only the outermost one is recorded when methods
+    call each other.
+
+    Pass an instance to WraithPrism (or WraithDeviceManager) to enable it. Without one, the USB interface doesn't
+    measure anything.
+    '''
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # Spans are tracked per thread, so that devices in a group that share an instance are attributed correctly
+        self._local = threading.local()
+        self._transactions: Dict[Tuple[str, str], TransactionStats] = {}
+        self._spans: Dict[str, SpanStats] = {}
+
+    @property
+    def current_span(self) -> str:
+        return getattr(self._local, "span", None) or NO_SPAN
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        local = self._local
+        if getattr(local, "span", None) is not None:
+            # Nested calls are part of the outer span
+            yield
+            return
+
+        local.span = name
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            local.span = None
+            duration = time.perf_counter() - start
+            with self._lock:
+                stats = self._spans.get(name)
+                if stats is None:
+                    stats = self._spans[name] = SpanStats(duration=LatencyHistogram(self._buckets))
+                stats.calls += 1
+                stats.errors += failed
+                stats.duration.observe(duration)
+
+    def record(self, span: str, packet: Sequence[int], bytes_written: int, bytes_read: int, seconds: float,
+               error: bool = False):
+        key = (span, opcode_name(packet))
+        with self._lock:
+            stats = self._transactions.get(key)
+            if stats is None:
+                stats = self._transactions[key] = TransactionStats(latency=LatencyHistogram(self._buckets))
+            stats.count += 1
+            stats.errors += error
+            stats.bytes_written += bytes_written
+            stats.bytes_read += bytes_read
+            stats.latency.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._transactions.clear()
+            self._spans.clear()
+
+    def opcode_totals(self) -> Dict[str, TransactionStats]:
+        # The transaction statistics of every opcode, summed over all spans
+        totals: Dict[str, TransactionStats] = {}
+        with self._lock:
+            for (span, opcode), stats in self._transactions.items():
+                total = totals.get(opcode)
+                if total is None:
+                    total = totals[opcode] = TransactionStats(latency=LatencyHistogram(self._buckets))
+                total.count += stats.count
+                total.errors += stats.errors
+                total.bytes_written += stats.bytes_written
+                total.bytes_read += stats.bytes_read
+                total.latency.count += stats.latency.count
+                total.latency.sum += stats.latency.sum
+                total.latency.counts = [a + b for a, b in zip(total.latency.counts, stats.latency.counts)]
+        return totals
+
+    def to_dict(self) -> dict:
+        opcodes = {opcode: stats.to_dict() for opcode, stats in sorted(self.opcode_totals().items())}
+        with self._lock:
+            transactions = [dict(span=span, opcode=opcode, **stats.to_dict())
+                            for (span, opcode), stats in sorted(self._transactions.items())]
+            spans = {name: stats.to_dict() for name, stats in sorted(self._spans.items())}
+        return {"opcodes": opcodes, "transactions": transactions, "spans": spans}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        lines = []
+
+        def metric(name: str, metric_type: str, description: str):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        def histogram(name: str, labels: str, values: LatencyHistogram):
+            for bound, count in values.cumulative_counts():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {values.sum!r}")
+            lines.append(f"{name}_count{{{labels}}} {values.count}")
+
+        with self._lock:
+            transactions = sorted(self._transactions.items())
+            spans = sorted(self._spans.items())
+
+            counters = (("transactions", "count", "HID transactions"),
+                        ("errors", "errors", "HID transactions that failed or weren't acknowledged"),
+                        ("bytes_written", "bytes_written", "Bytes written to the device"),
+                        ("bytes_read", "bytes_read", "Bytes read from the device"))
+            for name, attribute, description in counters:
+                metric(f"wraith_prism_hid_{name}_total", "counter", f"{description}, by opcode and span")
+                for (span, opcode), stats in transactions:
+                    lines.append(f'wraith_prism_hid_{name}_total{{opcode="{opcode}",span="{span}"}} '
+                                 f'{getattr(stats, attribute)}')
+
+            metric("wraith_prism_hid_latency_seconds", "histogram",
+                   "Time from writing a packet until its response was read, by opcode and span")
+            for (span, opcode), stats in transactions:
+                histogram("wraith_prism_hid_latency_seconds", f'opcode="{opcode}",span="{span}"', stats.latency)
+
+            metric("wraith_prism_span_calls_total", "counter", "Calls of instrumented WraithPrism methods")
+            for span, stats in spans:
+                lines.append(f'wraith_prism_span_calls_total{{span="{span}"}} {stats.calls}')
+            metric("wraith_prism_span_errors_total", "counter", "Calls of instrumented WraithPrism methods that raised")
+            for span, stats in spans:
+                lines.append(f'wraith_prism_span_errors_total{{span="{span}"}} {stats.errors}')
+            metric("wraith_prism_span_duration_seconds", "histogram", "Duration of instrumented WraithPrism methods")
+            for span, stats in spans:
+                histogram("wraith_prism_span_duration_seconds", f'span="{span}"', stats.duration)
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus_textfile(self, path: str):
+        import tempfile
+
+        # The node exporter's textfile collector may read the file at any time, so it's replaced atomically
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class InstrumentedDevice:
+    '''
+    Wraps a hid.device and records every write and the read of its response as a transaction. Responses are matched
+    to packets in the order they were written, which also covers pipelined writes.
+    '''
+
+    def __init__(self, device, instrumentation: UsbInstrumentation):
+        self._device = device
+        self._instrumentation = instrumentation
+        self._pending: Deque[Tuple[bytes, str, int, float]] = deque()
+
+    def __getattr__(self, name: str):
+        return getattr(self._device, name)
+
+    def write(self, buff) -> int:
+        # The first byte is the report ID
+        packet = bytes(buff[1:])
+        span = self._instrumentation.current_span
+        start = time.perf_counter()
+        try:
+            result = self._device.write(buff)
+        except Exception:
+            self._instrumentation.record(span, packet, 0, 0, time.perf_counter() - start, error=True)
+            raise
+        if result < 0:
+            # hidapi reports a failed write by returning -1, and there's no response to match to the packet
+            self._instrumentation.record(span, packet, 0, 0, time.perf_counter() - start, error=True)
+        else:
+            self._pending.append((packet, span, len(packet), start))
+        return result
+
+    def read(self, max_length: int, *args):
+        if not self._pending:
+            return self._device.read(max_length, *args)
+
+        packet, span, bytes_written, start = self._pending.popleft()
+        try:
+            response = self._device.read(max_length, *args)
+        except Exception:
+            self._instrumentation.record(span, packet, bytes_written, 0, time.perf_counter() - start, error=True)
+            raise
+
+        # A missing response, or one for a different packet, is an error
+        error = not response or response[0] != packet[0] or response[1] != packet[1]
+        self._instrumentation.record(span, packet, bytes_written, len(response), time.perf_counter() - start, error)
+        return response
+
+    def close(self):
+        self._pending.clear()
+        self._device.close()
@@ -0,0 +1,180 @@
+import json
+import time
+from collections import deque
+from typing import Deque, List, NamedTuple, TextIO, Tuple
+
+_FORMAT_VERSION = 1
+
+
+class Transaction(NamedTuple):
+    '''
+    A packet that was written to the device and its response. time is the number of seconds between the start of the
+    recording and the write, and latency is the number of seconds until the response was read.
+    '''
+    time: float
+    latency: float
+    request: bytes
+    response: bytes
+
+    def to_json(self) -> str:
+        return json.dumps({"t": round(self.time, 6), "dt": round(self.latency, 6), "request": self.request.hex(),
+                           "response": self.response.hex()}, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'Transaction':
+        data = json.loads(text)
+        return cls(data["t"], data["dt"], bytes.fromhex(data["request"]), bytes.fromhex(data["response"]))
+
+
+class TranscriptDivergenceError(IOError):
+    def __init__(self, index: int, expected: bytes | None, actual: bytes):
+        if expected is None:
+            message = f"Request #{index} is past the end of the transcript (got {actual[:8].hex(' ')}...)"
+        else:
+            offset = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+                          min(len(expected), len(actual)))
+            message = (f"Request #{index} diverged from the transcript at byte {offset} (expected "
+                       f"{expected[offset:offset + 8].hex(' ')}..., got {actual[offset:offset + 8].hex(' ')}...)")
+        super().__init__(message)
+        self.index = index
+        self.expected = expected
+        self.actual = actual
+
+
+def read_transcript(path: str) -> List[Transaction]:
+    with open(path, "r") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported transcript version {header.get('version')}")
+        return [Transaction.from_json(line) for line in f if line.strip()]
+
+
+class TranscriptRecorder:
+    '''
+    Wraps a hid.device and writes every packet and its response to a JSON lines transcript: a header line, followed by
+    one Transaction per line. Responses are matched to packets in the order they were written, so pipelined writes are
+    recorded correctly.
+    '''
+
+    def __init__(self, device, path: str):
+        self._device = device
+        self._file: TextIO = open(path, "w")
+        self._started = time.perf_counter()
+        self._pending: Deque[Tuple[bytes, float]] = deque()
+        self._file.write(json.dumps({"version": _FORMAT_VERSION, "started": time.time()}) + "\n")
+
+    def __getattr__(self, name: str):
+        return getattr(self._device, name)
+
+    def write(self, buff) -> int:
+        written_at = time.perf_counter()
+        result = self._device.write(buff)
+        # The first byte is the report ID
+        self._pending.append((bytes(buff[1:]), written_at))
+        return result
+
+    def read(self, max_length: int, *args):
+        response = self._device.read(max_length, *args)
+        if self._pending:
+            request, written_at = self._pending.popleft()
+            transaction = Transaction(written_at - self._started, time.perf_counter() - written_at, request,
+                                      bytes(response))
+            self._file.write(transaction.to_json() + "\n")
+        return response
+
+    def close(self):
+        try:
+            self._device.close()
+        finally:
+            self._file.close()
+
+
+class ReplayDevice:
+    '''
+    A stand-in for a hid.device that answers every packet with the response from a transcript, so that a recorded
+    session can be reproduced without the device. When realtime is set, the recorded timing is reproduced: every packet
+    is written at the same offset from the first one as in the recording, waiting if the caller is ahead of it, and its
+    response takes as long as it did. Otherwise, everything is answered immediately.
+
+    A packet that differs from the recorded one is a divergence. It raises a TranscriptDivergenceError when strict is
+    set, and is otherwise added to divergences and answered with the recorded response anyway.
+    '''
+
+    def __init__(self, transcript: str | List[Transaction], realtime: bool = False, strict: bool = True):
+        self._transactions = read_transcript(transcript) if isinstance(transcript, str) else list(transcript)
+        self.realtime = realtime
+        self.strict = strict
+        self.divergences: List[TranscriptDivergenceError] = []
+
+        self._index = 0
+        # When realtime, the time the recording would have started at, had the first packet been written now
+        self._started: float | None = None
+        self._responses: Deque[Tuple[float, bytes]] = deque()
+        self._open = True
+
+    @property
+    def remaining(self) -> int:
+        # The number of recorded transactions that haven't been replayed yet
+        return len(self._transactions) - self._index
+
+    def open(self, vendor_id: int = 0, product_id: int = 0, serial_number: str | None = None):
+        self._open = True
+
+    def open_path(self, path: bytes):
+        self._open = True
+
+    def close(self):
+        self._open = False
+        self._responses.clear()
+
+    def set_nonblocking(self, value: int):
+        pass
+
+    def write(self, buff) -> int:
+        if not self._open:
+            raise ValueError("not open")
+
+        request = bytes(buff[1:])
+        index = self._index
+        if index >= len(self._transactions):
+            self._diverge(TranscriptDivergenceError(index, None, request))
+            # There is nothing left to answer with
+            return len(buff)
+
+        transaction = self._transactions[index]
+        self._index += 1
+        if request != transaction.request:
+            self._diverge(TranscriptDivergenceError(index, transaction.request, request))
+
+        ready_at = self._wait_for(transaction) + transaction.latency if self.realtime else 0.0
+        self._responses.append((ready_at, transaction.response))
+        return len(buff)
+
+    def _wait_for(self, transaction: Transaction) -> float:
+        # Sleeps until the transaction's offset in the recording, and returns the time it was written at
+        now = time.perf_counter()
+        if self._started is None:
+            self._started = now - transaction.time
+        remaining = self._started + transaction.time - now
+        if remaining <= 0:
+            return now
+        time.sleep(remaining)
+        return time.perf_counter()
+
+    def read(self, max_length: int, timeout_ms: int = 0) -> List[int]:
+        if not self._open:
+            raise ValueError("not open")
+        if not self._responses:
+            return []
+
+        ready_at, response = self._responses.popleft()
+        if self.realtime:
+            remaining = ready_at - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+        return list(response[:max_length])
+
+    def _diverge(self, error: TranscriptDivergenceError):
+        self.divergences.append(error)
+        if self.strict:
+            raise error
@@ -1,33 +1,170 @@
 import itertools
+import threading
 from builtins import bytearray
 from contextlib import AbstractContextManager
 from types import TracebackType
-from typing import List, Type, Iterable
+from typing import List, Type, Iterable, Dict, Sequence, Callable, TYPE_CHECKING
 
-from hid import device as hid_device
+# Instrumentation is optional, so it's only imported when it's used
+if TYPE_CHECKING:
+    from hid import device as hid_device
+
+    from py_wraith_prism.usb.instrumentation import UsbInstrumentation
+
+BytesLike = bytes | bytearray | memoryview
+
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_ACK_TIMEOUT_MS = 1000
+
+
+class WraithProtocolError(IOError):
+    def __init__(self, message: str, packet: bytes, response: Sequence[int]):
+        super().__init__(f"{message} (packet {packet[:8].hex(' ')}..., response {bytes(response[:8]).hex(' ')}...)")
+        self.packet = packet
+        self.response = response
 
 
 class WraithUsbInterface(AbstractContextManager):
-    def __init__(self, device: hid_device, request_size: int = 64):
-        self._device: hid_device = device
+    '''
+    In pipelined mode, write_packet() doesn't wait for the response of each packet. Writes are issued back-to-back, and
+    their acknowledgements are read and checked in bulk: before the next packet whose response is needed, when
+    max_in_flight writes are pending, or on flush(). A missing or mismatched acknowledgement raises a
+    WraithProtocolError for the packet that caused it, after passing it to on_protocol_error. By then, the writes that
+    were in flight may or may not have taken effect.
+
+    When an instrumentation is given, every transaction is recorded in it. See UsbInstrumentation for details.
+    '''
+
+    def __init__(self, device: 'hid_device', request_size: int = 64, pipelined: bool = False,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, ack_timeout_ms: int = DEFAULT_ACK_TIMEOUT_MS,
+                 instrumentation: 'UsbInstrumentation | None' = None):
+        # Without instrumentation, the device is used directly so that it costs nothing
+        self.instrumentation = instrumentation
+        self._hid_device = device
+        if instrumentation is not None:
+            from py_wraith_prism.usb.instrumentation import InstrumentedDevice
+            device = InstrumentedDevice(device, instrumentation)
+        self._device: 'hid_device' = device
         self._request_size = request_size
 
+        # Every report is built in the same buffer. The first byte is the report ID, which is always 0.
+        self._report = bytearray(request_size + 1)
+        self._fillers: Dict[int, bytes] = {}
+
+        self.pipelined = pipelined
+        self._max_in_flight = max_in_flight
+        self._ack_timeout_ms = ack_timeout_ms
+        self._in_flight: List[bytes] = []
+        self.on_protocol_error: Callable[[WraithProtocolError], None] | None = None
+
+        # Transactions are atomic, so the device can be used from more than one thread, e.g. by a debounced save
+        self._lock = threading.RLock()
+
     def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
                  __traceback: TracebackType or None) -> bool or None:
         self.close()
         return None
 
     def close(self):
-        self._device.close()
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                self._device.close()
+
+    def replace_device(self, device: 'hid_device'):
+        # Switches to a new handle after the old one stopped working. Writes that were in flight are lost with it.
+        with self._lock:
+            self._in_flight = []
+            if device is not self._hid_device:
+                # Reopening may also return the same handle, as the emulated device does
+                try:
+                    self._device.close()
+                except Exception:
+                    pass
+            self._hid_device = device
+            if self.instrumentation is not None:
+                from py_wraith_prism.usb.instrumentation import InstrumentedDevice
+                device = InstrumentedDevice(device, self.instrumentation)
+            self._device = device
+
+    def flush(self):
+        # Reads and checks the acknowledgements of every pipelined write that is still pending
+        with self._lock:
+            in_flight = self._in_flight
+            if not in_flight:
+                return
+
+            self._in_flight = []
+            error = None
+            for packet in in_flight:
+                response = self._device.read(self._request_size, self._ack_timeout_ms)
+                if error is not None:
+                    continue
+                if not response:
+                    error = WraithProtocolError("The device didn't acknowledge a packet", packet, response)
+                elif response[0] != packet[0] or response[1] != packet[1]:
+                    error = WraithProtocolError("The device acknowledged a different packet", packet, response)
+
+            # Every acknowledgement is drained before raising, so the next request starts in sync with the device
+            if error is not None:
+                if self.on_protocol_error is not None:
+                    self.on_protocol_error(error)
+                raise error
 
     def send_bytes(self, values: Iterable[int], filler: int = 0) -> List[int]:
-        values = bytearray(itertools.chain([0], values))
-        if len(values) > self._request_size + 1:
-            raise ValueError()
+        with self._lock:
+            self.flush()
+            values = bytearray(itertools.chain([0], values))
+            if len(values) > self._request_size + 1:
+                raise ValueError()
+
+            remaining = self._request_size - len(values) + 1
+            values.extend([filler] * remaining)
+
+            self._write(values)
+            result = self._device.read(self._request_size)
+            return result
+
+    def send_packet(self, *parts: BytesLike | Sequence[int], filler: int = 0) -> bytes:
+        '''
+        Sends the concatenation of parts as a single report, padded with filler, without allocating a new report. Parts
+        are usually bytes or memoryviews, and the response is returned as immutable bytes.
+        '''
+        with self._lock:
+            self.flush()
+            self._write_report(parts, filler)
+            return bytes(self._device.read(self._request_size))
+
+    def write_packet(self, *parts: BytesLike | Sequence[int], filler: int = 0):
+        # Like send_packet, for packets whose response isn't used
+        with self._lock:
+            self._write_report(parts, filler)
+            if self.pipelined:
+                self._in_flight.append(bytes(self._report[1:]))
+                if len(self._in_flight) >= self._max_in_flight:
+                    self.flush()
+            else:
+                self._device.read(self._request_size)
+
+    def _write_report(self, parts: Sequence[BytesLike | Sequence[int]], filler: int):
+        report = self._report
+        offset = 1
+        for part in parts:
+            end = offset + len(part)
+            if end > self._request_size + 1:
+                raise ValueError()
+            report[offset:end] = part
+            offset = end
+
+        fillers = self._fillers
+        if filler not in fillers:
+            fillers[filler] = bytes([filler]) * self._request_size
+        report[offset:] = fillers[filler][offset - 1:]
 
-        remaining = self._request_size - len(values) + 1
-        values.extend([filler] * remaining)
+        self._write(report)
 
-        self._device.write(values)
-        result = self._device.read(self._request_size)
-        return result
+    def _write(self, report: bytearray):
+        # hidapi reports write errors, such as the device being unplugged, by returning -1 rather than raising
+        if self._device.write(report) < 0:
+            raise IOError("Failed to write to the device.")
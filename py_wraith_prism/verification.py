@@ -0,0 +1,83 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, List, NamedTuple
+
+
+class Mismatch(NamedTuple):
+    # The channel values that were submitted to a component, and the ones that were read back
+    component: str
+    expected: bytes
+    actual: bytes
+    resent: bool
+
+
+@dataclass
+class VerificationStats:
+    submits: int = 0
+    verified: int = 0
+    over_budget: int = 0
+    reads: int = 0
+    mismatches: int = 0
+    resends: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {"submits": self.submits, "verified": self.verified, "over_budget": self.over_budget,
+                "reads": self.reads, "mismatches": self.mismatches, "resends": self.resends, "seconds": self.seconds}
+
+
+class SubmitVerifier:
+    '''
+    Samples submits to check that their writes took effect, by reading the values of every component that was sent
+    back from the device and comparing them with what was submitted. Each read is a round-trip, so only every
+    sample_every-th submit that sent something is verified, and when budget is set, verification is also skipped while
+    it has taken more than budget seconds per second of wall time (e.g. 0.01 for 10 ms/s).
+
+    Mismatches are counted in stats and passed to on_mismatch. With resend, the component's values are written again
+    and applied.
+
+    Pass one to WraithPrism, or set its verifier attribute. Without one, nothing is read back.
+    '''
+
+    def __init__(self, sample_every: int = 10, budget: float | None = None, resend: bool = False,
+                 on_mismatch: Callable[[Mismatch], None] | None = None):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.budget = budget
+        self.resend = resend
+        self.on_mismatch = on_mismatch
+        self.stats = VerificationStats()
+
+        # The verification time that can still be spent, which grows by budget every second, up to a second's worth
+        self._allowance = budget or 0.0
+        self._refilled_at = time.monotonic()
+
+    def should_verify(self) -> bool:
+        stats = self.stats
+        stats.submits += 1
+        if stats.submits % self.sample_every != 0:
+            return False
+
+        if self.budget is not None:
+            now = time.monotonic()
+            self._allowance = min(self.budget, self._allowance + (now - self._refilled_at) * self.budget)
+            self._refilled_at = now
+            if self._allowance <= 0:
+                stats.over_budget += 1
+                return False
+        return True
+
+    def record(self, reads: int, seconds: float, mismatches: List[Mismatch]):
+        stats = self.stats
+        stats.verified += 1
+        stats.reads += reads
+        stats.seconds += seconds
+        stats.mismatches += len(mismatches)
+        stats.resends += sum(mismatch.resent for mismatch in mismatches)
+        if self.budget is not None:
+            self._allowance -= seconds
+
+        if self.on_mismatch is not None:
+            for mismatch in mismatches:
+                self.on_mismatch(mismatch)
@@ -1,18 +1,103 @@
-from py_wraith_prism.usb.hid_device_manager import HidDeviceManager
+from typing import Callable, TYPE_CHECKING
+
+from py_wraith_prism.usb.hid_device_manager import HidDeviceManager, DEFAULT_ENUMERATION_TTL
 from py_wraith_prism.wraith_prism import WraithPrism
 
+# Like in wraith_prism, the modules of optional features are imported where they're used. The async one imports
+# asyncio, which alone takes longer than opening a device.
+if TYPE_CHECKING:
+    from py_wraith_prism.async_wraith_prism import AsyncWraithPrism
+    from py_wraith_prism.device_snapshot import SnapshotStore
+    from py_wraith_prism.resilient_wraith_prism import ResilientWraithPrism, ReconnectPolicy, ReconnectStats
+    from py_wraith_prism.usb.instrumentation import UsbInstrumentation
+    from py_wraith_prism.wraith_prism_group import WraithPrismGroup
+
 _VENDOR_ID = 0x2516
 _PRODUCT_ID = 0x0051
 _IFACE_NUM = 1
 
 
 class WraithDeviceManager(HidDeviceManager):
-    def __init__(self):
-        super().__init__(_VENDOR_ID, _PRODUCT_ID, _IFACE_NUM)
+    def __init__(self, snapshot_directory: str | None = None, instrumentation: 'UsbInstrumentation | None' = None,
+                 enumeration_ttl: float = DEFAULT_ENUMERATION_TTL):
+        super().__init__(_VENDOR_ID, _PRODUCT_ID, _IFACE_NUM, enumeration_ttl)
+
+        # When set, the transactions of every device that's created are recorded in it
+        self._instrumentation = instrumentation
+
+        # When set, the device state is persisted after every save, and used instead of reading the device on open
+        self._snapshots: 'SnapshotStore | None' = None
+        if snapshot_directory:
+            from py_wraith_prism.device_snapshot import SnapshotStore
+            self._snapshots = SnapshotStore(snapshot_directory)
+
+    def create_device(self, descriptor=None, lazy: bool = False, pipelined: bool = False) -> WraithPrism:
+        if descriptor is None:
+            descriptor = self._find_first_descriptor()
+        device = self._open_device(descriptor)
+
+        if self._snapshots is None:
+            return WraithPrism(device, lazy, pipelined=pipelined, instrumentation=self._instrumentation)
+
+        from py_wraith_prism.device_snapshot import snapshot_key
+        key = snapshot_key(descriptor)
+        snapshot = self._snapshots.load(key)
+        prism = WraithPrism(device, lazy, snapshot, pipelined, self._instrumentation)
+        if snapshot is not None and not prism.used_snapshot:
+            # The device was changed since the snapshot was stored, so it can't be used anymore
+            self._snapshots.invalidate(key)
+        prism.add_save_listener(lambda saved: self._store_snapshot(key, saved))
+        return prism
+
+    def create_resilient_device(self, descriptor=None, lazy: bool = False, pipelined: bool = False,
+                                policy: 'ReconnectPolicy | None' = None,
+                                on_reconnect: 'Callable[[ReconnectStats], None] | None' = None) -> \
+            'ResilientWraithPrism':
+        # Reconnects to the same device, by its path, when it drops off the bus. The policy defaults to
+        # ReconnectPolicy().
+        from py_wraith_prism.resilient_wraith_prism import ResilientWraithPrism, ReconnectPolicy
 
-    def create_device(self, descriptor=None) -> WraithPrism:
+        if policy is None:
+            policy = ReconnectPolicy()
         if descriptor is None:
-            device = self._open_first_device()
+            descriptor = self._find_first_descriptor()
+        prism = self.create_device(descriptor, lazy, pipelined)
+        return ResilientWraithPrism(prism, lambda: self.reopen_device(descriptor), policy, on_reconnect)
+
+    def create_all_devices(self, lazy: bool = False, pipelined: bool = False) -> 'WraithPrismGroup':
+        from py_wraith_prism.wraith_prism_group import WraithPrismGroup
+
+        descriptors = self.list_devices()
+        if not descriptors:
+            raise IOError("Failed to find a matching device.")
+        return WraithPrismGroup.create(
+            [lambda descriptor=descriptor: self.create_device(descriptor, lazy, pipelined)
+             for descriptor in descriptors])
+
+    def _store_snapshot(self, key: str, prism: WraithPrism):
+        snapshot = prism.snapshot()
+        if snapshot is None:
+            # Part of the device state is unknown, so an older snapshot can't be trusted anymore either
+            self._snapshots.invalidate(key)
+        else:
+            self._snapshots.store(key, snapshot)
+
+    def invalidate_snapshot(self, descriptor=None):
+        # Call this when another tool may have changed the device, so the next open reads its state again
+        if self._snapshots is None:
+            return
+        if descriptor is None:
+            self._snapshots.invalidate_all()
         else:
-            device = self._open_device(descriptor)
-        return WraithPrism(device)
+            from py_wraith_prism.device_snapshot import snapshot_key
+            self._snapshots.invalidate(snapshot_key(descriptor))
+
+    async def create_device_async(self, descriptor=None, lazy: bool = False, pipelined: bool = False,
+                                  max_pending: int | None = None) -> 'AsyncWraithPrism':
+        # Opening the device and the constructor handshake both happen on the new device's I/O worker. max_pending
+        # defaults to DEFAULT_MAX_PENDING.
+        from py_wraith_prism.async_wraith_prism import AsyncWraithPrism, DEFAULT_MAX_PENDING
+
+        if max_pending is None:
+            max_pending = DEFAULT_MAX_PENDING
+        return await AsyncWraithPrism.create(lambda: self.create_device(descriptor, lazy, pipelined), max_pending)
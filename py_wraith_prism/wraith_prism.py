@@ -1,57 +1,438 @@
-from contextlib import AbstractContextManager
+import functools
+import threading
+import time
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
 from types import TracebackType
-from typing import Type
+from typing import Any, Type, Iterable, Iterator, Sequence, Callable, List, Tuple, TYPE_CHECKING
 
-from py_wraith_prism.prism_components.components import Components
+from py_wraith_prism.prism_components.components import Components, READ_CHANNEL_MAP, channel_assignment
 from py_wraith_prism.prism_components.enums import Speed, Brightness
 from py_wraith_prism.prism_components.mirage_state import MirageState
 from py_wraith_prism.prism_components.prism_components import PrismLogoComponent, PrismFanComponent, \
     PrismRingComponent, PrismComponent
 from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, \
     PrismRingMode
-from py_wraith_prism.usb.wraith_usb_interface import WraithUsbInterface
-from hid import device as hid_device
+from py_wraith_prism.prism_components.submit_result import SubmitResult
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.save_policy import SavePolicy, SaveStats
+from py_wraith_prism.usb.wraith_usb_interface import WraithUsbInterface, WraithProtocolError
+
+# The modules that only optional features need are imported where they're used, which keeps the cold start of
+# short-lived callers like the wraith-prism command fast
+if TYPE_CHECKING:
+    from hid import device as hid_device
+
+    from py_wraith_prism.device_snapshot import DeviceSnapshot
+    from py_wraith_prism.scene import Scene, CompiledScene
+    from py_wraith_prism.usb.instrumentation import UsbInstrumentation
+    from py_wraith_prism.verification import SubmitVerifier
 
 SECONDS_PER_MILLISECOND = 1 / 1000
 
+_POWER_ON = bytes([0x41, 0x80])
+_POWER_OFF = bytes([0x41, 0x03])
+_RESTORE = bytes([0x50])
+_SAVE = bytes([0x50, 0x55])
+_APPLY = bytes([0x51, 0x28, 0, 0, 0xE0])
+_READ_ENSO = bytes([0x52, 0x96])
+_ENSO_ON = bytes([0x51, 0x96, 0, 0, 0x10])
+_ENSO_OFF = bytes([0x51, 0x96])
+_REQUEST_FIRMWARE_VERSION = bytes([0x12, 0x20])
+
+
+def _traced(method):
+    # Groups the HID transactions of a public method into a span when instrumentation is enabled
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self._usb.instrumentation
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+        with instrumentation.span(name):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@dataclass
+class Batch:
+    '''
+    The operations that were deferred by WraithPrism.batch(). Once the batch has been sent, skipped is the number of
+    HID transactions that were skipped, like the submit methods return.
+    '''
+    components: List[PrismComponent] = field(default_factory=list)
+    forced_components: List[PrismComponent] = field(default_factory=list)
+    force_channels: bool = False
+    apply: bool = False
+    save: bool = False
+    force_save: bool = False
+    enso: bool | None = None
+    skipped: int = 0
+    depth: int = 0
+
+    def add_components(self, components: Iterable[PrismComponent], force: bool):
+        for component in components:
+            if component not in self.components:
+                self.components.append(component)
+            if force and component not in self.forced_components:
+                self.forced_components.append(component)
+        self.force_channels |= force
+
 
 class WraithPrism(AbstractContextManager):
-    def __init__(self, device: hid_device):
-        self._usb = WraithUsbInterface(device)
-
-        # Power on
-        self.power_on()
-        self._restore()
-        self.apply()
-
-        # Request channel data
-        data = self._usb.send_bytes([0x52, 0xA0, 1, 0, 0, 3])
-        self._components = Components(self._usb, data)
-
-    def submit_component(self, component: PrismComponent):
-        component.submit_values()
-        self._assign_channels()
-        self.apply()
-
-    def submit_components(self, *argv):
-        for component in argv:
-            component.submit_values()
-        if any(argv):
-            self._assign_channels()
-            self.apply()
-
-    def submit_all_components(self):
+    def __init__(self, device: 'hid_device', lazy: bool = False, snapshot: 'DeviceSnapshot | None' = None,
+                 pipelined: bool = False, instrumentation: 'UsbInstrumentation | None' = None,
+                 verifier: 'SubmitVerifier | None' = None, save_policy: SavePolicy = SavePolicy()):
+        # When pipelined, writes don't wait for their acknowledgements. See WraithUsbInterface for details.
+        self._usb = WraithUsbInterface(device, pipelined=pipelined, instrumentation=instrumentation)
+        self._usb.on_protocol_error = self._on_protocol_error
+        # When set, a sample of the submits is read back from the device. See SubmitVerifier for details.
+        self.verifier = verifier
+        self._components: Components | None = None
+        self._assigned_channels: Sequence[int] | None = None
+        self._firmware_version: str | None = None
+        self._enso: bool | None = None
+        self._save_listeners: List[Callable[[WraithPrism], None]] = []
+        self._batch: Batch | None = None
+        # The Transition of the fade that was started last
+        self._transition = None
+
+        # Saves are skipped or coalesced as set by the policy. See SavePolicy for details.
+        self.save_policy = save_policy
+        self.save_stats = SaveStats()
+        self._save_lock = threading.RLock()
+        self._save_timer: threading.Timer | None = None
+        # Whether anything was written since the device's state was last saved or restored. When attaching without a
+        # restore, whatever the device shows may not have been saved.
+        self._unsaved_writes = True
+        # Whether the snapshot that was passed matched the device, and was used instead of reading its state
+        self.used_snapshot = False
+
+        if not lazy:
+            # Power on. The handshake uses the untraced internals, so its transactions are recorded without a span.
+            self._usb.write_packet(_POWER_ON)
+            self._restore()
+            self._apply()
+
+        if snapshot is not None:
+            # Reading the channel map and the enso flag doubles as a cheap check that the device still matches the
+            # snapshot
+            data = self._usb.send_packet(READ_CHANNEL_MAP)
+            enso = self._read_enso()
+            if snapshot.matches_channel_map(data) and snapshot.enso in (None, enso):
+                self._components = Components(self._usb, data, lazy=True)
+                self._components.load_snapshot(snapshot)
+                self._firmware_version = snapshot.firmware_version
+                self._assigned_channels = self._channel_assignment
+                self.used_snapshot = True
+                return
+        elif lazy:
+            # Attach to the device as it is, and only read component state from it when it's first needed. Setting
+            # every value of the logo or fan before submitting it doesn't require any reads.
+            self._components = Components(self._usb, None, lazy=True)
+            return
+        else:
+            # Request channel data
+            data = self._usb.send_packet(READ_CHANNEL_MAP)
+
+        self._components = Components(self._usb, data, lazy=lazy)
+        if not lazy and list(data[8:25]) == self._channel_assignment[8:]:
+            self._assigned_channels = self._channel_assignment
+
+    @_traced
+    def load(self):
+        # Reads any component state that hasn't been read from the device yet
+        self._components.load()
+
+    # The submit methods only send the packets whose bytes differ from what was last written to the device, and return
+    # the number of HID transactions that were skipped. Use force=True to send everything regardless.
+    @_traced
+    def submit_component(self, component: PrismComponent, force: bool = False) -> int:
+        return self._submit([component], force)
+
+    @_traced
+    def submit_components(self, *argv, force: bool = False) -> int:
+        return self._submit(argv, force)
+
+    @_traced
+    def submit_all_components(self, force: bool = False) -> int:
+        return self._submit(self._components, force)
+
+    def _submit(self, components: Iterable[PrismComponent], force: bool) -> int:
+        if self._batch is not None:
+            self._batch.add_components(components, force)
+            return 0
+
+        return self._submit_now(components, force, False).skipped
+
+    def _submit_now(self, components: Iterable[PrismComponent], force: bool, apply: bool,
+                    forced_components: Sequence[PrismComponent] = (), force_channels: bool = False) -> SubmitResult:
+        self._components.fetch_channel_map_for_assignment()
+        result = SubmitResult()
+        # The components whose channel values were written, and the values
+        written = []
+        for component in components:
+            component_force = force or component in forced_components
+            result += component._submit_extra_values(component_force)
+            values_result = component._write_values(component._byte_values, component_force)
+            if values_result.sent > 0:
+                written.append((component, component._submitted_byte_values))
+            result += values_result
+        return self._finish_submit(result, written, force or force_channels, apply)
+
+    def _finish_submit(self, result: SubmitResult, written: List[Tuple[PrismComponent, bytes]], force_channels: bool,
+                       apply: bool) -> SubmitResult:
+        if result.sent > 0:
+            self._unsaved_writes = True
+        result = self._assign_and_apply(result, force_channels, apply)
+
+        if self.verifier is not None and written and self.verifier.should_verify():
+            self._verify(written)
+        return result
+
+    @_traced
+    def apply_scene(self, scene: 'Scene', force: bool = False) -> int:
+        '''
+        Sets every component to the settings of a scene, and sends the packets it was compiled into, skipping the ones
+        that match what was last written to the device, like a submit. Inside a batch, the components are submitted
+        when it's sent instead. Returns the number of HID transactions that were skipped.
+        '''
+        if self._batch is None:
+            # A scene always sets the ring's mode
+            self._components.fetch_channel_map_for_assignment(ring_set=True)
+        compiled = scene.compile(self.logo.channel, self.fan.channel)
+        self._assign_scene(compiled)
+        if self._batch is not None:
+            if compiled.enso is not None:
+                self._batch.enso = compiled.enso
+            self._batch.add_components(self._components, force)
+            return 0
+
+        if compiled.enso is not None and compiled.enso != self._enso:
+            self._set_enso(compiled.enso, save=False)
+        return self._submit_scene(compiled, force).skipped
+
+    def _assign_scene(self, compiled: 'CompiledScene'):
+        from py_wraith_prism.component_state import component_name
+
         for component in self._components:
-            component.submit_values()
-        self._assign_channels()
-        self.apply()
+            for name, value in compiled.attributes[component_name(component)]:
+                setattr(component, name, value)
+        # The morse text was encoded when the scene was compiled
+        self.ring._cached_morse_bytes = compiled.morse_bytes
+
+    def _submit_scene(self, compiled: 'CompiledScene', force: bool) -> SubmitResult:
+        # In the same order as submit_all_components()
+        logo, fan, ring = self._components
+        logo_result = logo._write_values(compiled.logo_values, force)
+        mirage_result = fan._write_mirage_bytes(compiled.mirage_bytes, force)
+        fan_result = fan._write_values(compiled.fan_values, force)
+        if compiled.sends_morse:
+            morse_result = ring._write_morse_chunks(compiled.morse_chunks, force)
+        else:
+            morse_result = SubmitResult(skipped=len(compiled.morse_chunks))
+        ring_result = ring._write_values(compiled.ring_values, force)
+
+        values = ((logo, compiled.logo_values, logo_result), (fan, compiled.fan_values, fan_result),
+                  (ring, compiled.ring_values, ring_result))
+        written = [(component, byte_values) for component, byte_values, values_result in values
+                   if values_result.sent > 0]
+        result = logo_result + mirage_result + fan_result + morse_result + ring_result
+        return self._finish_submit(result, written, force, False)
+
+    def _verify(self, written: List[Tuple[PrismComponent, bytes]]):
+        from py_wraith_prism.component_state import component_name
+        from py_wraith_prism.verification import Mismatch
+
+        # Only the channel values are read back, so only the components whose channel values were written are verified
+        start = time.perf_counter()
+        mismatches = []
+        for component, expected in written:
+            actual = component.read_written_values(expected)
+            if actual == expected:
+                continue
 
-    def save(self):
-        self._usb.send_bytes([0x50, 0x55])
+            resent = self.verifier.resend
+            if resent:
+                component._write_values(expected, True)
+            mismatches.append(Mismatch(component_name(component), expected, actual, resent))
+
+        if any(mismatch.resent for mismatch in mismatches):
+            self._apply()
+        self.verifier.record(len(written), time.perf_counter() - start, mismatches)
+
+    def _assign_and_apply(self, result: SubmitResult, force: bool, apply: bool) -> SubmitResult:
+        if result.sent > 0:
+            if not self._components.channel_map_known:
+                # Lazily attached, and the ring wasn't set: the device's channel map is left as it is, rather than
+                # read to work out the ring's channel
+                result += SubmitResult(skipped=1)
+            elif force or self._channel_assignment != self._assigned_channels:
+                self._assign_channels()
+            else:
+                result += SubmitResult(skipped=1)
+            self._apply()
+        elif apply:
+            self._apply()
+        elif result.skipped > 0:
+            # Nothing changed, so the channel assignment and apply packets aren't needed either
+            result += SubmitResult(skipped=2)
+        return result
+
+    @contextmanager
+    def batch(self) -> Iterator[Batch]:
+        '''
+        Defers the submits, applies, saves and enso changes made inside the block, and sends them when it exits: enso
+        first, then the values of each submitted component once, a single channel assignment and apply, and at most
+        one save. Submits return 0 inside a batch, and the number of skipped transactions is set on the batch instead.
+
+        A batch inside another one is part of the outer batch, and nothing is sent until the outermost one exits. If
+        the outermost block raises, every deferred operation is discarded and the device isn't touched. Component
+        attributes keep the values they were set to, so they are sent by the next submit.
+        '''
+        batch = self._batch
+        if batch is None:
+            batch = self._batch = Batch()
+        batch.depth += 1
+        try:
+            yield batch
+        finally:
+            batch.depth -= 1
+            if batch.depth == 0:
+                self._batch = None
+
+        if batch.depth == 0:
+            self.send_batch(batch)
+
+    def send_batch(self, batch: Batch):
+        # Sends the deferred operations of a batch as its block does when it exits, e.g. to send it again after the
+        # device was reconnected
+        instrumentation = self._usb.instrumentation
+        with instrumentation.span("batch") if instrumentation is not None else nullcontext():
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: Batch):
+        save = batch.save
+        if batch.enso is not None:
+            # Turning enso on saves, which the batch's own save can take care of
+            self._set_enso(batch.enso, save=not save)
+
+        # Only the components that were submitted with force are resent, but any of them forces the channel assignment
+        batch.skipped = self._submit_now(batch.components, False, batch.apply, batch.forced_components,
+                                         batch.force_channels).skipped
+
+        if save:
+            self._request_save(batch.force_save)
+
+    @_traced
+    def save(self, force: bool = False):
+        # Use force=True to commit to the device's flash right away, regardless of the save policy
+        if self._batch is not None:
+            self._batch.save = True
+            self._batch.force_save |= force
+            return
+        self._request_save(force)
+
+    def _request_save(self, force: bool):
+        policy = self.save_policy
+        stats = self.save_stats
+        with self._save_lock:
+            stats.requested += 1
+
+            if self._save_timer is not None:
+                if not force:
+                    # The pending commit saves this as well
+                    stats.coalesced += 1
+                    return
+                self._save_timer.cancel()
+                self._save_timer = None
+                stats.coalesced += 1
+            elif not force:
+                if policy.skip_unchanged and not self._unsaved_writes:
+                    stats.skipped_unchanged += 1
+                    return
+                if policy.debounce > 0:
+                    self._save_timer = threading.Timer(policy.debounce, self._commit_pending_save)
+                    self._save_timer.daemon = True
+                    self._save_timer.start()
+                    return
+            self._commit()
+
+    def _commit_pending_save(self):
+        # Called on the timer's thread
+        with self._save_lock:
+            if self._save_timer is not threading.current_thread():
+                # The commit was made or cancelled in the meantime
+                return
+            self._save_timer = None
+            try:
+                self._commit()
+            except Exception:
+                import logging
+                logging.getLogger(__name__).exception("Failed to save")
+
+    def _commit(self):
+        # Cleared first, so a write made while the save is in flight isn't taken for a saved one
+        self._unsaved_writes = False
+        try:
+            self._usb.write_packet(_SAVE)
+        except BaseException:
+            self._unsaved_writes = True
+            raise
+        # Only what was committed counts as saved
         self._components.save()
+        self.save_stats.committed += 1
+        for listener in self._save_listeners:
+            # The save was already made, so a listener that fails doesn't fail it
+            try:
+                listener(self)
+            except Exception:
+                import logging
+                logging.getLogger(__name__).exception("A save listener failed")
+
+    @_traced
+    def flush_save(self):
+        # Makes a commit that's waiting for the debounce window to end right away
+        with self._save_lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+            self._commit()
+
+    def add_save_listener(self, listener: Callable[['WraithPrism'], None]):
+        # With a debounce window, listeners are called on the timer's thread
+        self._save_listeners.append(listener)
+
+    def snapshot(self) -> 'DeviceSnapshot | None':
+        # The state that was last written to the device, or None if any of it is unknown
+        channel_values = self._components.submitted_values()
+        morse_bytes = self._components.submitted_morse_bytes()
+        if self._assigned_channels is None or channel_values is None or morse_bytes is None:
+            return None
+
+        from py_wraith_prism.device_snapshot import DeviceSnapshot
+        return DeviceSnapshot(channel_map=self._assigned_channels[8:11], channel_values=channel_values,
+                              morse_bytes=morse_bytes, firmware_version=self._firmware_version, enso=self._enso)
 
     def _restore(self):
-        self._usb.send_bytes([0x50])
+        self._usb.write_packet(_RESTORE)
+        self._unsaved_writes = False
+        self._invalidate_submitted_values()
+
+    def _on_protocol_error(self, _: WraithProtocolError):
+        # A pipelined write wasn't acknowledged, so what the device holds is unknown until everything is sent again
+        self._unsaved_writes = True
+        self._enso = None
+        self._invalidate_submitted_values()
+
+    def _invalidate_submitted_values(self):
+        self._assigned_channels = None
+        # Components are constructed after the initial power on and restore
+        if self._components is not None:
+            self._components.invalidate_submitted_values()
 
     @property
     def logo(self) -> PrismLogoComponent:
@@ -70,29 +451,104 @@ class WraithPrism(AbstractContextManager):
         return self._components.has_unsaved_changes
 
     @property
+    @_traced
     def enso(self) -> bool:
-        return self._usb.send_bytes([0x52, 0x96])[4] == 0x10
+        # Read from the device every time, since another tool may have changed it
+        if self._batch is not None and self._batch.enso is not None:
+            return self._batch.enso
+        return self._read_enso()
+
+    def _read_enso(self) -> bool:
+        self._enso = self._usb.send_packet(_READ_ENSO)[4] == 0x10
+        return self._enso
 
     @enso.setter
+    @_traced
     def enso(self, value: bool):
+        if self._batch is not None:
+            # Only the last value is sent
+            self._batch.enso = value
+            return
+        self._set_enso(value, save=True)
+
+    def _set_enso(self, value: bool, save: bool):
         if value:
-            self._usb.send_bytes([0x51, 0x96, 0, 0, 0x10])
-            self.save()
+            self._usb.write_packet(_ENSO_ON)
+            self._enso = True
+            self._unsaved_writes = True
+            if save:
+                self._request_save(False)
         else:
-            self._usb.send_bytes([0x51, 0x96])
+            self._usb.write_packet(_ENSO_OFF)
+            self._enso = False
+            self._unsaved_writes = True
+        # Toggling enso changes what the device displays, so the next submit has to resend everything
+        self._invalidate_submitted_values()
+
+    def fade(self, logo: RGB | Any = None, fan: RGB | Any = None, ring: RGB | Any = None, duration: float = 0.5,
+             easing: str | Callable[[float], float] = "ease-in-out", space: str = "oklab", wait: bool = False):
+        '''
+        Fades the given components from their current colours to new ones, in their static modes, on a background
+        thread, and returns its Transition. easing is one of transition.EASINGS or a function of the elapsed fraction
+        of the duration, and space is the colour space the colours are interpolated in (srgb, linear or oklab). A fade
+        that's still running is cancelled first, and the new one starts from the colours it got to. The zones it was
+        fading that aren't given keep fading to its targets. Use wait=True, or wait() on the returned Transition, to
+        block until it has finished.
+
+        The fade owns the device while it's running, like a FrameStreamer.
+        '''
+        # Imported here, since transitions stream their frames through this class
+        from py_wraith_prism.transition import Transition
+
+        if self._batch is not None:
+            raise ValueError("Fades can't be part of a batch")
+        targets = {"logo": logo, "fan": fan, "ring": ring}
+        previous = self._transition
+        self.cancel_fade()
+        if previous is not None and previous.cancelled:
+            # Otherwise, the zones that only the cancelled fade changed would be left halfway
+            for name, target in previous.targets.items():
+                if targets[name] is None:
+                    targets[name] = target
+        transition = self._transition = Transition(self, duration, easing, space, **targets)
+        transition.start()
+        if wait:
+            transition.wait()
+        return transition
+
+    def cancel_fade(self):
+        # Stops the fade that's running, if any, leaving the colours where it got to
+        transition, self._transition = self._transition, None
+        if transition is not None:
+            transition.cancel()
+
+    @property
+    def _channel_assignment(self) -> Sequence[int]:
+        return channel_assignment(self.logo.channel, self.fan.channel, self.ring.channel)
 
     def _assign_channels(self):
-        pkt = [0x51, 0xA0, 1, 0, 0, 3, 0, 0, self.logo.channel, self.fan.channel] + [self.ring.channel] * 15
-        self._usb.send_bytes(pkt)
+        pkt = self._channel_assignment
+        self._usb.write_packet(pkt)
+        self._assigned_channels = pkt
 
+    @_traced
     def apply(self):
-        self._usb.send_bytes([0x51, 0x28, 0, 0, 0xE0])
+        if self._batch is not None:
+            self._batch.apply = True
+            return
+        self._apply()
+
+    def _apply(self):
+        self._usb.write_packet(_APPLY)
 
+    @_traced
     def request_firmware_version(self) -> str:
-        response = self._usb.send_bytes([0x12, 0x20])
-        version = bytes(filter(lambda b: b != 0, response[8:34])).decode().lower()
-        return version
+        if self._firmware_version is None:
+            response = self._usb.send_packet(_REQUEST_FIRMWARE_VERSION)
+            self._firmware_version = response[8:34].replace(b"\0", b"").decode().lower()
+        return self._firmware_version
 
+    @_traced
     def reset_to_default(self):
         self.enso = False
 
@@ -103,21 +559,49 @@ class WraithPrism(AbstractContextManager):
         self.fan.brightness = self.logo.brightness = self.ring.brightness = Brightness.High
         self.fan.mirage_state = MirageState.Default
 
-        for component in self._components:
-            component.submit_values()
-
-        self._assign_channels()
-        self.apply()
+        self._submit(self._components, force=True)
 
     def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
                  __traceback: TracebackType or None) -> bool or None:
-        return self._usb.__exit__(__exc_type, __exc_value, __traceback)
+        self.close()
+        return None
 
+    @_traced
+    def flush(self):
+        # Waits for every pipelined write to be acknowledged, raising WraithProtocolError if one of them failed
+        self._usb.flush()
+
+    @_traced
     def power_on(self):
-        self._usb.send_bytes([0x41, 0x80])
+        self._usb.write_packet(_POWER_ON)
+        self._invalidate_submitted_values()
 
+    @_traced
     def power_off(self):
-        self._usb.send_bytes([0x41, 0x03])
+        self._usb.write_packet(_POWER_OFF)
+
+    @_traced
+    def reconnect(self, device: 'hid_device'):
+        '''
+        Switches to a newly opened handle of the same device, after the old one stopped working (e.g. a USB reset), and
+        writes the state that was last submitted back to it in a single burst: power on, enso, the values of each
+        component, the channel assignment and apply. Component attributes that haven't been submitted are kept, and
+        are sent by the next submit as usual.
+        '''
+        self._usb.replace_device(device)
+        self._usb.write_packet(_POWER_ON)
+        if self._enso is not None:
+            self._usb.write_packet(_ENSO_ON if self._enso else _ENSO_OFF)
+        self._components.resend_submitted_values()
+        if self._assigned_channels is not None:
+            self._usb.write_packet(self._assigned_channels)
+        self._apply()
+        self._usb.flush()
 
+    @_traced
     def close(self):
-        self._usb.close()
+        self.cancel_fade()
+        try:
+            self.flush_save()
+        finally:
+            self._usb.close()
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import AbstractContextManager
+from types import TracebackType
+from typing import Callable, List, Sequence, Type, TypeVar, Dict
+
+from py_wraith_prism.scene import Scene
+from py_wraith_prism.wraith_prism import WraithPrism
+
+T = TypeVar("T")
+
+
+class GroupOperationError(Exception):
+    '''
+    Raised when an operation failed on some of the devices in a group. results holds the results of the devices that
+    succeeded (None for the ones that failed), and errors maps the index of each failed device to its exception.
+    '''
+
+    def __init__(self, results: List, errors: Dict[int, BaseException]):
+        super().__init__(f"The operation failed on {len(errors)} of {len(results)} devices: "
+                         + ", ".join(f"#{index}: {error!r}" for index, error in errors.items()))
+        self.results = results
+        self.errors = errors
+
+
+def _run_all(executors: Sequence[ThreadPoolExecutor], operations: Sequence[Callable[[], T]]) -> List[T]:
+    futures: List[Future] = [executor.submit(operation) for executor, operation in zip(executors, operations)]
+
+    results = []
+    errors = {}
+    for index, future in enumerate(futures):
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(None)
+            errors[index] = e
+
+    if errors:
+        raise GroupOperationError(results, errors)
+    return results
+
+
+class WraithPrismGroup(AbstractContextManager, Sequence[WraithPrism]):
+    '''
+    A set of devices that are controlled together. Every device has its own I/O worker thread, so broadcast operations
+    run on all devices concurrently and take about as long as the slowest device. Operations on the same device run in
+    the order they were broadcast.
+    '''
+
+    def __init__(self, prisms: Sequence[WraithPrism], executors: Sequence[ThreadPoolExecutor] | None = None):
+        self._prisms = list(prisms)
+        if executors is None:
+            executors = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"wraith-prism-{index}")
+                         for index in range(len(self._prisms))]
+        self._executors = list(executors)
+
+    @classmethod
+    def create(cls, factories: Sequence[Callable[[], WraithPrism]]) -> 'WraithPrismGroup':
+        # Every device is opened (and runs its constructor handshake) on its own worker
+        executors = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"wraith-prism-{index}")
+                     for index in range(len(factories))]
+        try:
+            prisms = _run_all(executors, factories)
+        except GroupOperationError as e:
+            for prism in e.results:
+                if prism is not None:
+                    prism.close()
+            for executor in executors:
+                executor.shutdown(wait=False)
+            raise
+        return cls(prisms, executors)
+
+    def __getitem__(self, index):
+        return self._prisms[index]
+
+    def __len__(self):
+        return len(self._prisms)
+
+    def broadcast(self, operation: Callable[[WraithPrism], T]) -> List[T]:
+        # Runs the operation on every device concurrently, and returns the results in device order
+        return _run_all(self._executors, [lambda prism=prism: operation(prism) for prism in self._prisms])
+
+    def submit_all_components(self, force: bool = False) -> List[int]:
+        return self.broadcast(lambda prism: prism.submit_all_components(force))
+
+    def apply_scene(self, scene: Scene, force: bool = False) -> List[int]:
+        return self.broadcast(lambda prism: prism.apply_scene(scene, force))
+
+    def save(self):
+        self.broadcast(WraithPrism.save)
+
+    def apply(self):
+        self.broadcast(WraithPrism.apply)
+
+    def flush(self):
+        self.broadcast(WraithPrism.flush)
+
+    def set_enso(self, value: bool):
+        self.broadcast(lambda prism: setattr(prism, "enso", value))
+
+    def request_firmware_versions(self) -> List[str]:
+        return self.broadcast(WraithPrism.request_firmware_version)
+
+    def reset_to_default(self):
+        self.broadcast(WraithPrism.reset_to_default)
+
+    def power_on(self):
+        self.broadcast(WraithPrism.power_on)
+
+    def power_off(self):
+        self.broadcast(WraithPrism.power_off)
+
+    def close(self):
+        try:
+            self.broadcast(WraithPrism.close)
+        finally:
+            for executor in self._executors:
+                executor.shutdown(wait=True)
+
+    def __exit__(self, __exc_type: Type[BaseException] or None, __exc_value: BaseException or None,
+                 __traceback: TracebackType or None) -> bool or None:
+        self.close()
+        return None
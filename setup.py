@@ -22,6 +22,11 @@ setup(
     install_requires=RUNTIME_PACKAGES,
     setup_requires=RUNTIME_PACKAGES + SETUP_PACKAGES,
     extras_require=EXTRA_PACKAGES,
+    entry_points={
+        'console_scripts': [
+            'wraith-prism=py_wraith_prism.cli:main',
+        ],
+    },
     url='https://github.com/dfraska/PyWraithPrism/',
     license='MIT',
     author='David Fraska',
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import unittest
+
+from py_wraith_prism.async_wraith_prism import AsyncWraithPrism
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class AsyncWraithPrismTest(unittest.TestCase):
+    def test_operations_run_in_order(self):
+        device = EmulatedWraithPrismDevice()
+
+        async def run():
+            async with await AsyncWraithPrism.create(lambda: WraithPrism(device)) as prism:
+                prism.logo.mode = BasicPrismMode.Static
+                prism.logo.color = "#0000ff"
+                await prism.submit_component(prism.logo)
+                await prism.save()
+
+        asyncio.run(run())
+        self.assertEqual(bytes(device.saved_state.channels[0x05][6:9]), bytes([0, 0, 0xFF]))
+
+    def test_cancelled_create_closes_the_device(self):
+        device = EmulatedWraithPrismDevice()
+        started = threading.Event()
+        release = threading.Event()
+
+        def factory():
+            started.set()
+            release.wait()
+            return WraithPrism(device)
+
+        async def run():
+            task = asyncio.create_task(AsyncWraithPrism.create(factory))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        closed = threading.Event()
+        original_close = device.close
+
+        def close():
+            original_close()
+            closed.set()
+
+        device.close = close
+        release.set()
+        self.assertTrue(closed.wait(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class RecordingDevice(EmulatedWraithPrismDevice):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def write(self, buff) -> int:
+        self.requests.append(bytes(buff[1:3]).hex())
+        return super().write(buff)
+
+
+class BatchTest(unittest.TestCase):
+    def setUp(self):
+        self.device = RecordingDevice()
+        self.prism = WraithPrism(self.device)
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.ring.mode = PrismRingMode.Morse
+        self.prism.ring.morse_text = "sos"
+        self.prism.submit_all_components()
+        self.device.requests = []
+
+    def test_operations_are_sent_once_on_exit(self):
+        with self.prism.batch():
+            self.prism.logo.color = "#00ff00"
+            self.prism.submit_component(self.prism.logo)
+            self.prism.apply()
+            with self.prism.batch():
+                self.prism.fan.mode = BasicPrismMode.Static
+                self.prism.submit_all_components()
+                self.prism.save()
+            self.assertEqual(self.device.requests, [])
+
+        # The logo and fan values, a single apply and save
+        self.assertEqual(self.device.requests, ["512c", "512c", "5128", "5055"])
+
+    def test_force_only_resends_the_forced_components(self):
+        with self.prism.batch():
+            self.prism.submit_component(self.prism.fan, force=True)
+            self.prism.submit_all_components()
+
+        # The fan's mirage state and values, and the channel assignment that force resends
+        self.assertEqual(self.device.requests, ["5171", "512c", "51a0", "5128"])
+
+    def test_nothing_is_sent_if_the_block_raises(self):
+        with self.assertRaises(KeyError):
+            with self.prism.batch():
+                self.prism.logo.color = "#00ff00"
+                self.prism.submit_component(self.prism.logo)
+                self.prism.save()
+                raise KeyError()
+
+        self.assertEqual(self.device.requests, [])
+        self.assertEqual(self.prism.submit_component(self.prism.logo), 1)
+        self.assertEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+from py_wraith_prism import cli, daemon
+from py_wraith_prism.usb import emulated_device
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class RecordingDevice(emulated_device.EmulatedWraithPrismDevice):
+    # Every device the command line opens, with the requests written to it
+    opened = []
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+        RecordingDevice.opened.append(self)
+
+    def write(self, buff) -> int:
+        self.requests.append(bytes(buff[1:3]).hex())
+        return super().write(buff)
+
+
+class FakeClient(WraithPrism):
+    # Stands in for a daemon client, on an emulated device
+    socket_paths = []
+
+    def __init__(self, socket_path: str | None = None):
+        FakeClient.socket_paths.append(socket_path)
+        super().__init__(emulated_device.EmulatedWraithPrismDevice(), lazy=True)
+
+
+class CommandLineTest(unittest.TestCase):
+    def _run(self, *argv: str):
+        RecordingDevice.opened = []
+        stderr = io.StringIO()
+        with mock.patch.object(emulated_device, "EmulatedWraithPrismDevice", RecordingDevice), \
+                contextlib.redirect_stderr(stderr):
+            code = cli.main(["--emulated", *argv])
+        requests = RecordingDevice.opened[0].requests if RecordingDevice.opened else []
+        return code, requests, stderr.getvalue()
+
+    def test_save_only_commits(self):
+        self.assertEqual(self._run("save"), (0, ["5055"], ""))
+
+    def test_setting_a_component_doesnt_read(self):
+        self.assertEqual(self._run("logo", "static", "#ff0000", "--save"), (0, ["512c", "5128", "5055"], ""))
+
+    def test_daemon_options_before_a_command(self):
+        for argv, socket_path in ((["--daemon"], None), (["--socket", "/tmp/prism.sock"], "/tmp/prism.sock")):
+            FakeClient.socket_paths = []
+            with mock.patch.object(daemon, "WraithPrismClient", FakeClient):
+                self.assertEqual(cli.main([*argv, "ring", "static", "#ff0000"]), 0)
+            self.assertEqual(FakeClient.socket_paths, [socket_path])
+
+    def test_invalid_morse_text_is_an_error(self):
+        code, requests, error = self._run("ring", "morse", "--text", "sos%")
+        self.assertEqual(code, 1)
+        self.assertEqual(requests, [])
+        self.assertIn("'%'", error)
+
+
+if __name__ == '__main__':
+    unittest.main()
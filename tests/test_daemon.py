@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from py_wraith_prism.daemon import WraithPrismDaemon, WraithPrismClient, DaemonError
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class FailingDevice(EmulatedWraithPrismDevice):
+    # Fails every write while failing is set, as hidapi does when the device stops responding
+    def __init__(self):
+        super().__init__()
+        self.failing = False
+
+    def write(self, buff) -> int:
+        if self.failing:
+            return -1
+        return super().write(buff)
+
+
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.device = FailingDevice()
+        self.daemon = WraithPrismDaemon(WraithPrism(self.device), os.path.join(self.directory.name, "test.sock"))
+        self.daemon.start()
+        self.first = WraithPrismClient(self.daemon.socket_path)
+        self.second = WraithPrismClient(self.daemon.socket_path)
+
+    def tearDown(self):
+        self.first.close()
+        self.second.close()
+        self.daemon.close()
+        self.directory.cleanup()
+
+    def _set_logo(self, client: WraithPrismClient, color: str):
+        client.logo.mode = BasicPrismMode.Static
+        client.logo.color = color
+        client.submit_component(client.logo)
+
+    def test_clients_see_each_others_changes(self):
+        self.assertEqual(self.first.logo.mode, BasicPrismMode.Cycle)
+        self._set_logo(self.second, "#00ff00")
+
+        self.assertEqual(self.first.logo.mode, BasicPrismMode.Static)
+        self.assertEqual(self.first.logo.color.hex_l, "#00ff00")
+
+    def test_failed_write_is_reported_to_the_client_that_made_it(self):
+        self.device.failing = True
+        self._set_logo(self.first, "#00ff00")
+
+        self.second.flush()
+        with self.assertRaises(DaemonError):
+            self.first.flush()
+        # The update is still queued
+        self.assertEqual(self.second.logo.color.hex_l, "#00ff00")
+
+        self.device.failing = False
+        self.first.flush()
+        self.assertEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import threading
+import unittest
+from unittest import mock
+
+from py_wraith_prism.usb import hid_device_manager, hotplug
+from py_wraith_prism.usb.hid_device_manager import HidDeviceManager
+from py_wraith_prism.usb.hotplug import HotplugWatcher
+
+VENDOR_ID = 0x2516
+PRODUCT_ID = 0x0051
+
+
+def _descriptor(path: bytes, interface_number: int = 1) -> dict:
+    return {"path": path, "vendor_id": VENDOR_ID, "product_id": PRODUCT_ID, "interface_number": interface_number,
+            "serial_number": path.decode()}
+
+
+class FakeBus:
+    # Stands in for hid.enumerate(), with the devices that are plugged in
+    def __init__(self, *descriptors: dict):
+        self.descriptors = list(descriptors)
+        self.scans = 0
+
+    def enumerate(self, vendor_id: int = 0, product_id: int = 0):
+        self.scans += 1
+        return [d for d in self.descriptors if (d["vendor_id"], d["product_id"]) == (vendor_id, product_id)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class EnumerationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus(_descriptor(b"1-1"), _descriptor(b"1-1:0", interface_number=0))
+        self.clock = FakeClock()
+        for patch in (mock.patch.object(hid_device_manager.hid, "enumerate", self.bus.enumerate),
+                      mock.patch.object(hid_device_manager.time, "monotonic", self.clock)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.manager = HidDeviceManager(VENDOR_ID, PRODUCT_ID, 1, enumeration_ttl=2.0)
+
+    def test_results_are_reused_until_they_expire(self):
+        self.assertEqual([d["path"] for d in self.manager.list_devices()], [b"1-1"])
+        self.clock.now += 1.9
+        self.manager.list_devices()
+        self.assertEqual(self.bus.scans, 1)
+
+        self.bus.descriptors.append(_descriptor(b"1-2"))
+        self.clock.now += 0.2
+        self.assertEqual([d["path"] for d in self.manager.list_devices()], [b"1-1", b"1-2"])
+        self.assertEqual(self.bus.scans, 2)
+
+    def test_no_devices_isnt_cached(self):
+        self.bus.descriptors = []
+        self.assertEqual(self.manager.list_devices(), [])
+        self.bus.descriptors.append(_descriptor(b"1-1"))
+
+        self.assertEqual(len(self.manager.list_devices()), 1)
+        self.assertEqual(self.bus.scans, 2)
+
+    def test_invalidating_scans_again(self):
+        self.manager.list_devices()
+        self.bus.descriptors = []
+        self.manager.invalidate_enumeration()
+
+        self.assertEqual(self.manager.list_devices(), [])
+        self.assertEqual(self.bus.scans, 2)
+
+
+class HotplugWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.bus = FakeBus(_descriptor(b"1-1"))
+        # The polling fallback, with the hidraw nodes a device adds
+        self.nodes = frozenset({"hidraw0"})
+        for patch in (mock.patch.object(hid_device_manager.hid, "enumerate", self.bus.enumerate),
+                      mock.patch.object(hotplug, "_open_uevent_socket", lambda: None),
+                      mock.patch.object(hotplug, "_hidraw_nodes", lambda: self.nodes)):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.events = []
+        self.changed = threading.Event()
+        self.manager = HidDeviceManager(VENDOR_ID, PRODUCT_ID, 1)
+
+    def _record(self, kind: str):
+        def callback(descriptor: dict):
+            self.events.append((kind, descriptor["path"]))
+            self.changed.set()
+        return callback
+
+    def _watch(self) -> HotplugWatcher:
+        watcher = self.manager.watch(self._record("connect"), self._record("disconnect"), poll_interval=0.005)
+        self.addCleanup(watcher.stop)
+        return watcher
+
+    def _plug(self, path: bytes, node: str):
+        self.changed.clear()
+        self.bus.descriptors.append(_descriptor(path))
+        self.nodes = self.nodes | {node}
+        self.assertTrue(self.changed.wait(1))
+
+    def test_devices_are_added_and_removed(self):
+        watcher = self._watch()
+        self.assertFalse(watcher.uses_uevents)
+        self._plug(b"1-2", "hidraw1")
+
+        self.changed.clear()
+        self.bus.descriptors = [d for d in self.bus.descriptors if d["path"] != b"1-1"]
+        self.nodes = self.nodes - {"hidraw0"}
+        self.assertTrue(self.changed.wait(1))
+
+        # The devices that were there when it started don't count as connected
+        self.assertEqual(self.events, [("connect", b"1-2"), ("disconnect", b"1-1")])
+        self.assertEqual([d["path"] for d in watcher.devices()], [b"1-2"])
+
+    def test_only_scans_when_the_hidraw_nodes_change(self):
+        self._watch()
+        scans = self.bus.scans
+        self._plug(b"1-2", "hidraw1")
+        # Once at the start, and once for the new node
+        self.assertEqual(scans, 1)
+        self.assertEqual(self.bus.scans, 2)
+
+    def test_lookups_use_the_watched_devices(self):
+        self._watch()
+        self._plug(b"1-2", "hidraw1")
+        scans = self.bus.scans
+
+        self.assertEqual([d["path"] for d in self.manager.list_devices()], [b"1-1", b"1-2"])
+        self.assertEqual(self.bus.scans, scans)
+
+    def test_callback_that_raises_doesnt_stop_the_watcher(self):
+        def fail(_: dict):
+            self.changed.set()
+            raise ValueError()
+
+        watcher = self.manager.watch(fail, poll_interval=0.005)
+        self.addCleanup(watcher.stop)
+        with self.assertLogs(hotplug.__name__):
+            self._plug(b"1-2", "hidraw1")
+        self.assertTrue(watcher.running)
+
+
+if __name__ == '__main__':
+    unittest.main()
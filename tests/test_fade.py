@@ -0,0 +1,35 @@
+import time
+import unittest
+
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class FadeTest(unittest.TestCase):
+    def setUp(self):
+        self.prism = WraithPrism(EmulatedWraithPrismDevice(latency=0.0005))
+
+    def tearDown(self):
+        self.prism.close()
+
+    def test_fade_ends_on_the_targets(self):
+        transition = self.prism.fade(ring="#ff0000", fan=(0, 0, 0xFF), duration=0.1, wait=True)
+
+        self.assertTrue(transition.finished)
+        self.assertEqual(self.prism.ring.rgb, RGB(0xFF, 0, 0))
+        self.assertEqual(self.prism.fan._submitted_byte_values[-3:], bytes([0, 0, 0xFF]))
+
+    def test_new_fade_finishes_the_zones_of_the_cancelled_one(self):
+        first = self.prism.fade(fan="#0000ff", ring="#00ff00", duration=5)
+        time.sleep(0.1)
+        second = self.prism.fade(ring="#ff0000", duration=0.1, wait=True)
+
+        self.assertTrue(first.cancelled)
+        self.assertTrue(second.finished)
+        self.assertEqual(self.prism.ring.rgb, RGB(0xFF, 0, 0))
+        self.assertEqual(self.prism.fan.rgb, RGB(0, 0, 0xFF))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from py_wraith_prism.frame_streamer import FrameStreamer, Frame
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+FRAMES = 20
+
+
+class FrameStreamerTest(unittest.TestCase):
+    def setUp(self):
+        # A frame takes two transactions of at least 10ms each, which is well above the 5ms frame interval
+        self.device = EmulatedWraithPrismDevice(latency=0.01)
+        self.prism = WraithPrism(self.device)
+
+    def _assert_ends_on(self, streamer: FrameStreamer, color: RGB):
+        streamer.run()
+
+        stats = streamer.stats
+        self.assertGreater(stats.dropped, 0)
+        self.assertEqual(stats.frames + stats.dropped, FRAMES)
+        self.assertGreaterEqual(stats.max_latency, 0.02)
+        self.assertEqual(self.prism.ring.rgb, color)
+        self.assertEqual(bytes(self.device.state.channels[self.prism.ring.channel][6:9]),
+                         bytes([color.red, color.green, color.blue]))
+
+    def test_slow_device_drops_frames_but_not_the_last_one(self):
+        frames = [Frame(ring=(index, 0, 0)) for index in range(FRAMES)]
+        self._assert_ends_on(FrameStreamer(self.prism, frames, fps=200), RGB(FRAMES - 1, 0, 0))
+
+    def test_callable_source_ends_on_its_last_frame(self):
+        def source(index: int, _: float) -> Frame | None:
+            return Frame(ring=(0, index, 0)) if index < FRAMES else None
+
+        self._assert_ends_on(FrameStreamer(self.prism, source, fps=200), RGB(0, FRAMES - 1, 0))
+
+    def test_fast_device_sends_every_frame(self):
+        device = EmulatedWraithPrismDevice()
+        prism = WraithPrism(device)
+        streamer = FrameStreamer(prism, [Frame(logo=(0, 0, index)) for index in range(5)], fps=None)
+        streamer.run()
+
+        self.assertEqual((streamer.stats.frames, streamer.stats.dropped), (5, 0))
+        self.assertEqual(prism.logo.rgb, RGB(0, 0, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
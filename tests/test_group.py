@@ -0,0 +1,65 @@
+import unittest
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+from py_wraith_prism.wraith_prism_group import WraithPrismGroup, GroupOperationError
+
+
+class FailingDevice(EmulatedWraithPrismDevice):
+    def __init__(self):
+        super().__init__()
+        self.failing = False
+        self.closed = False
+
+    def write(self, buff) -> int:
+        if self.failing:
+            return -1
+        return super().write(buff)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+class WraithPrismGroupTest(unittest.TestCase):
+    def setUp(self):
+        self.devices = [FailingDevice(), FailingDevice()]
+        self.group = WraithPrismGroup.create([lambda device=device: WraithPrism(device) for device in self.devices])
+        self.addCleanup(self.group.close)
+
+    def test_failure_is_reported_for_the_failing_device(self):
+        self.devices[1].failing = True
+        for prism in self.group:
+            prism.logo.mode = BasicPrismMode.Static
+            prism.logo.color = "#00ff00"
+
+        with self.assertRaises(GroupOperationError) as raised:
+            self.group.submit_all_components()
+        self.devices[1].failing = False
+
+        error = raised.exception
+        self.assertEqual(list(error.errors), [1])
+        self.assertIsInstance(error.errors[1], IOError)
+        self.assertIn("#1", str(error))
+        self.assertIsNotNone(error.results[0])
+        self.assertIsNone(error.results[1])
+        # The healthy device was written to regardless
+        self.assertEqual(bytes(self.devices[0].state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+        self.assertEqual(bytes(self.devices[1].state.channels[0x05][6:9]), bytes([0xFF, 0, 0]))
+
+    def test_results_are_in_device_order(self):
+        self.devices[1].firmware_version = "V1.0.1"
+        self.assertEqual(self.group.request_firmware_versions(), ["v1.0.0", "v1.0.1"])
+
+    def test_opened_devices_are_closed_if_one_fails_to_open(self):
+        devices = [FailingDevice(), FailingDevice()]
+        devices[1].failing = True
+        with self.assertRaises(GroupOperationError):
+            WraithPrismGroup.create([lambda device=device: WraithPrism(device) for device in devices])
+
+        self.assertTrue(devices[0].closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.usb.instrumentation import UsbInstrumentation, NO_SPAN
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class FailingDevice(EmulatedWraithPrismDevice):
+    def __init__(self):
+        super().__init__(latency=0.002)
+        self.failing = False
+
+    def write(self, buff) -> int:
+        if self.failing:
+            return -1
+        return super().write(buff)
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.device = FailingDevice()
+        # Every transaction of the emulated device takes at least 2ms, so they all land in the second bucket
+        self.instrumentation = UsbInstrumentation(buckets=(0.001, 1.0))
+        self.prism = WraithPrism(self.device, instrumentation=self.instrumentation)
+
+    def _submit_logo(self, color: str):
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.logo.color = color
+        self.prism.submit_component(self.prism.logo)
+
+    def test_transactions_are_counted_by_span_and_opcode(self):
+        handshake = {(row["span"], row["opcode"]) for row in self.instrumentation.to_dict()["transactions"]}
+        self.assertIn((NO_SPAN, "41"), handshake)
+        self.assertIn((NO_SPAN, "52/A0"), handshake)
+
+        self.instrumentation.reset()
+        self._submit_logo("#00ff00")
+        stats = self.instrumentation.to_dict()
+
+        transactions = {(row["span"], row["opcode"]): row for row in stats["transactions"]}
+        self.assertEqual(set(transactions), {("submit_component", "51/2C"), ("submit_component", "51/28")})
+        values = transactions["submit_component", "51/2C"]
+        self.assertEqual((values["count"], values["errors"], values["bytes_written"], values["bytes_read"]),
+                         (1, 0, 64, 64))
+        self.assertEqual(values["latency"]["buckets"], {"0.001": 0, "1.0": 1, "+Inf": 1})
+        self.assertEqual(stats["spans"]["submit_component"]["calls"], 1)
+        self.assertEqual(stats["opcodes"]["51/2C"]["count"], 1)
+
+    def test_failed_write_is_an_error(self):
+        self.instrumentation.reset()
+        self.device.failing = True
+        with self.assertRaises(IOError):
+            self._submit_logo("#00ff00")
+        self.device.failing = False
+        self._submit_logo("#0000ff")
+
+        stats = self.instrumentation.to_dict()
+        self.assertEqual(stats["spans"]["submit_component"]["calls"], 2)
+        self.assertEqual(stats["spans"]["submit_component"]["errors"], 1)
+        values = stats["opcodes"]["51/2C"]
+        self.assertEqual((values["count"], values["errors"]), (2, 1))
+        self.assertEqual(stats["opcodes"]["51/28"]["errors"], 0)
+
+    def test_prometheus_export(self):
+        self.instrumentation.reset()
+        self._submit_logo("#00ff00")
+        lines = self.instrumentation.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE wraith_prism_hid_transactions_total counter", lines)
+        self.assertIn('wraith_prism_hid_transactions_total{opcode="51/2C",span="submit_component"} 1', lines)
+        self.assertIn('wraith_prism_hid_errors_total{opcode="51/2C",span="submit_component"} 0', lines)
+        self.assertIn('wraith_prism_hid_bytes_written_total{opcode="51/28",span="submit_component"} 64', lines)
+        self.assertIn("# TYPE wraith_prism_hid_latency_seconds histogram", lines)
+        self.assertIn('wraith_prism_hid_latency_seconds_bucket{opcode="51/2C",span="submit_component",le="0.001"} 0',
+                      lines)
+        self.assertIn('wraith_prism_hid_latency_seconds_bucket{opcode="51/2C",span="submit_component",le="+Inf"} 1',
+                      lines)
+        self.assertIn('wraith_prism_hid_latency_seconds_count{opcode="51/2C",span="submit_component"} 1', lines)
+        self.assertIn('wraith_prism_span_calls_total{span="submit_component"} 1', lines)
+        self.assertIn('wraith_prism_span_duration_seconds_count{span="submit_component"} 1', lines)
+        # Every sample is a metric name, optional labels and a value
+        for line in lines:
+            if not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                self.assertRegex(name, r'^[a-z_]+(\{[a-z]+="[^"]*"(,[a-z]+="[^"]*")*\})?$')
+                float(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+
+from py_wraith_prism.prism_components.enums import Speed, Brightness, RotationDirection
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class RecordingDevice(EmulatedWraithPrismDevice):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def write(self, buff) -> int:
+        self.requests.append(bytes(buff[1:]))
+        return super().write(buff)
+
+    @property
+    def reads(self):
+        return [request for request in self.requests if request[0] == 0x52]
+
+
+def _set_logo(prism: WraithPrism, color: str):
+    prism.logo.mode = BasicPrismMode.Static
+    prism.logo.color = color
+    prism.logo.speed = Speed.Medium
+    prism.logo.brightness = Brightness.High
+    prism.logo.use_random_color = False
+
+
+class LazyAttachTest(unittest.TestCase):
+    def setUp(self):
+        self.device = RecordingDevice()
+
+    def _move(self, index: int, default: int, channel: int):
+        # As another tool may have left it
+        for state in (self.device.state, self.device.saved_state):
+            state.channel_map[index] = channel
+            state.channels[channel] = bytearray(state.channels[default])
+            state.channels[channel][0] = channel
+
+    def _move_logo(self, channel: int):
+        self._move(4, 0x05, channel)
+
+    def test_attaching_sends_nothing(self):
+        WraithPrism(self.device, lazy=True)
+        self.assertEqual(self.device.requests, [])
+
+    def test_write_only_submit_doesnt_read(self):
+        prism = WraithPrism(self.device, lazy=True)
+        _set_logo(prism, "#ff0000")
+        prism.submit_component(prism.logo)
+
+        self.assertEqual(self.device.reads, [])
+        self.assertEqual([request[:2].hex() for request in self.device.requests], ["512c", "5128"])
+        self.assertEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0xFF, 0, 0]))
+
+    def test_write_only_submit_keeps_the_device_channel_map(self):
+        self._move_logo(0x10)
+        prism = WraithPrism(self.device, lazy=True)
+        _set_logo(prism, "#ff0000")
+        prism.submit_component(prism.logo)
+
+        self.assertEqual(self.device.reads, [])
+        self.assertEqual(self.device.state.channel_map[4], 0x10)
+
+    def test_assumed_channel_moves_once_the_map_is_read(self):
+        self._move_logo(0x10)
+        prism = WraithPrism(self.device, lazy=True)
+        _set_logo(prism, "#ff0000")
+        prism.submit_component(prism.logo)
+
+        # Reading the fan reads the channel map
+        self.assertEqual(prism.fan.mode, BasicPrismMode.Cycle)
+        self.assertEqual(prism.logo.channel, 0x10)
+        prism.submit_component(prism.logo)
+        self.assertEqual(self.device.state.channel_map[4], 0x10)
+        self.assertEqual(bytes(self.device.state.channels[0x10][6:9]), bytes([0xFF, 0, 0]))
+
+    def test_ring_submit_keeps_the_device_channel_map(self):
+        self._move_logo(0x03)
+        self._move(5, 0x06, 0x04)
+        prism = WraithPrism(self.device, lazy=True)
+        prism.ring.mode = PrismRingMode.Static
+        prism.ring.color = "#0000ff"
+        prism.ring.speed = Speed.Medium
+        prism.ring.brightness = Brightness.High
+        prism.ring.use_random_color = False
+        prism.ring.direction = RotationDirection.Clockwise
+        prism.submit_component(prism.ring)
+
+        # The channel map is read to write the ring's channel, and the logo and fan are left where they are
+        self.assertEqual([request[:2].hex() for request in self.device.reads], ["52a0"])
+        self.assertEqual(list(self.device.state.channel_map[4:7]), [0x03, 0x04, PrismRingMode.Static.channel])
+
+    def test_setting_every_component_only_reads_the_channel_map(self):
+        prism = WraithPrism(self.device, lazy=True)
+        _set_logo(prism, "#ff0000")
+        prism.fan.mode = BasicPrismMode.Off
+        prism.fan.color = "#000000"
+        prism.fan.speed = Speed.Medium
+        prism.fan.brightness = Brightness.High
+        prism.fan.use_random_color = False
+        prism.ring.mode = PrismRingMode.Static
+        prism.ring.color = "#0000ff"
+        prism.ring.speed = Speed.Medium
+        prism.ring.brightness = Brightness.High
+        prism.ring.use_random_color = False
+        prism.ring.direction = RotationDirection.Clockwise
+        prism.submit_all_components()
+
+        self.assertEqual([request[:2].hex() for request in self.device.reads], ["52a0"])
+        self.assertEqual(self.device.state.channel_map[6], PrismRingMode.Static.channel)
+
+    def test_reading_a_value_loads_the_component_once(self):
+        prism = WraithPrism(self.device, lazy=True)
+        self.assertEqual(prism.logo.mode, BasicPrismMode.Cycle)
+        self.assertEqual(prism.logo.color, prism.logo.color)
+
+        # The channel map, and the logo's channel
+        self.assertEqual([request[:2].hex() for request in self.device.reads], ["52a0", "522c"])
+
+    def test_values_set_before_loading_are_kept(self):
+        prism = WraithPrism(self.device, lazy=True)
+        prism.logo.speed = Speed.Fast
+        prism.load()
+
+        self.assertEqual(prism.logo.speed, Speed.Fast)
+        self.assertEqual(prism.logo.mode, BasicPrismMode.Cycle)
+        self.assertTrue(prism.has_unsaved_changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from py_wraith_prism.morse import morse_or_text_to_bytes, bytes_to_morse_or_text, encode_many, validate_morse_text
+from py_wraith_prism.prism_components.prism_mode import PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+# Encodings produced by the original bit-by-bit encoder
+_ENCODINGS = {
+    "sos": "152a1503",
+    "... --- ...": "152a1503",
+    "Hello world": "55441659a8408a4a46161603",
+    "a b": "095831",
+}
+
+
+class MorseTest(unittest.TestCase):
+    def test_encoding_matches_the_original_encoder(self):
+        for text, encoded in _ENCODINGS.items():
+            self.assertEqual(bytes(morse_or_text_to_bytes(text)).hex(), encoded, text)
+        self.assertEqual([encoded.hex() for encoded in encode_many(_ENCODINGS)], list(_ENCODINGS.values()))
+
+    def test_decoding(self):
+        self.assertEqual(bytes_to_morse_or_text(bytes.fromhex(_ENCODINGS["Hello world"])), "HELLO WORLD")
+        self.assertEqual(bytes_to_morse_or_text(bytes.fromhex(_ENCODINGS["a b"]), morse=True), ".-   -... ")
+        # Anything after the end marker is ignored, such as the padding of the chunks
+        self.assertEqual(bytes_to_morse_or_text(bytes.fromhex(_ENCODINGS["sos"]) + bytes(10)), "SOS")
+
+    def test_invalid_text(self):
+        self.assertEqual(validate_morse_text("... ---"), "... ---")
+        with self.assertRaises(ValueError):
+            validate_morse_text("50%")
+
+    def test_text_survives_the_device(self):
+        device = EmulatedWraithPrismDevice()
+        prism = WraithPrism(device)
+        prism.ring.mode = PrismRingMode.Morse
+        prism.ring.morse_text = "Hello world"
+        prism.submit_all_components()
+
+        self.assertEqual(WraithPrism(device, lazy=True).ring.morse_text, "HELLO WORLD")
+
+
+if __name__ == '__main__':
+    unittest.main()
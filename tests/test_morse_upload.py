@@ -0,0 +1,69 @@
+import unittest
+
+from py_wraith_prism.morse import morse_or_text_to_bytes
+from py_wraith_prism.prism_components.prism_mode import PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+# Encodes to more than the 60 bytes the first half of the morse chunks holds
+LONG_TEXT = "the quick brown fox jumps over the lazy dog and then some more words here"
+
+
+class RecordingDevice(EmulatedWraithPrismDevice):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def write(self, buff) -> int:
+        self.requests.append(bytes(buff[1:]))
+        return super().write(buff)
+
+    @property
+    def morse_chunks_written(self):
+        return [request[2] for request in self.requests if request[:2] == bytes([0x51, 0x73])]
+
+
+class MorseUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.device = RecordingDevice()
+        self.prism = WraithPrism(self.device)
+        self.prism.ring.mode = PrismRingMode.Morse
+        self.prism.ring.morse_text = LONG_TEXT
+        self.prism.submit_all_components()
+        self.device.requests = []
+
+    def test_only_the_changed_chunks_are_sent(self):
+        self.assertGreater(len(morse_or_text_to_bytes(LONG_TEXT)), 60)
+        # The last letter is in the second half, which chunks 1 and 3 both hold, so only they change
+        self.prism.ring.morse_text = LONG_TEXT[:-1] + "s"
+        self.prism.submit_component(self.prism.ring)
+        self.assertEqual(self.device.morse_chunks_written, [1, 3])
+
+        # And chunks 0 and 2 hold the first half. "e" encodes to as many bits as "t", so nothing after it moves.
+        self.device.requests = []
+        self.prism.ring.morse_text = "e" + LONG_TEXT[1:-1] + "s"
+        self.prism.submit_component(self.prism.ring)
+        self.assertEqual(self.device.morse_chunks_written, [0, 2])
+
+        chunks = self.device.state.morse_chunks
+        self.assertEqual(self.prism.ring._submitted_morse_bytes, bytes(chunks[0]) + bytes(chunks[1]))
+
+    def test_unchanged_text_sends_no_chunks(self):
+        self.prism.ring.morse_text = LONG_TEXT.upper()
+        self.prism.submit_component(self.prism.ring)
+        self.assertEqual(self.device.morse_chunks_written, [])
+
+    def test_ring_outside_morse_mode_sends_no_chunks(self):
+        self.prism.ring.mode = PrismRingMode.Swirl
+        self.prism.ring.morse_text = "sos"
+        self.prism.submit_all_components()
+        self.prism.submit_component(self.prism.ring, force=True)
+
+        self.assertEqual(self.device.morse_chunks_written, [])
+        # The device still holds the text from before
+        self.assertEqual(bytes(self.device.state.morse_chunks[0]).rstrip(b"\0"),
+                         bytes(morse_or_text_to_bytes(LONG_TEXT)[:60]).rstrip(b"\0"))
+
+
+if __name__ == '__main__':
+    unittest.main()
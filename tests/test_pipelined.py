@@ -0,0 +1,67 @@
+import unittest
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.usb.wraith_usb_interface import WraithProtocolError
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class DroppingDevice(EmulatedWraithPrismDevice):
+    # Loses the next register write that starts with drop_prefix, without acknowledging it
+    def __init__(self):
+        super().__init__()
+        self.drop_prefix: bytes | None = None
+
+    def write(self, buff) -> int:
+        if self.drop_prefix is not None and bytes(buff[1:1 + len(self.drop_prefix)]) == self.drop_prefix:
+            self.drop_prefix = None
+            return len(buff)
+        return super().write(buff)
+
+
+class PipelinedErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.device = DroppingDevice()
+        self.prism = WraithPrism(self.device, pipelined=True)
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.ring.mode = PrismRingMode.Morse
+
+    def _submit_with_lost_write(self, prefix: bytes):
+        self.device.drop_prefix = prefix
+        self.prism.submit_all_components()
+        with self.assertRaises(WraithProtocolError):
+            self.prism.flush()
+
+    def test_lost_values_are_sent_again(self):
+        self.prism.logo.color = "#00ff00"
+        self._submit_with_lost_write(bytes([0x51, 0x2C, 0x01, 0x00, 0x05]))
+        self.assertNotEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+
+        self.prism.submit_all_components()
+        self.prism.flush()
+        self.assertEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+
+    def test_lost_morse_chunk_is_sent_again(self):
+        self.prism.ring.morse_text = "sos"
+        self._submit_with_lost_write(bytes([0x51, 0x73, 0x00]))
+        self.assertEqual(self.device.state.morse_chunks[0][0], 0)
+
+        self.prism.submit_all_components()
+        self.prism.flush()
+        self.assertNotEqual(self.device.state.morse_chunks[0][0], 0)
+
+    def test_lost_save_isnt_skipped(self):
+        self.prism.submit_all_components()
+        self.device.drop_prefix = bytes([0x50, 0x55])
+        self.prism.save()
+        with self.assertRaises(WraithProtocolError):
+            self.prism.flush()
+        self.assertEqual(self.device.save_count, 0)
+
+        self.prism.save()
+        self.prism.flush()
+        self.assertEqual(self.device.save_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from itertools import product
+
+from py_wraith_prism.prism_components import prism_components
+from py_wraith_prism.prism_components.enums import Brightness, Speed, RotationDirection
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+
+BYTE_VALUES = range(256)
+
+
+def _scan(mapping, value):
+    # How the lookups were done before they were indexed
+    return next((key for key, key_value in mapping.items() if key_value == value), None)
+
+
+class ModeLookupTest(unittest.TestCase):
+    def test_modes_match_a_scan(self):
+        for value in BYTE_VALUES:
+            with self.subTest(value=value):
+                basic = next((mode for mode in BasicPrismMode if mode.mode == value), BasicPrismMode.Off)
+                with self.assertNoLogs(level="ERROR") if basic.mode == value else self.assertLogs(level="ERROR"):
+                    self.assertIs(BasicPrismMode.from_mode(value), basic)
+
+                ring = next((mode for mode in PrismRingMode if mode.mode == value), None)
+                if ring is None:
+                    self.assertRaises(ValueError, PrismRingMode.from_mode, value)
+                else:
+                    self.assertIs(PrismRingMode.from_mode(value), ring)
+
+    def test_channels_match_a_scan(self):
+        for channel in BYTE_VALUES:
+            with self.subTest(channel=channel):
+                ring = next((mode for mode in PrismRingMode if mode.channel == channel), None)
+                if ring is None:
+                    self.assertRaises(ValueError, PrismRingMode.from_channel, channel)
+                else:
+                    self.assertIs(PrismRingMode.from_channel(channel), ring)
+
+    def test_speeds_and_brightnesses_match_a_scan(self):
+        for mode, value in product(list(BasicPrismMode) + list(PrismRingMode), BYTE_VALUES):
+            with self.subTest(mode=mode, value=value):
+                self.assertIs(mode.find_speed(value), _scan(mode.speeds, value))
+                self.assertIs(mode.find_brightness(value), _scan(mode.brightnesses, value))
+
+
+class CachedValuesTest(unittest.TestCase):
+    def test_cached_values_match_and_arent_mutated(self):
+        states = list(product(Speed, Brightness, (0, 0x123456), (False, True)))
+        for mode, (speed, brightness, color, use_random_color) in product(BasicPrismMode, states):
+            values = prism_components._basic_values(5, mode.name, speed, brightness, color, use_random_color)
+            self.assertIsInstance(values, bytes)
+            self.assertEqual(values, prism_components._basic_values.__wrapped__(
+                5, mode.name, speed, brightness, color, use_random_color))
+
+        compiled = []
+        for mode, state, direction in product(PrismRingMode, states, RotationDirection):
+            values = prism_components._ring_values(mode.name, *state, direction)
+            # A repeated state is a cache hit
+            self.assertIs(prism_components._ring_values(mode.name, *state, direction), values)
+            compiled.append(values)
+        snapshot = [bytes(values) for values in compiled]
+        speeds = {mode.name: dict(mode.speeds) for mode in PrismRingMode}
+
+        # Compiling every state again doesn't change what was returned before, or the modes' mappings
+        for mode, state, direction in product(PrismRingMode, states, RotationDirection):
+            prism_components._ring_values(mode.name, *state, direction)
+        self.assertEqual(compiled, snapshot)
+        self.assertEqual({mode.name: dict(mode.speeds) for mode in PrismRingMode}, speeds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from py_wraith_prism.reactive import ReactiveLighting, Binding, Gradient
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class FailingDevice(EmulatedWraithPrismDevice):
+    def __init__(self):
+        super().__init__()
+        self.failing = False
+
+    def write(self, buff) -> int:
+        if self.failing:
+            return -1
+        return super().write(buff)
+
+
+class ReactiveLightingTest(unittest.TestCase):
+    def setUp(self):
+        self.device = FailingDevice()
+        self.prism = WraithPrism(self.device)
+        self.value = 0.0
+        gradient = Gradient([(0, "#00ff00"), (100, "#ff0000")], levels=2)
+        self.lighting = ReactiveLighting(self.prism, {"ring": Binding(lambda: self.value, gradient)})
+
+    def test_only_changed_levels_are_submitted(self):
+        self.assertTrue(self.lighting.tick())
+        self.assertFalse(self.lighting.tick())
+        self.value = 100.0
+        self.assertTrue(self.lighting.tick())
+        self.assertEqual(self.prism.ring.rgb, RGB(0xFF, 0, 0))
+
+    def test_failed_submit_is_retried(self):
+        self.device.failing = True
+        with self.assertRaises(IOError):
+            self.lighting.tick()
+
+        self.device.failing = False
+        self.assertTrue(self.lighting.tick())
+        self.assertEqual(bytes(self.device.state.channels[self.prism.ring.channel][6:9]), bytes([0, 0xFF, 0]))
+
+
+class GradientTest(unittest.TestCase):
+    def test_duplicate_stops_make_a_hard_edge(self):
+        gradient = Gradient([(100, "#ffffff"), (50, "#ff0000"), (50, "#0000ff"), (0, "#000000")], levels=3)
+
+        # At the edge, the colour comes from the first of the duplicate stops
+        self.assertEqual(gradient.colors, [RGB(0, 0, 0), RGB(0xFF, 0, 0), RGB(0xFF, 0xFF, 0xFF)])
+
+        # And past it, from the second
+        gradient = Gradient([(0, "#000000"), (50, "#ff0000"), (50, "#0000ff"), (100, "#0000ff")], levels=5)
+        self.assertEqual(gradient.color(75), RGB(0, 0, 0xFF))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import threading
+import unittest
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.resilient_wraith_prism import ResilientWraithPrism, ReconnectPolicy, ReconnectError
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class ReconnectTest(unittest.TestCase):
+    def setUp(self):
+        self.device = EmulatedWraithPrismDevice()
+        self.reconnects = []
+        self.prism = ResilientWraithPrism(WraithPrism(self.device), self._reopen,
+                                          ReconnectPolicy(max_attempts=20, initial_backoff=0.01, max_backoff=0.02),
+                                          on_reconnect=lambda stats: self.reconnects.append(stats.reconnects))
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.logo.color = "#00ff00"
+        self.prism.ring.mode = PrismRingMode.Morse
+        self.prism.ring.morse_text = "sos"
+        self.prism.submit_all_components()
+
+    def _reopen(self):
+        self.device.open_path(b"")
+        return self.device
+
+    def _drop_off_the_bus(self):
+        # Comes back a little later with the state that was saved to flash
+        self.device.disconnect()
+        threading.Timer(0.03, self.device.connect).start()
+
+    def test_state_is_written_back_after_reconnecting(self):
+        self._drop_off_the_bus()
+        self.prism.fan.mode = BasicPrismMode.Static
+        self.prism.submit_all_components()
+
+        self.assertEqual(self.reconnects, [1])
+        self.assertTrue(self.device.powered_on)
+        state = self.device.state
+        self.assertEqual(bytes(state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+        self.assertEqual(state.channels[0x06][3], self.prism.fan._byte_values[3])
+        self.assertNotEqual(state.morse_chunks[0][0], 0)
+
+    def test_batch_is_sent_again_after_reconnecting(self):
+        with self.prism.batch():
+            self.prism.logo.color = "#0000ff"
+            self.prism.submit_component(self.prism.logo)
+            self.prism.save()
+            self._drop_off_the_bus()
+
+        self.assertEqual(self.reconnects, [1])
+        self.assertEqual(bytes(self.device.saved_state.channels[0x05][6:9]), bytes([0, 0, 0xFF]))
+
+    def test_device_that_doesnt_come_back(self):
+        self.device.disconnect()
+        policy = ReconnectPolicy(max_attempts=2, initial_backoff=0.001)
+        prism = ResilientWraithPrism(self.prism.prism, self._reopen, policy)
+        with self.assertRaises(ReconnectError):
+            prism.save(force=True)
+        self.assertEqual(prism.stats.failed_reconnects, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
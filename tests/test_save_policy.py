@@ -0,0 +1,77 @@
+import unittest
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode
+from py_wraith_prism.save_policy import SavePolicy
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class FailingSaveDevice(EmulatedWraithPrismDevice):
+    # Fails to write the save packet while failing_saves is set
+    def __init__(self):
+        super().__init__()
+        self.failing_saves = False
+
+    def write(self, buff) -> int:
+        if self.failing_saves and bytes(buff[1:3]) == bytes([0x50, 0x55]):
+            return -1
+        return super().write(buff)
+
+
+class SavePolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.device = FailingSaveDevice()
+
+    def _change_logo(self, prism: WraithPrism, color: str):
+        prism.logo.mode = BasicPrismMode.Static
+        prism.logo.color = color
+        prism.submit_component(prism.logo)
+
+    def test_unchanged_save_is_skipped(self):
+        prism = WraithPrism(self.device)
+        self._change_logo(prism, "#00ff00")
+        prism.save()
+        prism.save()
+
+        self.assertEqual(self.device.save_count, 1)
+        self.assertEqual(prism.save_stats.skipped_unchanged, 1)
+        prism.save(force=True)
+        self.assertEqual(self.device.save_count, 2)
+
+    def test_debounced_saves_are_coalesced(self):
+        prism = WraithPrism(self.device, save_policy=SavePolicy(debounce=60))
+        for color in ("#00ff00", "#0000ff", "#ffffff"):
+            self._change_logo(prism, color)
+            prism.save()
+        self.assertEqual(self.device.save_count, 0)
+        self.assertTrue(prism.has_unsaved_changes)
+
+        prism.flush_save()
+        self.assertEqual(self.device.save_count, 1)
+        self.assertEqual(prism.save_stats.coalesced, 2)
+        self.assertFalse(prism.has_unsaved_changes)
+
+    def test_close_commits_a_pending_save(self):
+        prism = WraithPrism(self.device, save_policy=SavePolicy(debounce=60))
+        self._change_logo(prism, "#00ff00")
+        prism.save()
+        prism.close()
+
+        self.assertEqual(bytes(self.device.saved_state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+
+    def test_failed_save_isnt_counted_as_saved(self):
+        prism = WraithPrism(self.device)
+        self._change_logo(prism, "#00ff00")
+        self.device.failing_saves = True
+        with self.assertRaises(IOError):
+            prism.save()
+        self.assertTrue(prism.has_unsaved_changes)
+
+        self.device.failing_saves = False
+        prism.save()
+        self.assertEqual(self.device.save_count, 1)
+        self.assertFalse(prism.has_unsaved_changes)
+
+
+if __name__ == '__main__':
+    unittest.main()
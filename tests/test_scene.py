@@ -0,0 +1,66 @@
+import unittest
+
+from py_wraith_prism.component_state import component_name, component_state, apply_component_state
+from py_wraith_prism.scene import Scene
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+WORK = Scene.from_dict("work", {
+    "logo": {"mode": "Static", "color": "#ff0000"},
+    "fan": {"mode": "Breathe", "mirage_state": [300, 400, 500]},
+    "ring": {"mode": "Morse", "morse_text": "focus"},
+})
+WORK_BLUE = Scene.from_dict("work_blue", {
+    "logo": {"mode": "Static", "color": "#0000ff"},
+    "fan": {"mode": "Breathe", "mirage_state": [300, 400, 500]},
+    "ring": {"mode": "Morse", "morse_text": "focus"},
+})
+GAME = Scene.from_dict("game", {
+    "logo": {"mode": "Cycle", "speed": "Fast"},
+    "ring": {"mode": "Swirl", "direction": "CounterClockwise"},
+})
+
+
+class SceneTest(unittest.TestCase):
+    def setUp(self):
+        self.device = EmulatedWraithPrismDevice()
+        self.prism = WraithPrism(self.device)
+        self.prism.apply_scene(WORK)
+        self.transactions = self.device.transaction_count
+
+    def test_scene_matches_setting_the_attributes(self):
+        for scene in (WORK, GAME):
+            device = EmulatedWraithPrismDevice()
+            prism = WraithPrism(device)
+            reference_device = EmulatedWraithPrismDevice()
+            reference = WraithPrism(reference_device)
+            for component in reference._components:
+                apply_component_state(component, scene.components[component_name(component)])
+            reference.submit_all_components()
+            prism.apply_scene(scene)
+
+            self.assertEqual([component_state(c) for c in prism._components],
+                             [component_state(c) for c in reference._components])
+            self.assertEqual(device.state.channels, reference_device.state.channels)
+            self.assertEqual(device.state.morse_chunks, reference_device.state.morse_chunks)
+
+    def test_reapplying_a_scene_sends_nothing(self):
+        self.assertEqual(self.prism.apply_scene(WORK), len(WORK.compile().packets()))
+        self.assertEqual(self.device.transaction_count, self.transactions)
+
+    def test_switching_scenes_only_sends_what_differs(self):
+        # Only the logo's values and the apply packet are sent
+        skipped = self.prism.apply_scene(WORK_BLUE)
+        self.assertEqual(skipped, len(WORK_BLUE.compile().packets()) - 2)
+        self.assertEqual(self.device.transaction_count - self.transactions, 2)
+        self.assertEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0, 0, 0xFF]))
+
+        # The morse chunks aren't sent for a ring that isn't in morse mode
+        morse_chunks = [bytes(chunk) for chunk in self.device.state.morse_chunks]
+        self.prism.apply_scene(GAME)
+        self.assertEqual(self.prism.ring.mode.name, "Swirl")
+        self.assertEqual([bytes(chunk) for chunk in self.device.state.morse_chunks], morse_chunks)
+
+
+if __name__ == '__main__':
+    unittest.main()
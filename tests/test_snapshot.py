@@ -0,0 +1,63 @@
+import unittest
+
+from py_wraith_prism.device_snapshot import DeviceSnapshot
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class DeviceSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.device = EmulatedWraithPrismDevice()
+        prism = WraithPrism(self.device)
+        prism.logo.mode = BasicPrismMode.Static
+        prism.logo.color = "#ff0000"
+        prism.ring.mode = PrismRingMode.Morse
+        prism.ring.morse_text = "hi"
+        prism.request_firmware_version()
+        self.assertFalse(prism.enso)
+        prism.submit_all_components()
+        prism.save()
+        self.snapshot = DeviceSnapshot.from_json(prism.snapshot().to_json())
+
+    def test_matching_snapshot_replaces_the_reads(self):
+        before = self.device.transaction_count
+        prism = WraithPrism(self.device, lazy=True, snapshot=self.snapshot)
+
+        self.assertTrue(prism.used_snapshot)
+        self.assertEqual(prism.ring.morse_text, "HI")
+        self.assertEqual(prism.logo.mode, BasicPrismMode.Static)
+        self.assertEqual(prism.request_firmware_version(), "v1.0.0")
+        # The channel map and enso flag
+        self.assertEqual(self.device.transaction_count - before, 2)
+
+    def test_changed_channel_map_isnt_used(self):
+        self.device.state.channel_map[10] = 0x99
+        prism = WraithPrism(self.device, lazy=True, snapshot=self.snapshot)
+        self.assertFalse(prism.used_snapshot)
+
+    def test_changed_enso_isnt_used(self):
+        self.device.state.enso[0] = 0x10
+        prism = WraithPrism(self.device, lazy=True, snapshot=self.snapshot)
+        self.assertFalse(prism.used_snapshot)
+
+    def test_enso_is_read_every_time(self):
+        prism = WraithPrism(self.device, lazy=True, snapshot=self.snapshot)
+        self.assertFalse(prism.enso)
+        self.device.state.enso[0] = 0x10
+        self.assertTrue(prism.enso)
+
+    def test_failing_save_listener_doesnt_fail_the_save(self):
+        prism = WraithPrism(self.device)
+
+        def listener(_):
+            raise OSError("disk full")
+
+        prism.add_save_listener(listener)
+        with self.assertLogs("py_wraith_prism.wraith_prism", "ERROR"):
+            prism.save(force=True)
+        self.assertEqual(prism.save_stats.committed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from colour import Color
+
+from py_wraith_prism.prism_components.enums import Speed
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.rgb import RGB
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class DeltaSubmitTest(unittest.TestCase):
+    def setUp(self):
+        self.device = EmulatedWraithPrismDevice()
+        self.prism = WraithPrism(self.device)
+
+    def _transactions(self, operation) -> int:
+        before = self.device.transaction_count
+        operation()
+        return self.device.transaction_count - before
+
+    def test_unchanged_submit_is_skipped(self):
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.logo.color = "#ff0000"
+        self.prism.submit_all_components()
+
+        self.assertEqual(self._transactions(self.prism.submit_all_components), 0)
+
+    def test_only_changed_component_is_sent(self):
+        self.prism.submit_all_components(force=True)
+        self.prism.fan.color = "#00ff00"
+        self.prism.fan.mode = BasicPrismMode.Static
+
+        # The fan's values, the channel assignment isn't needed, and apply
+        self.assertEqual(self._transactions(self.prism.submit_all_components), 2)
+        self.assertEqual(bytes(self.device.state.channels[0x06][6:9]), bytes([0, 0xFF, 0]))
+
+    def test_force_resends_everything(self):
+        self.prism.submit_all_components()
+        self.prism.ring.mode = PrismRingMode.Morse
+        self.prism.ring.morse_text = "sos"
+        self.prism.submit_all_components()
+
+        # Logo, mirage, fan, four morse chunks, ring, channel assignment and apply
+        self.assertEqual(self._transactions(lambda: self.prism.submit_all_components(force=True)), 10)
+
+    def test_values_read_from_device_are_kept_as_read(self):
+        # A speed that isn't one of the presets is read as Medium, which is encoded differently
+        for state in (self.device.state, self.device.saved_state):
+            state.channels[0x05][1] = 0x33
+        prism = WraithPrism(self.device)
+        self.assertEqual(prism.logo.speed, Speed.Medium)
+
+        prism.logo.speed = Speed.Medium
+        self.assertEqual(self._transactions(lambda: prism.submit_component(prism.logo)), 2)
+        self.assertNotEqual(self.device.state.channels[0x05][1], 0x33)
+
+    def test_color_is_a_colour_color(self):
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.logo.color = Color("blue")
+        self.assertEqual(self.prism.logo.color, Color("blue"))
+        self.assertEqual(self.prism.logo.rgb, RGB(0, 0, 0xFF))
+
+        self.prism.logo.rgb = "#00ff00"
+        self.prism.submit_component(self.prism.logo)
+        self.assertEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+
+    def test_color_assigned_to_itself_is_unchanged(self):
+        # This colour doesn't survive a conversion to a colour.Color and back
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.logo.rgb = "#c5d714"
+        self.prism.submit_component(self.prism.logo)
+        self.assertNotEqual(RGB.coerce(RGB.from_hex("#c5d714").to_color()), RGB.from_hex("#c5d714"))
+
+        self.prism.logo.color = self.prism.logo.color
+        self.assertEqual(self.prism.logo.rgb, RGB.from_hex("#c5d714"))
+        self.assertEqual(self._transactions(lambda: self.prism.submit_component(self.prism.logo)), 0)
+
+        # A returned colour that was changed afterwards is set as it is now
+        color = self.prism.logo.color
+        color.blue = 1.0
+        self.prism.logo.color = color
+        self.assertEqual(self.prism.logo.rgb.blue, 0xFF)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import time
+import unittest
+
+from py_wraith_prism.usb.transcript import ReplayDevice, Transaction
+
+
+class ReplayDeviceTest(unittest.TestCase):
+    def test_realtime_replays_the_gaps_between_packets(self):
+        transactions = [Transaction(1.0, 0.0, bytes([0x41, 0x80]), bytes([0x41, 0x80])),
+                        Transaction(1.1, 0.02, bytes([0x51, 0x28]), bytes([0x51, 0x28]))]
+        device = ReplayDevice(transactions, realtime=True)
+
+        started = time.perf_counter()
+        device.write(bytes([0, 0x41, 0x80]))
+        device.read(64)
+        device.write(bytes([0, 0x51, 0x28]))
+        device.read(64)
+        # The first packet starts the replay, and the second one was written 0.1 seconds after it
+        self.assertGreaterEqual(time.perf_counter() - started, 0.12)
+
+    def test_replays_immediately_by_default(self):
+        transactions = [Transaction(0.0, 0.0, bytes([0x41, 0x80]), bytes([0x41, 0x80])),
+                        Transaction(5.0, 5.0, bytes([0x51, 0x28]), bytes([0x51, 0x28]))]
+        device = ReplayDevice(transactions)
+
+        started = time.perf_counter()
+        for transaction in transactions:
+            device.write(bytes([0]) + transaction.request)
+            self.assertEqual(bytes(device.read(64)), transaction.response)
+        self.assertLess(time.perf_counter() - started, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.usb.wraith_usb_interface import WraithUsbInterface
+
+REQUEST_SIZE = 64
+
+
+class RecordingDevice(EmulatedWraithPrismDevice):
+    def __init__(self):
+        super().__init__()
+        self.buffers = []
+        self.reports = []
+
+    def write(self, buff) -> int:
+        # The buffer itself is kept too, to check that it's reused
+        self.buffers.append(buff)
+        self.reports.append(bytes(buff))
+        return super().write(buff)
+
+
+class ReportTest(unittest.TestCase):
+    def setUp(self):
+        self.device = RecordingDevice()
+        self.usb = WraithUsbInterface(self.device, REQUEST_SIZE)
+
+    def test_reports_are_padded_to_the_request_size(self):
+        self.usb.write_packet(bytes([0x51, 0x28, 0, 0, 0xE0]))
+        self.usb.send_packet(bytes([0x12, 0x20]))
+        self.usb.send_bytes([0x52, 0xA0, 1])
+
+        for report in self.device.reports:
+            self.assertEqual(len(report), REQUEST_SIZE + 1)
+            # The report ID
+            self.assertEqual(report[0], 0)
+        self.assertEqual(self.device.reports[0][1:], bytes([0x51, 0x28, 0, 0, 0xE0]).ljust(REQUEST_SIZE, b"\0"))
+
+    def test_filler(self):
+        self.usb.write_packet(bytes([0x51, 0x96]), bytes([0, 0, 0]), filler=0xFF)
+        self.usb.send_bytes([0x51, 0x96, 0, 0, 1], filler=0xFF)
+
+        self.assertEqual(self.device.reports[0][1:], bytes([0x51, 0x96, 0, 0, 0]).ljust(REQUEST_SIZE, b"\xFF"))
+        self.assertEqual(self.device.reports[1][1:], bytes([0x51, 0x96, 0, 0, 1]).ljust(REQUEST_SIZE, b"\xFF"))
+        self.assertEqual(bytes(self.device.state.enso), bytes([1]).ljust(REQUEST_SIZE - 4, b"\xFF"))
+
+    def test_buffer_is_reused_without_stale_bytes(self):
+        # A full morse chunk, then a much shorter channel values packet
+        self.usb.write_packet(bytes([0x51, 0x73, 0, 0]), bytes([0x11] * (REQUEST_SIZE - 4)))
+        self.usb.write_packet(bytes([0x51, 0x2C, 1, 0]), bytes([0x05, 0x80, 0x20, 1, 0xFF, 0xFF, 1, 2, 3]))
+        self.usb.write_packet(bytes([0x51, 0x28, 0, 0, 0xE0]), filler=0xFF)
+        self.usb.write_packet(bytes([0x51, 0x28, 0, 0, 0xE0]))
+
+        buffers = self.device.buffers
+        self.assertTrue(all(buffer is buffers[0] for buffer in buffers))
+        reports = self.device.reports
+        self.assertEqual(reports[1][1:], bytes([0x51, 0x2C, 1, 0, 0x05, 0x80, 0x20, 1, 0xFF, 0xFF, 1, 2, 3])
+                         .ljust(REQUEST_SIZE, b"\0"))
+        # The filler of the previous report doesn't carry over either
+        self.assertEqual(reports[3][1:], bytes([0x51, 0x28, 0, 0, 0xE0]).ljust(REQUEST_SIZE, b"\0"))
+
+        self.assertEqual(bytes(self.device.state.morse_chunks[0]), bytes([0x11] * (REQUEST_SIZE - 4)))
+        self.assertEqual(bytes(self.device.state.channels[0x05]),
+                         bytes([0x05, 0x80, 0x20, 1, 0xFF, 0xFF, 1, 2, 3]).ljust(REQUEST_SIZE - 4, b"\0"))
+
+    def test_oversized_packet_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.usb.write_packet(bytes([0x51, 0x73, 0, 0]), bytes(REQUEST_SIZE - 3))
+        self.assertEqual(self.device.reports, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from py_wraith_prism.prism_components.prism_mode import BasicPrismMode, PrismRingMode
+from py_wraith_prism.usb.emulated_device import EmulatedWraithPrismDevice
+from py_wraith_prism.verification import SubmitVerifier
+from py_wraith_prism.wraith_prism import WraithPrism
+
+
+class SubmitVerifierTest(unittest.TestCase):
+    def setUp(self):
+        self.device = EmulatedWraithPrismDevice()
+        self.mismatches = []
+        self.prism = WraithPrism(self.device, verifier=SubmitVerifier(sample_every=1, resend=True,
+                                                                       on_mismatch=self.mismatches.append))
+        self.prism.ring.mode = PrismRingMode.Morse
+        self.prism.submit_all_components()
+
+    def test_only_written_channel_values_are_verified(self):
+        reads = self.prism.verifier.stats.reads
+        # Only the morse chunks change
+        self.prism.ring.morse_text = "sos"
+        self.prism.submit_all_components()
+
+        self.assertEqual(self.prism.verifier.stats.reads, reads)
+
+    def test_mismatch_is_against_the_written_values(self):
+        self.prism.logo.mode = BasicPrismMode.Static
+        self.prism.logo.color = "#00ff00"
+        self.device.write_loss = 1.0
+        self.prism.submit_component(self.prism.logo)
+
+        self.assertEqual(len(self.mismatches), 1)
+        mismatch = self.mismatches[0]
+        self.assertEqual(mismatch.component, "logo")
+        self.assertEqual(mismatch.expected, self.prism.logo._byte_values)
+        self.assertNotEqual(mismatch.actual, mismatch.expected)
+
+        self.device.write_loss = 0.0
+        self.prism.submit_component(self.prism.logo, force=True)
+        self.assertEqual(len(self.mismatches), 1)
+        self.assertEqual(bytes(self.device.state.channels[0x05][6:9]), bytes([0, 0xFF, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()